@@ -1,80 +1,78 @@
 
 
 # backend/ml/evaluation.py
-import os
 import json
 import re
 import numpy as np
 from typing import Dict, Any
 from dotenv import load_dotenv
-import google.generativeai as genai
 from backend.ml.supabase_config import supabase, save_evaluation  
+from backend.ml.llm_gateway import generate_text
+from backend.ml.heuristic_scoring import get_scorer
+from backend.ml.tracing import span
+from backend.ml.logs import get_logger, preview
+
+logger = get_logger(__name__)
 
 
 # ✅ Load environment variables
 load_dotenv()
 
-# ✅ Configure Gemini API securely
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 
 # ---------- Heuristic Scoring ----------
+# Lexicons live in lexicons/heuristics.json; whole sessions are scored by get_scorer().score()
 def analyze_communication(answer: str) -> float:
-    words = len(answer.split())
-    sentences = answer.count('.')
-    if words < 10:
-        return 0.5
-    elif words < 40:
-        return 0.8
-    elif sentences > 5:
-        return 0.75
-    else:
-        return 0.7
+    return get_scorer().communication(answer)
 
 
 def analyze_confidence(answer: str) -> float:
-    confident = ["definitely", "certainly", "of course", "I did", "I worked"]
-    hesitant = ["maybe", "probably", "not sure", "I think"]
-    score = 0.7
-    for w in confident:
-        if w in answer.lower():
-            score += 0.1
-    for w in hesitant:
-        if w in answer.lower():
-            score -= 0.1
-    return min(max(score, 0.4), 1.0)
+    return get_scorer().lexicon_score("confidence", answer)
 
 
 def analyze_professionalism(answer: str) -> float:
-    pro = ["team", "collaborated", "developed", "thank", "appreciate", "worked"]
-    neg = ["lazy", "blame", "hate", "stuck"]
-    score = 0.75
-    for w in pro:
-        if w in answer.lower():
-            score += 0.05
-    for w in neg:
-        if w in answer.lower():
-            score -= 0.1
-    return min(max(score, 0.4), 1.0)
+    return get_scorer().lexicon_score("professionalism", answer)
+
+
+def summarize_pauses(interview_data) -> Dict[str, Any]:
+    """Session-level pause statistics from the spoken answers' delivery metrics and VAD reports."""
+    deliveries = [qa["delivery"] for qa in interview_data if qa.get("delivery")]
+    vads = [qa["vad"] for qa in interview_data if qa.get("vad")]
+    if not deliveries and not vads:
+        return {}
+
+    def values(key):
+        return [d[key] for d in deliveries if d.get(key) is not None]
+
+    pause_ratios, leading = values("pause_ratio"), values("leading_silence_seconds")
+    return {
+        "spoken_answers": max(len(deliveries), len(vads)),
+        "avg_pause_ratio": round(float(np.mean(pause_ratios)), 3) if pause_ratios else None,
+        "long_silences": int(sum(values("long_silences"))),
+        "longest_pause_seconds": max(values("longest_pause_seconds"), default=None),
+        "avg_leading_silence_seconds": round(float(np.mean(leading)), 2) if leading else None,
+        "silence_removed_seconds": round(sum(v.get("removed_seconds", 0) for v in vads), 2),
+    }
 
 
 # ---------- Gemini Technical Scoring ----------
-def get_technical_score_gemini(question: str, answer: str) -> Dict[str, Any]:
-    prompt = f"""
+# Static rubric: identical for every answer, so it goes first in the prompt and can be a context-cache prefix.
+TECHNICAL_RUBRIC = """
 You are a senior technical interviewer.
-Judge *technical accuracy, completeness, and conceptual depth*.
+Judge *technical accuracy, completeness, and conceptual depth* of the candidate answer you are given.
+
+Return ONLY valid JSON like:
+{"score": 0-100, "feedback": "one-sentence technical evaluation"}
+"""
+
 
+def get_technical_score_gemini(question: str, answer: str) -> Dict[str, Any]:
+    prompt = f"""
 Question: "{question}"
 Candidate Answer: "{answer}"
-
-Return ONLY valid JSON like:
-{{"score": 0-100, "feedback": "one-sentence technical evaluation"}}
 """
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        print("🔹 Raw Gemini output:", text)
+        text = generate_text("technical_score", prompt, prefix=TECHNICAL_RUBRIC, cache_key="rubric:technical")
+        logger.debug("🔹 Raw Gemini output: %s", preview(text))
 
         match = re.search(r'\{.*\}', text, re.DOTALL)
         if match:
@@ -84,14 +82,14 @@ Return ONLY valid JSON like:
                 feedback = parsed.get("feedback", "Good understanding; could add more detail.")
                 return {"score": score, "feedback": feedback}
             except Exception as parse_err:
-                print("⚠️ JSON parse failed:", parse_err)
+                logger.warning("⚠️ JSON parse failed: %s", parse_err)
 
         num_match = re.search(r'(\d{1,3})', text)
         score = float(num_match.group(1)) if num_match else 65
         return {"score": score, "feedback": text[:120] or "Partial response from Gemini."}
 
     except Exception as e:
-        print("⚠️ Gemini scoring failed:", e)
+        logger.warning("⚠️ Gemini scoring failed: %s", e)
         return {"score": 60, "feedback": "Unable to analyze technically; default score applied."}
 
 
@@ -100,7 +98,8 @@ def get_evaluation(session_id: str) -> Dict[str, Any]:
     """Fetch interview data from Supabase and evaluate answers."""
     try:
         # ✅ Fetch interview record
-        response = supabase.table("interviews").select("*").eq("session_id", session_id).execute()
+        with span("supabase.select.interviews"):
+            response = supabase.table("interviews").select("*").eq("session_id", session_id).execute()
 
         if not response.data:
             raise ValueError(f"No data found for session_id: {session_id}")
@@ -112,53 +111,61 @@ def get_evaluation(session_id: str) -> Dict[str, Any]:
         interview_data = json.loads(interview_data_raw) if isinstance(interview_data_raw, str) else interview_data_raw
 
         per_question_feedback = []
-        tech_scores, comm_scores, conf_scores, prof_scores = [], [], [], []
+        tech_scores = []
 
         for qa in interview_data:
             q = qa.get("question", "")
             a = qa.get("answer", "")
 
             # Gemini evaluation
-            gemini_result = get_technical_score_gemini(q, a)
+            with span("evaluation.technical_score"):
+                gemini_result = get_technical_score_gemini(q, a)
             tech_score = gemini_result["score"]
             feedback = gemini_result["feedback"]
 
-            # Heuristic scoring
-            comm = analyze_communication(a)
-            conf = analyze_confidence(a)
-            prof = analyze_professionalism(a)
-
             per_question_feedback.append({
                 "question": q,
                 "technical_score": tech_score,
                 "feedback": feedback
             })
+            if qa.get("delivery"):
+                per_question_feedback[-1]["delivery"] = qa["delivery"]
+            if qa.get("vad"):
+                per_question_feedback[-1]["silence_removed_seconds"] = qa["vad"].get("removed_seconds")
 
             tech_scores.append(tech_score / 100)
-            comm_scores.append(comm)
-            conf_scores.append(conf)
-            prof_scores.append(prof)
+
+        # Heuristic scoring: every answer of the session in one batch; spoken answers also
+        # carry acoustic delivery metrics that adjust communication / confidence
+        with span("evaluation.heuristics"):
+            heuristics = get_scorer().score(
+                [qa.get("answer", "") for qa in interview_data],
+                [qa.get("delivery") for qa in interview_data],
+            )
 
         evaluation = {
             "session_id": session_id,
             "technical": round(np.mean(tech_scores) * 100, 2),
-            "communication": round(np.mean(comm_scores) * 100, 2),
-            "confidence": round(np.mean(conf_scores) * 100, 2),
-            "professionalism": round(np.mean(prof_scores) * 100, 2),
+            "communication": round(np.mean(heuristics["communication"]) * 100, 2),
+            "confidence": round(np.mean(heuristics["confidence"]) * 100, 2),
+            "professionalism": round(np.mean(heuristics["professionalism"]) * 100, 2),
             "per_question": per_question_feedback
         }
+        pauses = summarize_pauses(interview_data)
+        if pauses:
+            evaluation["pauses"] = pauses
 
-        print("✅ Evaluation complete for session:", session_id)
+        logger.info("✅ Evaluation complete for session: %s", session_id)
 
         # ✅ Save to Supabase
         try:
             save_evaluation(session_id, evaluation)
-            print("✅ Evaluation saved to Supabase successfully!")
+            logger.debug("✅ Evaluation saved to Supabase successfully!")
         except Exception as e:
-            print(f"⚠️ Failed to save evaluation to Supabase: {e}")
+            logger.warning("⚠️ Failed to save evaluation to Supabase: %s", e)
 
         return evaluation
 
     except Exception as e:
-        print("⚠️ Evaluation failed:", e)
+        logger.exception("⚠️ Evaluation failed: %s", e)
         return {"error": str(e)}
@@ -847,51 +847,81 @@
 # async def root():
 #     return {"message": "🎯 AI Mock Interview API is running!"}
 
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import asyncio
+import contextvars
+import hmac
 import uuid
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from .resume_parser import router as resume_router
 from .main import start_interview
-from .supabase_config import save_interview_session, save_evaluation, save_report, save_roadmap, save_video_url
+from .supabase_config import (
+    save_interview_session, save_evaluation, save_report, update_report, save_roadmap, save_video_url,
+)
 from .Evaluation import get_evaluation
 from .report_generator import compile_scores
 from .roadmap import generate_roadmap_dynamic
-from .text_to_speech import speak_text
-from .question_generator import generate_question
-from .speech_to_text import convert_audio_to_text
+from .text_to_speech import speak_text, set_voice, clear_voice, resolve_voice
+from .prerender import FIXED_LINES, fixed_clip, presenter_clips, start_prerender
+from .question_generator import generate_question, generate_question_from_audio, release_session_context
+from .resume_digest import clear_resume_digest
+from .conversation_memory import record_turn, clear_session as clear_conversation
+from .speech_to_text import convert_audio_stream, decode_upload, transcribe_answer, trim_speech
+from .audio_decoding import AudioDecodeError
+from .streaming_stt import StreamingTranscript, StreamTooLong
+from .stt_backends import preload_stt
+from .llm_gateway import get_call_stats
+from .cost_ledger import session_ledger, top_stages
+from .config import (
+    PROFILING_ENABLED, PROFILING_TOKEN, TRACEMALLOC_ENABLED, DELIVERY_METRICS_ENABLED,
+    STT_PRELOAD, STT_STREAM_IDLE_SECONDS, TURN_MODE, TURN_MULTIMODAL_MAX_SECONDS, DID_WEBHOOK_TOKEN,
+    INTERVIEW_TURN_WORKERS, AUDIO_DECODE_WORKERS,
+)
+from .delivery_metrics import analyze_delivery, analyze_samples
+from .logs import bind_session, get_logger
+from .metrics import REGISTRY
+from .tracing import TracingMiddleware, recent_traces, span
+from .profiling import (
+    ProfilingMiddleware, check_token, list_profiles, get_profile, profile_file,
+    memory_report, dump_snapshot, start_memory_snapshots, profiled,
+)
+
+from backend.ml.avatar_generator_did import (
+    PRESENTER_MAP, generate_avatar_video, handle_webhook as handle_did_webhook,
+)
+
+
+logger = get_logger(__name__)
 
-from backend.ml.avatar_generator_did import generate_avatar_video
+TURN_FALLBACKS = REGISTRY.counter(
+    "turn_multimodal_fallbacks_total", "Multimodal answer turns handled by STT + question instead", ("reason",))
 
+# Blocking work of the answer endpoints, kept off the loop's small default executor: turns mostly
+# wait on LLM calls and D-ID renders, decoding is CPU-bound and must not queue behind them
+_turn_pool = ThreadPoolExecutor(max_workers=INTERVIEW_TURN_WORKERS, thread_name_prefix="interview-turn")
+_decode_pool = ThreadPoolExecutor(max_workers=AUDIO_DECODE_WORKERS, thread_name_prefix="audio-decode")
+
+
+async def _offload(pool: ThreadPoolExecutor, fn, *args):
+    """Run a blocking call on `pool` in a copy of the request's context (trace / log ids, profiler)."""
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(pool, ctx.run, profiled(fn), *args)
 
 app = FastAPI(
     title="AI Mock Interview Backend API",
     version="3.0.0",
 )
-
-# ---------------------------------------------------------
-# CORRECT FINAL PRESENTER → IMAGE + VOICE MAPPING
-# ---------------------------------------------------------
-PRESENTER_MAP = {
-    "Sia": {
-        "image": "https://clips-presenters.d-id.com/v2/anita/Os4oKCBIgZ/yTLykkbYHr/image.png",
-        "voice": "en-IN-AartiNeural"
-    },
-    "Devajit": {
-        "image": "https://clips-presenters.d-id.com/v2/owen/b59Q9LDPkk/wbPSdrq6Yk/image.png",
-        "voice": "en-GB-OllieMultilingualNeural"
-    },
-    "Shaurya": {
-        "image": "https://clips-presenters.d-id.com/v2/arran/Kp1RPNa28e/pjEMU44TFB/image.png",
-        "voice": "en-GB-ThomasNeural"
-    },
-    "Monika": {
-        "image": "https://clips-presenters.d-id.com/v2/ella/p9l_fpg2_k/q15Yu1RvRA/image.png",
-        "voice": "en-US-AriaNeural"
-    }
-}
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TracingMiddleware, router=app)
+start_memory_snapshots()
+if STT_PRELOAD:
+    preload_stt()
+start_prerender()
 
 active_sessions: Dict[str, List[Dict[str, str]]] = {}
 
@@ -908,6 +938,114 @@ async def get_available_voices():
         ],
     }
 
+# ---------------------------------------------------------
+@app.get("/api/interview/clips")
+async def get_fixed_clips(voice_name: str = "Sia", audio_profile: Optional[str] = None):
+    """Pre-rendered fixed lines (greeting, repeat, closing, farewell) for a presenter, to prefetch."""
+    presenter = voice_name if voice_name in PRESENTER_MAP else "Sia"
+    return {"status": "success", "voice_name": presenter, "clips": presenter_clips(presenter, audio_profile)}
+
+# ---------------------------------------------------------
+@app.get("/api/llm/stats")
+async def llm_stats():
+    """Per-task LLM call timings, retries and hedge counters for this worker."""
+    return {"status": "success", "tasks": get_call_stats()}
+
+# ---------------------------------------------------------
+@app.get("/api/costs/top")
+async def costliest_stages(limit: int = 10, by: str = "cost_usd"):
+    """Stages ranked by estimated spend ("cost_usd") or time ("seconds") across recent sessions."""
+    if by not in ("cost_usd", "seconds"):
+        return {"status": "error", "message": "by must be 'cost_usd' or 'seconds'"}
+    return {"status": "success", **top_stages(limit, by)}
+
+
+@app.get("/api/costs/{session_id}")
+async def session_costs(session_id: str):
+    """Token / character / render-second / byte usage and estimated cost of one session, per stage."""
+    ledger = session_ledger(session_id)
+    if ledger is None:
+        return {"status": "error", "message": f"No usage recorded for session {session_id}"}
+    return {"status": "success", "ledger": ledger}
+
+# ---------------------------------------------------------
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint: stage/HTTP latency histograms, in-flight gauges, errors, cache ratios."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/traces")
+async def traces(limit: int = 20, min_ms: float = 0):
+    """Most recent request traces (per-stage spans), newest first."""
+    return {"status": "success", "traces": recent_traces(limit, min_ms)}
+
+# ---------------------------------------------------------
+# 🔬 Opt-in diagnostics (PROFILING_ENABLED / TRACEMALLOC_ENABLED, X-Profile-Token)
+# ---------------------------------------------------------
+def _diagnostics_denied(enabled: bool, token: Optional[str]):
+    if not enabled:
+        return {"status": "error", "message": "Diagnostics are disabled on this worker."}
+    if not PROFILING_TOKEN:
+        return {"status": "error", "message": "Diagnostics need PROFILING_TOKEN configured on this worker."}
+    if not check_token(token):
+        return {"status": "error", "message": "Invalid or missing X-Profile-Token."}
+    return None
+
+
+@app.get("/api/debug/profiles")
+async def profiles(x_profile_token: Optional[str] = Header(None)):
+    """Stored request profiles, newest first."""
+    denied = _diagnostics_denied(PROFILING_ENABLED, x_profile_token)
+    return denied or {"status": "success", "profiles": list_profiles()}
+
+
+@app.get("/api/debug/profiles/{profile_id}")
+async def profile_summary(profile_id: str, x_profile_token: Optional[str] = Header(None)):
+    """Profile metadata plus the top frames by wall and CPU share."""
+    denied = _diagnostics_denied(PROFILING_ENABLED, x_profile_token)
+    if denied:
+        return denied
+    profile = get_profile(profile_id)
+    if profile is None:
+        return {"status": "error", "message": f"Unknown profile: {profile_id}"}
+    return {"status": "success", "profile": profile}
+
+
+@app.get("/api/debug/profiles/{profile_id}/{kind}")
+async def profile_download(profile_id: str, kind: str, x_profile_token: Optional[str] = Header(None)):
+    """Collapsed stacks ('wall' or 'cpu') for flamegraph.pl / speedscope."""
+    denied = _diagnostics_denied(PROFILING_ENABLED, x_profile_token)
+    if denied:
+        return denied
+    path = profile_file(profile_id, kind)
+    if path is None:
+        return {"status": "error", "message": f"No {kind} profile for {profile_id}"}
+    return FileResponse(path, media_type="text/plain", filename=path.name)
+
+
+@app.get("/api/debug/memory")
+async def memory(limit: int = 20, fresh: bool = False, x_profile_token: Optional[str] = Header(None)):
+    """Top tracemalloc allocation sites and growth since the first snapshot."""
+    denied = _diagnostics_denied(TRACEMALLOC_ENABLED, x_profile_token)
+    if denied:
+        return denied
+    # A fresh snapshot walks the whole heap; keep it off the event loop
+    report = await asyncio.get_running_loop().run_in_executor(None, memory_report, limit, fresh)
+    return {"status": "success", "memory": report}
+
+
+@app.get("/api/debug/memory/{snapshot_id}/download")
+async def memory_download(snapshot_id: str, x_profile_token: Optional[str] = Header(None)):
+    """Raw snapshot for offline analysis (tracemalloc.Snapshot.load)."""
+    denied = _diagnostics_denied(TRACEMALLOC_ENABLED, x_profile_token)
+    if denied:
+        return denied
+    path = await asyncio.get_running_loop().run_in_executor(None, dump_snapshot, snapshot_id)
+    if path is None:
+        return {"status": "error", "message": f"Unknown snapshot: {snapshot_id}"}
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
 # ---------------------------------------------------------
 @app.post("/api/interview/answer")
 async def handle_answer(
@@ -919,23 +1057,82 @@ async def handle_answer(
     current_question: str = Form(...),
     user_answer: Optional[str] = Form(None),
     audio_file: Optional[UploadFile] = File(None),
+    audio_profile: Optional[str] = Form(None),
 ):
-    print("\nRAW resume_data:", resume_data)
-
     # Parse safely
     try:
         resume_dict = json.loads(resume_data)
     except:
+        logger.warning("⚠️ Invalid resume JSON (%d chars)", len(resume_data))
         return {"status": "error", "message": "Invalid resume JSON"}
 
     session_id = session_id or str(uuid.uuid4())
+    bind_session(session_id)
+    logger.debug("📝 Answer received: question=%r audio=%s", current_question[:80], bool(audio_file))
 
-    # Speech → text
+    # Speech → text (+ acoustic delivery metrics from the same bytes)
+    delivery = vad = next_question = None
     if audio_file:
-        user_answer = convert_audio_to_text(audio_file)
-
+        try:
+            with span("audio.decode"):
+                audio = await _offload(_decode_pool, decode_upload, audio_file)
+        except AudioDecodeError as e:
+            logger.warning("⚠️ Rejected answer audio %r: %s", audio_file.filename, e)
+            return {"status": "error", "message": str(e)}
+        if TURN_MODE == "multimodal" and current_question.lower() != "start":
+            user_answer, next_question, vad = await _multimodal_turn(
+                audio, resume_dict, current_question, difficulty, session_id)
+        if next_question is None:
+            with span("stt.transcribe"):
+                user_answer, vad = await transcribe_answer(audio)
+        if DELIVERY_METRICS_ENABLED:
+            with span("delivery.analyze"):
+                delivery = analyze_samples(audio.samples, audio.rate, user_answer or "")
+
+    # On the turn pool: the avatar wait must not stall the loop (it serves the D-ID webhook too)
+    return await _offload(_turn_pool, _interview_turn, session_id, resume_dict, difficulty, voice_name,
+                          current_question, user_answer, delivery, vad, next_question, audio_profile)
+
+
+async def _multimodal_turn(audio, resume_dict: Dict[str, Any], current_question: str, difficulty: str,
+                           session_id: str):
+    """
+    (transcript, next question, VAD report) from one multimodal call on the answer's speech,
+    or (None, None, report) when the two-step path should handle the turn instead.
+    """
+    speech, vad = trim_speech(audio)
+    if speech is not None and not speech.segments:
+        return None, None, vad
+    clip = speech.audio if speech is not None else audio
+    if clip.seconds > TURN_MULTIMODAL_MAX_SECONDS:
+        TURN_FALLBACKS.inc(reason="too_long")
+        return None, None, vad
+    try:
+        with span("turn.multimodal"):
+            result = await _offload(_turn_pool, generate_question_from_audio, resume_dict, clip.wav_bytes(),
+                                    current_question, difficulty, session_id)
+    except Exception as e:
+        logger.warning("⚠️ Multimodal turn failed (%s: %s), falling back to STT + question", type(e).__name__, e)
+        TURN_FALLBACKS.inc(reason=type(e).__name__)
+        return None, None, vad
+    if not result["transcript"]:
+        TURN_FALLBACKS.inc(reason="empty_transcript")
+        return None, None, vad
+    return result["transcript"], result["next_question"], vad
+
+
+def _interview_turn(session_id: str, resume_dict: Dict[str, Any], difficulty: str, voice_name: str,
+                    current_question: str, user_answer: Optional[str], delivery: Optional[Dict[str, Any]],
+                    vad: Optional[Dict[str, float]] = None, next_question: Optional[str] = None,
+                    audio_profile: Optional[str] = None):
+    """
+    Everything after speech-to-text: record the answer, then question, voice and avatar.
+    `next_question` is passed when the multimodal turn already produced it; `audio_profile`
+    is the client's delivery format for the interviewer audio (text_to_speech.AUDIO_PROFILES).
+    """
     # GET avatar info
     avatar = PRESENTER_MAP.get(voice_name, PRESENTER_MAP["Sia"])
+    voice_name = voice_name if voice_name in PRESENTER_MAP else "Sia"
     image_url = avatar["image"]
     voice_id = avatar["voice"]
 
@@ -943,28 +1140,36 @@ async def handle_answer(
     # FIRST QUESTION
     # ---------------------------------------------------------
     if current_question.lower() == "start":
-        first_question = generate_question(
-            resume_dict, previous_answer="", difficulty=difficulty, first_question=True
-        )
+        set_voice(voice_name, session_id=session_id)      # the farewell in /stop uses it too
+        with span("question.generate"):
+            first_question = generate_question(
+                resume_dict, previous_answer="", difficulty=difficulty, first_question=True,
+                session_id=session_id,
+            )
 
-        audio_data = speak_text(first_question)
+        with span("tts.speak"):
+            audio_data = speak_text(first_question, voice_name=voice_name, profile=audio_profile)
 
         # Generate D-ID video
         try:
-            video_url = generate_avatar_video(first_question, image_url, voice_id)
+            with span("avatar.generate"):
+                video_url = generate_avatar_video(first_question, image_url, voice_id)
 
             if video_url:
                 save_video_url(session_id, first_question, video_url)
         except Exception as e:
-            print("❌ Avatar error:", e)
+            logger.error("❌ Avatar error: %s", e)
             video_url = None
 
         return {
             "status": "success",
             "session_id": session_id,
+            "greeting": fixed_clip("greeting", voice_name, audio_profile),
             "next_question": first_question,
             "audio_base64": audio_data.get("audio_base64"),
             "audio_url": audio_data.get("audio_url"),
+            "audio_profile": audio_data.get("audio_profile"),
+            "audio_mime": audio_data.get("audio_mime"),
             "video_url": video_url,
         }
 
@@ -972,36 +1177,46 @@ async def handle_answer(
     # USER ANSWERS A QUESTION
     # ---------------------------------------------------------
     if not user_answer:
-        return {"status": "error", "message": "No answer received."}
+        return {"status": "error", "message": "No answer received.",
+                "retry_prompt": fixed_clip("repeat", voice_name, audio_profile)}
 
     if session_id not in active_sessions:
         active_sessions[session_id] = []
 
-    active_sessions[session_id].append({
-        "question": current_question,
-        "answer": user_answer
-    })
+    turn = {"question": current_question, "answer": user_answer}
+    if delivery:
+        turn["delivery"] = delivery
+    if vad:
+        turn["vad"] = vad
+    active_sessions[session_id].append(turn)
+    with span("memory.record_turn"):
+        record_turn(session_id, current_question, user_answer, resume_dict)
 
     # stop command
     if user_answer.lower() in ["stop", "quit", "exit"]:
         return {"status": "finished", "message": "Interview ended."}
 
     # Next question
-    next_question = generate_question(
-        resume_dict, previous_answer=user_answer, difficulty=difficulty
-    )
+    if next_question is None:
+        with span("question.generate"):
+            next_question = generate_question(
+                resume_dict, previous_answer=user_answer, difficulty=difficulty, session_id=session_id
+            )
 
     if not next_question:
-        return {"status": "finished", "message": "Interview completed."}
+        return {"status": "finished", "message": "Interview completed.",
+                "closing": fixed_clip("closing", voice_name, audio_profile)}
 
-    audio_data = speak_text(next_question)
+    with span("tts.speak"):
+        audio_data = speak_text(next_question, voice_name=voice_name, profile=audio_profile)
 
     try:
-        video_url = generate_avatar_video(next_question, image_url, voice_id)
+        with span("avatar.generate"):
+            video_url = generate_avatar_video(next_question, image_url, voice_id)
         if video_url:
             save_video_url(session_id, next_question, video_url)
     except Exception as e:
-        print("❌ Avatar error:", e)
+        logger.error("❌ Avatar error: %s", e)
         video_url = None
 
     return {
@@ -1010,17 +1225,168 @@ async def handle_answer(
         "next_question": next_question,
         "audio_base64": audio_data.get("audio_base64"),
         "audio_url": audio_data.get("audio_url"),
+        "audio_profile": audio_data.get("audio_profile"),
+        "audio_mime": audio_data.get("audio_mime"),
         "video_url": video_url,
+        "delivery": delivery,
+        "vad": vad,
     }
 
+# ---------------------------------------------------------
+# 🎙️ Streaming answer: transcribed while the candidate speaks
+# ---------------------------------------------------------
+async def _ws_send(websocket: WebSocket, payload: Dict[str, Any]) -> bool:
+    """send_json that returns False (instead of raising) once the client has gone away."""
+    try:
+        await websocket.send_json(payload)
+        return True
+    except (WebSocketDisconnect, RuntimeError, OSError):
+        logger.info("🔌 Answer stream client gone, %r message dropped", payload.get("type"))
+        return False
+
+
+async def _ws_fail(websocket: WebSocket, message: str):
+    """Report an error to the streaming client and close the socket (if it is still there)."""
+    if await _ws_send(websocket, {"type": "error", "status": "error", "message": message}):
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass
+
+
+def _control_type(text: str) -> Optional[str]:
+    """The "type" of a JSON control frame, or None for anything that isn't a JSON object."""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return None
+    return message.get("type") if isinstance(message, dict) else None
+
+
+@app.websocket("/api/interview/answer/stream")
+async def stream_answer(websocket: WebSocket):
+    """
+    Same turn as POST /api/interview/answer, with the audio streamed as it is recorded.
+
+      client → {"type": "start", "user_name", "difficulty", "voice_name", "resume_data",
+                "current_question", "session_id"?, "sample_rate"?: 16000, "channels"?: 1,
+                "audio_profile"?: "opus_48000_32"}
+      server → {"type": "ready", "session_id"}
+      client → binary frames of 16-bit little-endian PCM, then {"type": "end"}
+      server → {"type": "partial", "text", "seconds"} while segments finish,
+               {"type": "transcript", "text"} once the tail is done, then
+               {"type": "result", ...the /api/interview/answer response} and closes.
+
+    A stream idle for STT_STREAM_IDLE_SECONDS is treated as ended. sample_rate must be within
+    8000–48000 Hz and channels 1–2; other text frames get {"type": "error"} and are ignored.
+    """
+    await websocket.accept()
+    try:
+        start = await websocket.receive_json()
+        if not isinstance(start, dict):
+            raise TypeError("expected a JSON object")
+        resume_data = start["resume_data"]
+        resume_dict = json.loads(resume_data) if isinstance(resume_data, str) else dict(resume_data)
+        stream = StreamingTranscript(int(start.get("sample_rate", 16000)), int(start.get("channels", 1)))
+        current_question = str(start["current_question"])
+    except WebSocketDisconnect:
+        return
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning("⚠️ Invalid stream start message: %s", e)
+        await _ws_fail(websocket, f"Invalid start message: {e}")
+        return
+
+    session_id = str(start.get("session_id") or uuid.uuid4())
+    bind_session(session_id)
+    logger.debug("📝 Streamed answer started: question=%r", current_question[:80])
+    if not await _ws_send(websocket, {"type": "ready", "session_id": session_id}):
+        return
+
+    partial = ""
+    while True:
+        try:
+            message = await asyncio.wait_for(websocket.receive(), STT_STREAM_IDLE_SECONDS)
+        except asyncio.TimeoutError:
+            logger.info("⏱️ Answer stream idle for %.0fs, finishing", STT_STREAM_IDLE_SECONDS)
+            break
+        if message["type"] == "websocket.disconnect":
+            logger.info("🔌 Answer stream closed by client before the end")
+            return
+        if message.get("bytes") is not None:
+            try:
+                stream.accept(message["bytes"])
+            except StreamTooLong as e:
+                await _ws_fail(websocket, str(e))
+                return
+            text = stream.partial_text()
+            if text != partial:
+                partial = text
+                if not await _ws_send(websocket, {"type": "partial", "text": text,
+                                                  "seconds": round(stream.seconds, 2)}):
+                    return
+        elif message.get("text") is not None:
+            if _control_type(message["text"]) == "end":
+                break
+            if not await _ws_send(websocket, {"type": "error", "status": "error",
+                                              "message": 'Expected binary audio or {"type": "end"}'}):
+                return
+
+    try:
+        with span("stt.stream_finish"):
+            user_answer = await convert_audio_stream(stream)
+        await _ws_send(websocket, {"type": "transcript", "text": user_answer})
+
+        delivery = None
+        if DELIVERY_METRICS_ENABLED:
+            with span("delivery.analyze"):
+                delivery = analyze_delivery(stream.wav_bytes(), user_answer)
+
+        result = await _offload(_turn_pool, _interview_turn, session_id, resume_dict,
+                                start.get("difficulty", "medium"), start.get("voice_name", "Sia"),
+                                current_question, user_answer, delivery, stream.vad_report(), None,
+                                start.get("audio_profile"))
+    except Exception as e:
+        logger.exception("❌ Streamed answer failed: %s", e)
+        await _ws_fail(websocket, str(e))
+        return
+    if await _ws_send(websocket, {"type": "result", **result}):
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass
+
+# ---------------------------------------------------------
+# 📬 D-ID completion webhook (see avatar_generator_did.py)
+# ---------------------------------------------------------
+@app.post("/api/did/webhook")
+async def did_webhook(request: Request, token: Optional[str] = None):
+    """
+    D-ID calls this when a talk finishes; the request waiting on that talk wakes up immediately.
+    Only accepted with the DID_WEBHOOK_TOKEN secret (refused outright when none is configured).
+    """
+    if not DID_WEBHOOK_TOKEN or not hmac.compare_digest(token or "", DID_WEBHOOK_TOKEN):
+        logger.warning("⚠️ D-ID webhook rejected: %s",
+                       "bad token" if DID_WEBHOOK_TOKEN else "no DID_WEBHOOK_TOKEN configured")
+        return {"status": "error", "message": "Invalid or missing webhook token."}
+    try:
+        payload = await request.json()
+    except ValueError:
+        return {"status": "error", "message": "Invalid webhook JSON."}
+    talk_id = handle_did_webhook(payload) if isinstance(payload, dict) else None
+    return {"status": "success", "talk_id": talk_id}
+
 # ---------------------------------------------------------
 @app.post("/api/interview/stop")
 async def stop_interview(payload: Dict[str, str]):
     try:
         session_id = payload["session_id"]
         user_name = payload["user_name"]
+        bind_session(session_id)
 
         qa_pairs = active_sessions.pop(session_id, [])
+        clear_resume_digest(session_id)
+        clear_conversation(session_id)
+        release_session_context(session_id)
 
         save_interview_session(
             session_id=session_id,
@@ -1029,16 +1395,33 @@ async def stop_interview(payload: Dict[str, str]):
             qa_pairs=qa_pairs,
         )
 
-        evaluation = get_evaluation(session_id)
+        with span("evaluation.run"):
+            evaluation = get_evaluation(session_id)
         save_evaluation(session_id, evaluation)
 
-        report = compile_scores(evaluation, {"session_id": session_id})
+        with span("report.compile"):
+            report = compile_scores(evaluation, {"session_id": session_id})
         save_report(session_id, report)
 
-        roadmap = generate_roadmap_dynamic(evaluation)
+        with span("roadmap.generate"):
+            roadmap = generate_roadmap_dynamic(evaluation)
         save_roadmap(session_id, user_name, roadmap)
 
-        final_audio = speak_text(f"That concludes our interview, {user_name}.")
+        # Same script for everyone: served pre-rendered when available, else synthesized live
+        voice_name = resolve_voice(payload.get("voice_name"), session_id)
+        final_audio = fixed_clip("farewell", voice_name, payload.get("audio_profile"))
+        if final_audio is None:
+            with span("tts.speak"):
+                final_audio = speak_text(FIXED_LINES["farewell"], voice_name=voice_name,
+                                         profile=payload.get("audio_profile"))
+        clear_voice(session_id)
+
+        # Attached last so the cost ledger covers the whole session, farewell included
+        report["cost"] = session_ledger(session_id)
+        if report["cost"]:
+            logger.info("💰 Session cost ≈ $%.4f over %d call(s)",
+                        report["cost"]["totals"]["cost_usd"], report["cost"]["totals"]["calls"])
+            update_report(session_id, report)
 
         return {
             "status": "success",
@@ -1047,9 +1430,12 @@ async def stop_interview(payload: Dict[str, str]):
             "roadmap": roadmap,
             "farewell_audio_base64": final_audio.get("audio_base64"),
             "farewell_audio_url": final_audio.get("audio_url"),
+            "farewell_audio_profile": final_audio.get("audio_profile"),
+            "farewell_video_url": final_audio.get("video_url"),
         }
 
     except Exception as e:
+        logger.exception("❌ Failed to stop interview: %s", e)
         return {"status": "error", "message": str(e)}
 
 # ---------------------------------------------------------
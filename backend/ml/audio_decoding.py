@@ -0,0 +1,199 @@
+# backend/ml/audio_decoding.py
+"""
+In-memory decoding of uploaded answer audio (no temp files).
+
+    audio = decode_audio(upload_bytes, target_rate=STT_SAMPLE_RATE)
+    audio.pcm          # int16 mono at audio.rate (a view into the upload when nothing had to change)
+    audio.samples      # float32 in [-1, 1], for NumPy analysis
+    audio.wav_bytes()  # what the STT engines take
+
+Formats are recognised from their magic bytes, not the file name:
+  - WAV (PCM 8/16/24/32-bit, IEEE float, WAVE_FORMAT_EXTENSIBLE) is parsed directly: the sample
+    data is read through a memoryview of the upload, so 16-bit mono at the target rate costs no copy.
+  - WebM / Matroska (browser MediaRecorder, usually Opus), Ogg (Opus / Vorbis), MP3 and FLAC are
+    piped through ffmpeg (stdin → stdout, raw s16le), which also downmixes and resamples.
+
+Uploads over AUDIO_MAX_UPLOAD_BYTES or AUDIO_MAX_SECONDS are refused with AudioDecodeError.
+"""
+import io
+import struct
+import subprocess
+import wave
+from typing import Optional
+
+import numpy as np
+
+from .config import AUDIO_MAX_UPLOAD_BYTES, AUDIO_MAX_SECONDS, FFMPEG_BINARY, AUDIO_DECODE_TIMEOUT_SECONDS
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+WAVE_FORMAT_PCM, WAVE_FORMAT_FLOAT, WAVE_FORMAT_EXTENSIBLE = 0x0001, 0x0003, 0xFFFE
+
+
+class AudioDecodeError(ValueError):
+    """The upload isn't audio we can decode, or is over the size / duration caps."""
+
+
+class DecodedAudio:
+    def __init__(self, pcm: np.ndarray, rate: int, source_format: str):
+        self.pcm = pcm
+        self.rate = rate
+        self.source_format = source_format
+
+    @property
+    def seconds(self) -> float:
+        return len(self.pcm) / self.rate if self.rate else 0.0
+
+    @property
+    def samples(self) -> np.ndarray:
+        return self.pcm.astype(np.float32) / 32768.0
+
+    def wav_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(self.rate)
+            wf.writeframes(memoryview(np.ascontiguousarray(self.pcm, dtype="<i2")))
+        return buffer.getvalue()
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    head = bytes(data[:12])
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"\x1aE\xdf\xa3":
+        return "webm"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return "mp3"
+    return None
+
+
+# ------------------------------------------------------
+# 🔧 Sample conversion
+# ------------------------------------------------------
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype(np.int16)
+
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Float samples at target_rate: block averaging for integer ratios, linear interpolation otherwise."""
+    if rate == target_rate or not len(samples):
+        return samples
+    if rate > target_rate and rate % target_rate == 0:
+        factor = rate // target_rate
+        return samples[: len(samples) // factor * factor].reshape(-1, factor).mean(axis=1, dtype=np.float32)
+    count = int(len(samples) * target_rate / rate)
+    positions = np.arange(count, dtype=np.float64) * (rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+# ------------------------------------------------------
+# 🌊 WAV (parsed in place)
+# ------------------------------------------------------
+def _wav_chunks(view: memoryview):
+    """(fmt chunk, data chunk) memoryviews of a RIFF/WAVE file."""
+    fmt = payload = None
+    pos = 12
+    while pos + 8 <= len(view):
+        chunk_id = bytes(view[pos:pos + 4])
+        size = struct.unpack_from("<I", view, pos + 4)[0]
+        body = view[pos + 8: min(pos + 8 + size, len(view))]   # streaming writers leave size unset
+        if chunk_id == b"fmt ":
+            fmt = body
+        elif chunk_id == b"data":
+            payload = body
+            break
+        pos += 8 + size + (size & 1)
+    if fmt is None or payload is None or len(fmt) < 16:
+        raise AudioDecodeError("Malformed WAV file")
+    return fmt, payload
+
+
+def _decode_wav(data: bytes, target_rate: Optional[int], max_seconds: float) -> DecodedAudio:
+    view = memoryview(data)
+    fmt, payload = _wav_chunks(view)
+    tag, channels, rate, _, block_align, bits = struct.unpack_from("<HHIIHH", fmt)
+    if tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        tag = struct.unpack_from("<H", fmt, 24)[0]   # first two bytes of the sub-format GUID
+    width = bits // 8
+    # width 0 (bits < 8) would make block_align 0 too and pass the layout check below
+    if not channels or not rate or not width or not block_align or block_align != channels * width:
+        raise AudioDecodeError("Unsupported WAV layout")
+    frames = len(payload) // block_align
+    if max_seconds and frames / rate > max_seconds:
+        raise AudioDecodeError(f"Audio is longer than {max_seconds:.0f}s")
+    payload = payload[: frames * block_align]
+
+    if tag == WAVE_FORMAT_PCM and width == 2:
+        ints = np.frombuffer(payload, dtype="<i2")
+        if channels == 1 and (target_rate is None or target_rate == rate):
+            return DecodedAudio(ints, rate, "wav")                       # zero-copy
+        samples = ints.astype(np.float32) / 32768.0
+    elif tag == WAVE_FORMAT_PCM and width == 1:
+        samples = (np.frombuffer(payload, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif tag == WAVE_FORMAT_PCM and width == 3:
+        b = np.frombuffer(payload, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        samples = np.where(ints & 0x800000, ints - 0x1000000, ints).astype(np.float32) / 8388608.0
+    elif tag == WAVE_FORMAT_PCM and width == 4:
+        samples = np.frombuffer(payload, dtype="<i4").astype(np.float32) / 2147483648.0
+    elif tag == WAVE_FORMAT_FLOAT and width in (4, 8):
+        samples = np.frombuffer(payload, dtype="<f4" if width == 4 else "<f8").astype(np.float32)
+    else:
+        raise AudioDecodeError(f"Unsupported WAV encoding (format {tag:#x}, {bits}-bit)")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    if target_rate:
+        samples, rate = resample(samples, rate, target_rate), target_rate
+    return DecodedAudio(to_int16(samples), rate, "wav")
+
+
+# ------------------------------------------------------
+# 🎞️ Compressed formats (ffmpeg pipe)
+# ------------------------------------------------------
+def _decode_ffmpeg(data: bytes, source_format: str, target_rate: Optional[int], max_seconds: float) -> DecodedAudio:
+    rate = target_rate or 16000
+    command = [FFMPEG_BINARY, "-nostdin", "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
+    if max_seconds:
+        command += ["-t", f"{max_seconds + 1:.0f}"]   # decode just past the cap, enough to detect it
+    command += ["-vn", "-ac", "1", "-ar", str(rate), "-f", "s16le", "pipe:1"]
+    try:
+        proc = subprocess.run(command, input=data, capture_output=True, timeout=AUDIO_DECODE_TIMEOUT_SECONDS)
+    except FileNotFoundError as e:
+        raise AudioDecodeError(f"Decoding {source_format} audio needs ffmpeg ({FFMPEG_BINARY} not found)") from e
+    except subprocess.TimeoutExpired as e:
+        raise AudioDecodeError(f"Decoding {source_format} audio timed out") from e
+    if proc.returncode != 0:
+        message = proc.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise AudioDecodeError(f"Could not decode {source_format} audio: {message[-1] if message else proc.returncode}")
+
+    pcm = np.frombuffer(proc.stdout, dtype="<i2", count=len(proc.stdout) // 2)
+    if max_seconds and len(pcm) / rate > max_seconds:
+        raise AudioDecodeError(f"Audio is longer than {max_seconds:.0f}s")
+    return DecodedAudio(pcm, rate, source_format)
+
+
+def decode_audio(data: bytes, target_rate: Optional[int] = None,
+                 max_bytes: int = AUDIO_MAX_UPLOAD_BYTES, max_seconds: float = AUDIO_MAX_SECONDS) -> DecodedAudio:
+    """Decode an upload to mono int16 (resampled to target_rate if given); AudioDecodeError otherwise."""
+    if not data:
+        raise AudioDecodeError("Empty audio upload")
+    if max_bytes and len(data) > max_bytes:
+        raise AudioDecodeError(f"Audio upload exceeds {max_bytes / (1024 * 1024):.1f} MB")
+
+    source_format = sniff_format(data)
+    if source_format is None:
+        raise AudioDecodeError("Unrecognised audio format (expected WAV, WebM, Ogg, MP3 or FLAC)")
+    if source_format == "wav":
+        audio = _decode_wav(data, target_rate, max_seconds)
+    else:
+        audio = _decode_ffmpeg(data, source_format, target_rate, max_seconds)
+    logger.debug("🎧 Decoded %s upload: %d bytes → %.1fs at %d Hz", source_format, len(data), audio.seconds, audio.rate)
+    return audio
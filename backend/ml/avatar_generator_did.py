@@ -136,15 +136,36 @@ Notes:
   - This implementation uses Basic auth by base64-encoding the DID_API_KEY.
   - It supports using a presenter image URL (public D-ID presenter image) and overriding the voice
     by passing a Microsoft voice id (e.g. "en-IN-AartiNeural").
-  - Polling defaults to 180s (3 minutes). You can shorten/lengthen by changing the constants.
+  - Waiting defaults to 180s (3 minutes). You can shorten/lengthen by changing the constants.
+  - Completion: with DID_WEBHOOK_URL and DID_WEBHOOK_TOKEN set, D-ID calls POST /api/did/webhook when
+    the talk is done and the waiting request is woken through TALK_EVENTS right away (no token, no
+    webhooks: the endpoint would accept forged results). Status polling is the fallback, with
+    exponential backoff from DID_POLL_INTERVAL to DID_POLL_MAX_INTERVAL_SECONDS (after
+    DID_WEBHOOK_GRACE_SECONDS when webhooks are on).
 """
 
 import os
+import threading
 import time
 import requests
-import json
 import base64
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .config import (
+    DID_API_URL, DID_WEBHOOK_URL, DID_WEBHOOK_TOKEN, DID_WEBHOOK_GRACE_SECONDS, DID_POLL_MAX_INTERVAL_SECONDS,
+)
+from .cost_ledger import estimate_speech_seconds, record_usage
+from .logs import get_logger, preview
+from .metrics import REGISTRY
+from .tracing import span
+
+logger = get_logger(__name__)
+
+DID_STATUS_POLLS = REGISTRY.counter("did_status_polls_total", "D-ID talk status requests", ("outcome",))
+DID_WEBHOOKS = REGISTRY.counter("did_webhooks_total", "D-ID completion webhooks received", ("outcome",))
+DID_COMPLETIONS = REGISTRY.counter("did_talk_completions_total", "Finished D-ID talks by how we learned of it",
+                                   ("source",))
 
 # Load key from environment
 DID_API_KEY = os.getenv("DID_API_KEY")  # expected like "email:password" or a D-ID API token per your account
@@ -154,6 +175,120 @@ POLL_INTERVAL_SECONDS = int(os.getenv("DID_POLL_INTERVAL", "2"))
 POLL_TIMEOUT_SECONDS = int(os.getenv("DID_POLL_TIMEOUT", "180"))
 
 
+# ------------------------------------------------------
+# 🧑‍💼 Presenters: D-ID image + Microsoft voice per interviewer (names match VOICE_OPTIONS)
+# ------------------------------------------------------
+PRESENTER_MAP = {
+    "Sia": {
+        "image": "https://clips-presenters.d-id.com/v2/anita/Os4oKCBIgZ/yTLykkbYHr/image.png",
+        "voice": "en-IN-AartiNeural"
+    },
+    "Devajit": {
+        "image": "https://clips-presenters.d-id.com/v2/owen/b59Q9LDPkk/wbPSdrq6Yk/image.png",
+        "voice": "en-GB-OllieMultilingualNeural"
+    },
+    "Shaurya": {
+        "image": "https://clips-presenters.d-id.com/v2/arran/Kp1RPNa28e/pjEMU44TFB/image.png",
+        "voice": "en-GB-ThomasNeural"
+    },
+    "Monika": {
+        "image": "https://clips-presenters.d-id.com/v2/ella/p9l_fpg2_k/q15Yu1RvRA/image.png",
+        "voice": "en-US-AriaNeural"
+    }
+}
+
+# Success states vary: done/completed/succeeded/finished/ready
+FINISHED_STATES = ("done", "completed", "succeeded", "finished", "ready")
+FAILED_STATES = ("failed", "error", "rejected")
+
+
+# ------------------------------------------------------
+# 📬 Completion events (webhook → waiting request)
+# ------------------------------------------------------
+class TalkEvents:
+    """
+    In-process hand-off of finished talks from the webhook endpoint to the thread waiting on it.
+    A webhook that beats the waiter (it can arrive before the create call has even returned) is
+    kept for a while so the waiter still finds it.
+    """
+
+    MAX_UNCLAIMED = 256
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiting: Dict[str, threading.Event] = {}
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def expect(self, talk_id: str):
+        with self._lock:
+            self._waiting.setdefault(talk_id, threading.Event())
+
+    def deliver(self, talk_id: str, block: Dict[str, Any]) -> bool:
+        """Store a talk's final status; True if a request in this process is waiting for it."""
+        with self._lock:
+            self._results[talk_id] = block
+            self._results.move_to_end(talk_id)
+            while len(self._results) > self.MAX_UNCLAIMED:
+                self._results.popitem(last=False)
+            event = self._waiting.get(talk_id)
+        if event is not None:
+            event.set()
+        return event is not None
+
+    def wait(self, talk_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """The talk's delivered status, waiting up to `timeout` seconds for it (None if nothing came)."""
+        with self._lock:
+            event = self._waiting.setdefault(talk_id, threading.Event())
+            if talk_id in self._results:
+                return self._results[talk_id]
+        event.wait(max(timeout, 0.0))
+        with self._lock:
+            return self._results.get(talk_id)
+
+    def forget(self, talk_id: str):
+        with self._lock:
+            self._waiting.pop(talk_id, None)
+            self._results.pop(talk_id, None)
+
+
+TALK_EVENTS = TalkEvents()
+
+# Webhooks carry the result URL handed to candidates, so they are only used with a shared secret
+WEBHOOKS_ENABLED = bool(DID_WEBHOOK_URL and DID_WEBHOOK_TOKEN)
+if DID_WEBHOOK_URL and not DID_WEBHOOK_TOKEN:
+    logger.warning("⚠️ DID_WEBHOOK_URL is set without DID_WEBHOOK_TOKEN; D-ID webhooks disabled, polling only")
+
+
+def _talk_block(data: Dict[str, Any]) -> Dict[str, Any]:
+    """D-ID typically returns a `data` block; normalize."""
+    return data.get("data") or data
+
+
+def _talk_status(block: Dict[str, Any]) -> str:
+    status = block.get("status") or block.get("state") or ""
+    return status.lower() if isinstance(status, str) else ""
+
+
+def handle_webhook(payload: Dict[str, Any]) -> Optional[str]:
+    """Deliver a D-ID webhook body to whoever waits on that talk; returns the talk id (None if unusable)."""
+    block = _talk_block(payload)
+    talk_id = block.get("id") or payload.get("id")
+    if not talk_id or _talk_status(block) not in FINISHED_STATES + FAILED_STATES:
+        DID_WEBHOOKS.inc(outcome="ignored")
+        logger.debug("📭 D-ID webhook ignored: %s", preview(payload, 500))
+        return None
+    claimed = TALK_EVENTS.deliver(talk_id, block)
+    DID_WEBHOOKS.inc(outcome="delivered" if claimed else "unclaimed")
+    logger.debug("📬 D-ID webhook for %s (%s, %s)", talk_id, _talk_status(block), "waiting" if claimed else "kept")
+    return talk_id
+
+
+def _webhook_url() -> Optional[str]:
+    if not WEBHOOKS_ENABLED:
+        return None
+    return f"{DID_WEBHOOK_URL}{'&' if '?' in DID_WEBHOOK_URL else '?'}token={DID_WEBHOOK_TOKEN}"
+
+
 def _auth_headers():
     """Return headers with Basic auth (base64 of DID_API_KEY)."""
     if not DID_API_KEY:
@@ -181,14 +316,10 @@ def generate_avatar_video(text: str, image_url: str, voice_id: Optional[str] = N
         or None on error / timeout.
     """
 
-    print("FILE USED:", __file__)
-    print("DID_API_KEY loaded:", bool(DID_API_KEY))
-    print("image_url:", image_url)
-    print("voice_id:", voice_id)
-    print("text preview:", text[:120].replace("\n", " "))
+    logger.debug("🎬 D-ID talk: image_url=%s voice_id=%s text=%s", image_url, voice_id, preview(text, 120))
 
     if not DID_API_KEY:
-        print("❌ DID_API_KEY missing — set DID_API_KEY in your .env")
+        logger.error("❌ DID_API_KEY missing — set DID_API_KEY in your .env")
         return None
 
     headers = _auth_headers()
@@ -209,31 +340,32 @@ def generate_avatar_video(text: str, image_url: str, voice_id: Optional[str] = N
         },
         "metadata": {"generated_by": "aimockinterview-backend"},
     }
+    webhook = _webhook_url()
+    if webhook:
+        payload["webhook"] = webhook
 
-    # Debug prints (trim long payload)
-    try:
-        print("\n📦 PAYLOAD SENT to D-ID:")
-        print(json.dumps(payload, indent=2)[:3000])
-    except Exception:
-        pass
+    # The webhook URL carries the shared secret; log it without
+    logged = dict(payload, webhook=DID_WEBHOOK_URL) if webhook else payload
+    logger.debug("📦 Payload sent to D-ID: %s", preview(logged, 3000))
 
-    create_url = "https://api.d-id.com/talks"
+    create_url = f"{DID_API_URL}/talks"
 
+    started = time.perf_counter()
     try:
-        resp = requests.post(create_url, headers=headers, json=payload, timeout=30)
+        with span("did.create"):
+            resp = requests.post(create_url, headers=headers, json=payload, timeout=30)
     except Exception as e:
-        print("❌ Error calling D-ID create:", e)
+        logger.error("❌ Error calling D-ID create: %s", e)
         return None
 
     # parse response
     try:
         result = resp.json()
     except Exception:
-        print("❌ Non-JSON response from D-ID create:", resp.status_code, resp.text[:1000])
+        logger.error("❌ Non-JSON response from D-ID create: %s %s", resp.status_code, preview(resp.text, 1000))
         return None
 
-    print("\n📩 /talks create response:")
-    print(json.dumps(result, indent=2)[:3000])
+    logger.debug("📩 /talks create response: %s", preview(result, 3000))
 
     # D-ID returns 'id' for the talk (sometimes under data.id)
     talk_id = result.get("id") or (result.get("data") or {}).get("id")
@@ -242,61 +374,84 @@ def generate_avatar_video(text: str, image_url: str, voice_id: Optional[str] = N
         talk_id = (result.get("data") or {}).get("video_id") or result.get("video_id")
 
     if not talk_id:
-        print("❌ No talk/video id returned — create failed or payload invalid.")
+        logger.error("❌ No talk/video id returned — create failed or payload invalid: %s", preview(result, 500))
         return None
 
-    print("🎬 TALK ID:", talk_id)
-
-    # Poll the talk status until finished
-    status_url = f"https://api.d-id.com/talks/{talk_id}"
-    start = time.time()
-    print("\n⏳ Polling for video completion... (timeout %s seconds)" % POLL_TIMEOUT_SECONDS)
-
-    while True:
-        try:
-            status_resp = requests.get(status_url, headers=headers, timeout=15)
-        except Exception as e:
-            print("❌ Error polling status:", e)
-            if time.time() - start > POLL_TIMEOUT_SECONDS:
-                print("❌ Polling timed out (network error).")
-                return None
-            time.sleep(POLL_INTERVAL_SECONDS)
-            continue
-
-        try:
-            status_data = status_resp.json()
-        except Exception:
-            print("❌ Non-JSON status response:", status_resp.status_code, status_resp.text[:1000])
-            if time.time() - start > POLL_TIMEOUT_SECONDS:
-                print("❌ Polling timed out.")
-                return None
-            time.sleep(POLL_INTERVAL_SECONDS)
-            continue
-
-        # D-ID typically returns a `data` block; normalize
-        block = status_data.get("data") or status_data
-        status = (block.get("status") or block.get("state") or "")
-        print("⏱️ status:", status)
-
-        # Common places D-ID puts the final URL
-        video_url = block.get("video_url") or block.get("result_url") or (block.get("video") or {}).get("url")
-
-        # Success states vary: done/completed/succeeded/finished/ready
-        if isinstance(status, str) and status.lower() in ("done", "completed", "succeeded", "finished", "ready"):
-            if video_url:
-                print("✅ VIDEO READY:", video_url)
-                return video_url
-            # finished but no url — return talk id so caller can fetch later
-            print("✅ Finished but no direct URL found — returning talk_id:", talk_id)
-            return talk_id
-
-        if isinstance(status, str) and status.lower() in ("failed", "error"):
-            print("❌ Video generation failed:", json.dumps(status_data, indent=2)[:2000])
-            return None
-
-        if time.time() - start > POLL_TIMEOUT_SECONDS:
-            print("❌ Timeout waiting for D-ID to finish (polling stopped).")
-            # D-ID may email the video or you can fetch later using talk_id
-            return None
-
-        time.sleep(POLL_INTERVAL_SECONDS)
+    logger.info("🎬 D-ID talk created: %s", talk_id)
+
+    # Wait for the webhook (or poll) until finished
+    with span("did.render_wait", webhook=WEBHOOKS_ENABLED):
+        result, render_seconds = _wait_for_talk(talk_id, headers)
+
+    if result:
+        # D-ID bills rendered video seconds; estimate from the script if the talk didn't report them
+        record_usage("avatar.did", time.perf_counter() - started,
+                     render_seconds=render_seconds or estimate_speech_seconds(text))
+    return result
+
+
+def _fetch_status(talk_id: str, headers: dict) -> Optional[Dict[str, Any]]:
+    """One GET /talks/{id}; the normalized status block, or None on a network / non-JSON error."""
+    try:
+        status_resp = requests.get(f"{DID_API_URL}/talks/{talk_id}", headers=headers, timeout=15)
+    except Exception as e:
+        DID_STATUS_POLLS.inc(outcome="network_error")
+        logger.warning("❌ Error polling status: %s", e)
+        return None
+    try:
+        status_data = status_resp.json()
+    except Exception:
+        DID_STATUS_POLLS.inc(outcome="bad_json")
+        logger.warning("❌ Non-JSON status response: %s %s", status_resp.status_code, preview(status_resp.text, 1000))
+        return None
+    DID_STATUS_POLLS.inc(outcome="ok")
+    return _talk_block(status_data)
+
+
+def _wait_for_talk(talk_id: str, headers: dict) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Wait until the talk is done, failed or POLL_TIMEOUT_SECONDS runs out: a webhook wakes us at once,
+    otherwise GET /talks/{id} is polled with exponential backoff.
+    Returns (video url / talk id / None, rendered duration in seconds if D-ID reported it).
+    """
+    deadline = time.monotonic() + POLL_TIMEOUT_SECONDS
+    delay = DID_WEBHOOK_GRACE_SECONDS if WEBHOOKS_ENABLED else POLL_INTERVAL_SECONDS
+    logger.debug("⏳ Waiting for video completion... (timeout %s seconds, first poll in %.1fs)",
+                 POLL_TIMEOUT_SECONDS, delay)
+
+    TALK_EVENTS.expect(talk_id)
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error("❌ Timeout waiting for D-ID to finish (polling stopped).")
+                # D-ID may email the video or you can fetch later using talk_id
+                return None, None
+
+            block, source = TALK_EVENTS.wait(talk_id, min(delay, remaining)), "webhook"
+            if block is None:
+                block, source = _fetch_status(talk_id, headers), "poll"
+            delay = min(delay * 2, DID_POLL_MAX_INTERVAL_SECONDS)
+            if block is None:
+                continue
+
+            status = _talk_status(block)
+            logger.debug("⏱️ status: %s (%s)", status, source)
+
+            # Common places D-ID puts the final URL
+            video_url = block.get("video_url") or block.get("result_url") or (block.get("video") or {}).get("url")
+
+            if status in FINISHED_STATES:
+                DID_COMPLETIONS.inc(source=source)
+                if video_url:
+                    logger.info("✅ Video ready: %s", video_url)
+                    return video_url, block.get("duration")
+                # finished but no url — return talk id so caller can fetch later
+                logger.info("✅ Finished but no direct URL found — returning talk_id: %s", talk_id)
+                return talk_id, block.get("duration")
+
+            if status in FAILED_STATES:
+                logger.error("❌ Video generation failed: %s", preview(block, 2000))
+                return None, None
+    finally:
+        TALK_EVENTS.forget(talk_id)
@@ -0,0 +1,252 @@
+# backend/ml/benchmarks/bench_hot_paths.py
+"""
+Microbenchmarks for the CPU-bound hot paths, run over the committed synthetic corpus
+(corpus/resumes/*.txt, corpus/transcripts/*.txt):
+
+  - resume_parser : extract_text (.docx / .pdf), extract_skills, extract_sections
+  - Evaluation    : analyze_communication / analyze_confidence / analyze_professionalism
+  - heuristic_scoring: all three dimensions for a whole batch of answers / sessions
+  - delivery_metrics: acoustic features of a 30 s spoken answer
+  - audio_decoding / vad: decoding that answer and trimming its silence before STT
+  - supabase_config: JSON (de)serialization of resume_data and interview_data
+
+Run from the project root:
+    python -m backend.ml.benchmarks.bench_hot_paths                 # print timings and ratios
+    python -m backend.ml.benchmarks.bench_hot_paths --save          # record new baselines
+    python -m backend.ml.benchmarks.bench_hot_paths --compare       # exit 1 on regressions
+    python -m backend.ml.benchmarks.bench_hot_paths --compare --threshold 0.3 --only analyze_
+
+Timings are normalised by a fixed pure-Python calibration workload measured next to each
+case, so baselines (benchmarks/baselines.json) hold ratios rather than machine-specific µs:
+a case at 2.0 takes twice as long as the calibration loop. Each ratio is the median over
+--rounds interleaved passes, and --compare gates on those ratios.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+
+from backend.ml.benchmarks.corpus import (
+    load_resume_texts, load_transcripts, build_resume_data, build_docx, build_pdf, build_wav,
+)
+
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+
+def _setup_cases() -> Dict[str, Tuple[Callable[[], None], int]]:
+    """name -> (fn processing the whole corpus once, items per call)."""
+    # resume_parser / Evaluation import supabase_config, which refuses to load without credentials.
+    # The benchmarks never talk to Supabase, so placeholders are enough.
+    from backend.ml.loadtest.stubs import DUMMY_SUPABASE_URL, DUMMY_SUPABASE_KEY
+
+    os.environ.setdefault("SUPABASE_URL", DUMMY_SUPABASE_URL)
+    os.environ.setdefault("SUPABASE_KEY", DUMMY_SUPABASE_KEY)
+    os.environ.setdefault("LLM_BACKEND", "local")
+
+    from backend.ml.resume_parser import extract_text, extract_skills, extract_sections
+    from backend.ml.Evaluation import analyze_communication, analyze_confidence, analyze_professionalism
+    from backend.ml.heuristic_scoring import get_scorer
+    from backend.ml.delivery_metrics import analyze_delivery
+    from backend.ml.audio_decoding import decode_audio
+    from backend.ml.vad import trim_silence
+
+    resumes = load_resume_texts()
+    answers = load_transcripts()
+    docx_files = [build_docx(text) for text in resumes]
+    pdf_files = [build_pdf(text) for text in resumes]
+    resume_data = [build_resume_data(text) for text in resumes]
+    resume_json = [json.dumps(data) for data in resume_data]
+    qa_pairs = [{"question": f"Question {i}?", "answer": a} for i, a in enumerate(answers)]
+    qa_json = json.dumps(qa_pairs)
+    scorer = get_scorer()
+    sessions = [answers[i:i + 8] for i in range(0, len(answers), 8)]
+    answer_wav = build_wav(30)
+    answer_audio = decode_audio(answer_wav, target_rate=16000)
+
+    def uploads(blobs, suffix):
+        return [SimpleNamespace(filename=f"resume_{i}{suffix}", file=io.BytesIO(b)) for i, b in enumerate(blobs)]
+
+    docx_uploads, pdf_uploads = uploads(docx_files, ".docx"), uploads(pdf_files, ".pdf")
+
+    def run_extract_text(files):
+        def run():
+            for upload in files:
+                upload.file.seek(0)
+                extract_text(upload)
+        return run
+
+    def over(items, fn):
+        def run():
+            for item in items:
+                fn(item)
+        return run
+
+    return {
+        "resume_parser.extract_text.docx": (run_extract_text(docx_uploads), len(docx_uploads)),
+        "resume_parser.extract_text.pdf": (run_extract_text(pdf_uploads), len(pdf_uploads)),
+        "resume_parser.extract_skills": (over(resumes, extract_skills), len(resumes)),
+        "resume_parser.extract_sections": (over(resumes, extract_sections), len(resumes)),
+        "Evaluation.analyze_communication": (over(answers, analyze_communication), len(answers)),
+        "Evaluation.analyze_confidence": (over(answers, analyze_confidence), len(answers)),
+        "Evaluation.analyze_professionalism": (over(answers, analyze_professionalism), len(answers)),
+        # µs per answer, all three dimensions
+        "heuristic_scoring.score": (lambda: scorer.score(answers), len(answers)),
+        "heuristic_scoring.score_sessions": (lambda: scorer.score_sessions(sessions), len(answers)),
+        "delivery_metrics.analyze_delivery": (lambda: analyze_delivery(answer_wav, answers[0]), 1),
+        "audio_decoding.decode_audio": (lambda: decode_audio(answer_wav, target_rate=16000), 1),
+        "vad.trim_silence": (lambda: trim_silence(answer_audio), 1),
+        # what save_resume / fetch_resume and save_interview_session / get_evaluation do per row
+        "supabase_config.resume_json.dumps": (over(resume_data, json.dumps), len(resume_data)),
+        "supabase_config.resume_json.loads": (over(resume_json, json.loads), len(resume_json)),
+        "supabase_config.interview_json.dumps": (lambda: json.dumps(qa_pairs), 1),
+        "supabase_config.interview_json.loads": (lambda: json.loads(qa_json), 1),
+    }
+
+
+def _calibration() -> Callable[[], None]:
+    """Reference workload (regex scan, dict counting, JSON round trip, sort) the cases are expressed in."""
+    text = " ".join(f"word{i % 97} value{i}" for i in range(2000))
+    pattern = re.compile(r"\bword(\d+)\b")
+    data = {f"k{i}": [i, str(i), i * 0.5] for i in range(200)}
+
+    def run():
+        counts = {}
+        for match in pattern.finditer(text):
+            counts[match.group(1)] = counts.get(match.group(1), 0) + 1
+        json.loads(json.dumps(data))
+        sorted(counts.items(), key=lambda kv: kv[1])
+    return run
+
+
+def measure(fn: Callable[[], None], items: int, repeat: int, min_time: float) -> float:
+    """
+    Best-of-`repeat` µs per item. Each sample loops `fn` enough times to last at least `min_time`
+    seconds; the minimum is the least noisy estimate on a shared machine (as timeit recommends).
+    """
+    fn()  # warm-up (regex compilation, imports, caches)
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / (loops * items))
+    return min(samples) * 1e6
+
+
+def load_baselines() -> Dict[str, float]:
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH, "r", encoding="utf-8") as f:
+        return {name: entry["relative"] for name, entry in json.load(f).get("cases", {}).items()
+                if "relative" in entry}
+
+
+def save_baselines(ratios: Dict[str, float]):
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "unit": "multiples of the calibration workload per item",
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": {name: {"relative": float(f"{ratio:.4g}")} for name, ratio in sorted(ratios.items())},
+    }
+    with open(BASELINES_PATH, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def compare(ratios: Dict[str, float], baselines: Dict[str, float], threshold: float) -> List[str]:
+    """Print current vs. baseline ratio per case and return the names that regressed beyond `threshold`."""
+    regressions = []
+    print(f"\n{'case':<42} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, ratio in ratios.items():
+        base = baselines.get(name)
+        if base is None:
+            print(f"{name:<42} {'-':>10} {ratio:>9.4g}x {'new':>8}")
+            continue
+        change = ratio / base - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  ❌ regression"
+        print(f"{name:<42} {base:>9.4g}x {ratio:>9.4g}x {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="samples per measurement (the fastest is kept)")
+    parser.add_argument("--rounds", type=int, default=3, help="interleaved passes over all cases (median ratio)")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per sample")
+    parser.add_argument("--only", help="run only cases whose name contains this substring")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baselines")
+    parser.add_argument("--compare", action="store_true", help="compare against baselines.json")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs. baseline before --compare fails (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    cases = _setup_cases()
+    if args.only:
+        cases = {name: case for name, case in cases.items() if args.only in name}
+
+    calibrate = _calibration()
+
+    def timed(names):
+        """Best µs/item and median ratio per case over `--rounds` interleaved passes."""
+        samples = {name: [] for name in names}
+        for _ in range(args.rounds):
+            for name in names:
+                # The calibration is re-measured right next to each case, so a slow spell on a
+                # shared runner inflates both and cancels out of the ratio
+                calibration_us = measure(calibrate, 1, args.repeat, args.min_time)
+                us = measure(*cases[name], args.repeat, args.min_time)
+                samples[name].append((us, us / calibration_us))
+        return ({name: min(us for us, _ in s) for name, s in samples.items()},
+                {name: statistics.median(r for _, r in s) for name, s in samples.items()})
+
+    results, ratios = timed(list(cases))
+    if not args.compare:
+        for name in cases:
+            print(f"{name:<42} {results[name]:>10.2f} µs/item {ratios[name]:>9.4g}x")
+
+    if args.save:
+        save_baselines({**load_baselines(), **ratios} if args.only else ratios)
+        print(f"💾 Baselines written to {BASELINES_PATH}")
+
+    if args.compare:
+        baselines = load_baselines()
+        if not baselines:
+            print(f"⚠️ No baselines at {BASELINES_PATH}; run with --save first.")
+            sys.exit(2)
+        regressions = compare(ratios, baselines, args.threshold)
+        if regressions:
+            # One noisy sample window shouldn't fail the run: re-measure the suspects once.
+            print(f"\n🔁 Re-measuring {len(regressions)} suspect case(s)...")
+            retry = {name: min(ratios[name], ratio) for name, ratio in timed(regressions)[1].items()}
+            regressions = compare(retry, baselines, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} hot path(s) slower than baseline by more than {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\n✅ No hot path regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# backend/ml/benchmarks/bench_prompt_tokens.py
+"""
+Prompt size per question turn: full `json.dumps(resume_data, indent=2)` vs. the cached resume digest.
+
+Run from the project root:
+    python -m backend.ml.benchmarks.bench_prompt_tokens [--scale 1]
+"""
+import argparse
+import json
+import time
+
+from backend.ml.benchmarks.corpus import load_resume_texts, build_resume_data
+from backend.ml.resume_digest import estimate_tokens, build_resume_digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'resume':<8} {'full json tokens':>17} {'digest tokens':>14} {'saved':>7} {'digest build':>14}")
+    total_full = total_digest = 0
+    for i, text in enumerate(load_resume_texts(args.scale), start=1):
+        resume_data = build_resume_data(text)
+        full = estimate_tokens(json.dumps(resume_data, indent=2))
+
+        start = time.perf_counter()
+        digest = estimate_tokens(build_resume_digest(resume_data))
+        build_us = (time.perf_counter() - start) * 1e6
+
+        total_full += full
+        total_digest += digest
+        print(f"#{i:<7} {full:>17} {digest:>14} {1 - digest / full:>6.0%} {build_us:>11.0f} µs")
+
+    print(f"{'total':<8} {total_full:>17} {total_digest:>14} {1 - total_digest / total_full:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# backend/ml/benchmarks/bench_resume_sections.py
+"""
+Benchmark: legacy multi-regex extract_sections vs. the single-pass segmenter.
+
+Run from the project root:
+    python -m backend.ml.benchmarks.bench_resume_sections [--repeat 200] [--scale 1]
+
+`--scale N` concatenates every corpus resume N times to see how both scale with length.
+"""
+import argparse
+import re
+import statistics
+import time
+from pathlib import Path
+
+from backend.ml.resume_sections import segment_resume
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus" / "resumes"
+
+# The pre-segmenter implementation, kept here only as the benchmark reference.
+LEGACY_SECTION_PATTERNS = {
+    "experience": re.compile(r"(experience|work history|professional experience)", re.I),
+    "education": re.compile(r"(education|academic background|qualifications)", re.I),
+    "projects": re.compile(r"(projects|research experience|portfolio)", re.I),
+    "skills": re.compile(r"(skills|technical skills|expertise)", re.I),
+}
+
+
+def legacy_extract_sections(text: str):
+    sections = {key: [] for key in LEGACY_SECTION_PATTERNS.keys()}
+    current_section = None
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        for section, pattern in LEGACY_SECTION_PATTERNS.items():
+            if pattern.search(line):
+                current_section = section
+                break
+        if current_section:
+            sections[current_section].append(line)
+    return {sec: " ".join(content) for sec, content in sections.items()}
+
+
+def load_corpus(scale: int = 1):
+    return [path.read_text(encoding="utf-8") * scale for path in sorted(CORPUS_DIR.glob("*.txt"))]
+
+
+def time_per_resume(fn, corpus, repeat: int) -> float:
+    """Median microseconds per resume over `repeat` passes of the whole corpus."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        samples.append((time.perf_counter() - start) / len(corpus))
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.scale)
+    lines = sum(text.count("\n") + 1 for text in corpus)
+    print(f"📚 {len(corpus)} resumes, {lines} lines (scale x{args.scale}, {args.repeat} repeats)")
+
+    legacy_us = time_per_resume(legacy_extract_sections, corpus, args.repeat)
+    single_us = time_per_resume(segment_resume, corpus, args.repeat)
+
+    print(f"{'legacy extract_sections (sections only)':<45} {legacy_us:9.1f} µs/resume")
+    print(f"{'segment_resume (sections + entities)':<45} {single_us:9.1f} µs/resume")
+    print(f"{'ratio (legacy / single-pass)':<45} {legacy_us / single_us:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# backend/ml/benchmarks/bench_stt.py
+"""
+Compare speech-to-text engines on latency and word error rate.
+
+Fixtures are pairs in corpus/stt/ (or --fixtures DIR): <name>.wav (PCM WAV, any rate / channels)
+and <name>.txt holding the reference transcript. Record a handful of real interview answers —
+accents, fast and hesitant speakers, background noise — and transcribe them by hand once.
+
+Run from the project root:
+    python -m backend.ml.benchmarks.bench_stt                          # google + vosk
+    python -m backend.ml.benchmarks.bench_stt --backends vosk --repeat 3
+    STT_VOSK_MODEL_PATH=models/vosk-model-en-us-0.22 python -m backend.ml.benchmarks.bench_stt --backends vosk
+
+Per engine it reports model load time, p50 / p95 latency per file, real-time factor
+(latency / audio duration; < 1 is faster than real time) and corpus WER
+(word edits / reference words, after lowercasing and stripping punctuation).
+"""
+import argparse
+import re
+import sys
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "corpus" / "stt"
+
+
+def normalize(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_edits(reference: List[str], hypothesis: List[str]) -> int:
+    """Word-level Levenshtein distance (substitutions + deletions + insertions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def load_fixtures(directory: Path) -> List[Tuple[str, bytes, str, float]]:
+    """(name, wav bytes, reference text, audio seconds) for every .wav with a matching .txt."""
+    fixtures = []
+    for wav_path in sorted(directory.glob("*.wav")):
+        ref_path = wav_path.with_suffix(".txt")
+        if not ref_path.exists():
+            print(f"⚠️ {wav_path.name}: no {ref_path.name}, skipped")
+            continue
+        with wave.open(str(wav_path), "rb") as wf:
+            seconds = wf.getnframes() / wf.getframerate()
+        fixtures.append((wav_path.stem, wav_path.read_bytes(), ref_path.read_text(encoding="utf-8").strip(), seconds))
+    return fixtures
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def bench_backend(name: str, fixtures, repeat: int) -> Dict[str, float]:
+    from backend.ml.stt_backends import build_stt_backend
+
+    backend = build_stt_backend(name)
+    start = time.perf_counter()
+    backend.load()
+    load_seconds = time.perf_counter() - start
+
+    latencies, rtfs, edits, ref_words, failures = [], [], 0, 0, 0
+    for fixture_name, wav, reference, seconds in fixtures:
+        hypothesis = ""
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                hypothesis = backend.transcribe(wav)
+            except Exception as e:
+                failures += 1
+                print(f"   ❌ {name} / {fixture_name}: {type(e).__name__}: {e}")
+                continue
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            rtfs.append(elapsed / seconds if seconds else 0.0)
+        ref = normalize(reference)
+        edits += word_edits(ref, normalize(hypothesis))
+        ref_words += len(ref)
+
+    return {
+        "load_s": load_seconds,
+        "p50_s": _percentile(latencies, 0.5) if latencies else float("nan"),
+        "p95_s": _percentile(latencies, 0.95) if latencies else float("nan"),
+        "rtf": sum(rtfs) / len(rtfs) if rtfs else float("nan"),
+        "wer": edits / ref_words if ref_words else float("nan"),
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="google,vosk", help="comma-separated STT_BACKEND names")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="directory of .wav + .txt pairs")
+    parser.add_argument("--repeat", type=int, default=1, help="transcriptions per file (latency samples)")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures.is_dir() else []
+    if not fixtures:
+        print(f"⚠️ No fixtures in {args.fixtures}: add <name>.wav + <name>.txt pairs (see --help).")
+        sys.exit(2)
+    total_seconds = sum(f[3] for f in fixtures)
+    print(f"🎧 {len(fixtures)} fixture(s), {total_seconds:.1f}s of audio\n")
+
+    print(f"{'backend':<10} {'load':>8} {'p50':>8} {'p95':>8} {'RTF':>6} {'WER':>7} {'failed':>7}")
+    for name in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        try:
+            r = bench_backend(name, fixtures, args.repeat)
+        except Exception as e:
+            print(f"{name:<10} unavailable: {type(e).__name__}: {e}")
+            continue
+        print(f"{name:<10} {r['load_s']:>7.2f}s {r['p50_s']:>7.2f}s {r['p95_s']:>7.2f}s "
+              f"{r['rtf']:>6.2f} {r['wer']:>7.1%} {r['failures']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# backend/ml/benchmarks/corpus.py
+"""Helpers for loading the committed synthetic corpus and building synthetic uploads (.docx, .pdf, .wav)."""
+from pathlib import Path
+from typing import Dict, Any, List
+
+from backend.ml.resume_sections import SECTION_NAMES, segment_resume, section_text
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+
+def load_resume_texts(scale: int = 1) -> List[str]:
+    """Every corpus resume as text, optionally repeated `scale` times to simulate long resumes."""
+    return [path.read_text(encoding="utf-8") * scale for path in sorted((CORPUS_DIR / "resumes").glob("*.txt"))]
+
+
+def load_transcripts() -> List[str]:
+    """Every corpus interview answer (one answer per line in corpus/transcripts/*.txt)."""
+    answers = []
+    for path in sorted((CORPUS_DIR / "transcripts").glob("*.txt")):
+        answers.extend(line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip())
+    return answers
+
+
+def build_resume_data(text: str, filename: str = "resume.pdf") -> Dict[str, Any]:
+    """Shape a corpus resume like the /api/resume/upload response `data` (without spaCy / Supabase)."""
+    structure = segment_resume(text)
+    skills_text = section_text(structure, "skills")
+    skills = [s.strip().lower() for s in skills_text.replace(";", ",").split(",") if s.strip()]
+    return {
+        "filename": filename,
+        "skills": skills,
+        "sections": {sec: section_text(structure, sec) for sec in SECTION_NAMES},
+        "structure": {key: structure[key] for key in ("spans", "dates", "experience_months", "employers", "projects")},
+        "raw_text": text[:500],
+        "uploaded_at": "2025-01-01T00:00:00",
+    }
+
+
+def build_docx(text: str) -> bytes:
+    """Minimal in-memory .docx (one paragraph per line) that docx2txt / Word can read."""
+    import io
+    import zipfile
+    from xml.sax.saxutils import escape
+
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{paragraphs}</w:body></w:document>"
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", rels)
+        zf.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def build_pdf(text: str, lines_per_page: int = 60) -> bytes:
+    """Minimal text-only PDF (Helvetica, one text line per resume line) that PyPDF2 can extract."""
+    def escape(line):
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    lines = [line.encode("latin-1", "replace").decode("latin-1") for line in text.split("\n")]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # objects: 1 catalog, 2 pages, 3 font, then (page, content) pairs
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>", 3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for n, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * n, 5 + 2 * n
+        kids.append(f"{page_id} 0 R")
+        body = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({escape(l)}) Tj T*" for l in page_lines) + " ET"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        objects[content_id] = f"<< /Length {len(body.encode('latin-1'))} >>\nstream\n{body}\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for obj_id in sorted(objects):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+def build_wav(seconds: float = 3.0, sample_rate: int = 16000, seed: int = 0) -> bytes:
+    """Synthetic 16-bit mono WAV: bursts of a voiced-like tone separated by short pauses."""
+    import io
+    import math
+    import random
+    import wave
+    from array import array
+
+    rng = random.Random(seed)
+    samples = array("h")
+    for i in range(int(seconds * sample_rate)):
+        t = i / sample_rate
+        voiced = (t % 0.8) < 0.6            # 600 ms "speech", 200 ms pause
+        amp = 6000 if voiced else 150
+        value = amp * math.sin(2 * math.pi * 180 * t) + rng.gauss(0, amp * 0.1)
+        samples.append(max(-32768, min(32767, int(value))))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(samples.tobytes())
+    return buffer.getvalue()
@@ -0,0 +1,111 @@
+# backend/ml/chunked_stt.py
+"""
+Chunked, concurrent transcription of long answers.
+
+A 2-3 minute answer sent as one recognition is slow (one long round trip) and fragile (one
+error loses everything). Instead the speech pieces found by VAD are packed, in order, into chunks
+of about STT_CHUNK_SECONDS; a piece longer than STT_CHUNK_MAX_SECONDS is split at its quietest
+frame, so cuts always fall in silence or the softest point available. Chunks are transcribed
+concurrently (at most STT_CHUNK_CONCURRENCY per answer, on the shared STT pool), each failed
+chunk is retried on its own, and the texts are stitched back in order.
+
+    text = await transcribe_chunked(pieces, rate)   # pieces: int16 mono arrays, in order
+
+Answers shorter than one chunk go out as a single recognition, exactly as before.
+"""
+import asyncio
+from typing import List, Sequence
+
+import numpy as np
+
+from .audio_decoding import DecodedAudio
+from .config import (
+    STT_CHUNK_SECONDS,
+    STT_CHUNK_MAX_SECONDS,
+    STT_CHUNK_CONCURRENCY,
+    STT_CHUNK_RETRIES,
+    STT_CHUNK_RETRY_BACKOFF_SECONDS,
+    VAD_JOIN_GAP_SECONDS,
+)
+from .delivery_metrics import FRAME_SECONDS, frame_levels
+from .logs import get_logger
+from .metrics import REGISTRY
+from .stt_backends import STTUnavailable, transcribe_async
+from .tracing import span
+
+logger = get_logger(__name__)
+
+STT_CHUNKS = REGISTRY.counter("stt_chunks_total", "Answer chunks transcribed", ("outcome",))
+STT_CHUNK_RETRIES_TOTAL = REGISTRY.counter("stt_chunk_retries_total", "Chunk transcriptions retried")
+
+
+def split_long(pcm: np.ndarray, rate: int, max_seconds: float = STT_CHUNK_MAX_SECONDS) -> List[np.ndarray]:
+    """Split `pcm` into pieces of at most max_seconds, each cut at the quietest frame of its second half."""
+    limit = int(max_seconds * rate)
+    frame = max(int(rate * FRAME_SECONDS), 1)
+    pieces = []
+    while len(pcm) > limit:
+        window = pcm[limit // 2: limit].astype(np.float32) / 32768.0
+        cut = limit // 2 + int(np.argmin(frame_levels(window, rate))) * frame if len(window) >= frame else limit
+        pieces.append(pcm[:cut])
+        pcm = pcm[cut:]
+    pieces.append(pcm)
+    return pieces
+
+
+def plan_chunks(pieces: Sequence[np.ndarray], rate: int, target_seconds: float = STT_CHUNK_SECONDS,
+                max_seconds: float = STT_CHUNK_MAX_SECONDS,
+                join_gap_seconds: float = VAD_JOIN_GAP_SECONDS) -> List[DecodedAudio]:
+    """Pack consecutive speech pieces into chunks of about target_seconds (never over max_seconds)."""
+    target, gap = int(target_seconds * rate), np.zeros(int(join_gap_seconds * rate), dtype=np.int16)
+    chunks, current, size = [], [], 0
+    for piece in (p for whole in pieces for p in split_long(whole, rate, max_seconds)):
+        if current and size + len(gap) + len(piece) > target:
+            chunks.append(current)
+            current, size = [], 0
+        if current:
+            current.append(gap)
+            size += len(gap)
+        current.append(piece)
+        size += len(piece)
+    if current:
+        chunks.append(current)
+    return [DecodedAudio(np.concatenate(c) if len(c) > 1 else c[0], rate, "pcm") for c in chunks]
+
+
+async def transcribe_with_retry(wav: bytes, retries: int = STT_CHUNK_RETRIES) -> str:
+    """One recognition on the STT pool, retried with backoff when the engine fails or times out."""
+    for attempt in range(retries + 1):
+        try:
+            return await transcribe_async(wav)
+        except (STTUnavailable, asyncio.TimeoutError) as e:
+            if attempt == retries:
+                raise
+            STT_CHUNK_RETRIES_TOTAL.inc()
+            delay = STT_CHUNK_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+            logger.warning("🔁 STT chunk failed (%s), retry %d/%d in %.1fs", e or type(e).__name__,
+                           attempt + 1, retries, delay)
+            await asyncio.sleep(delay)
+
+
+async def transcribe_chunked(pieces: Sequence[np.ndarray], rate: int) -> str:
+    """Transcribe speech pieces as concurrent chunks and join the texts in order."""
+    chunks = plan_chunks(pieces, rate)
+    limit = asyncio.Semaphore(STT_CHUNK_CONCURRENCY)
+
+    async def run(index: int, chunk: DecodedAudio) -> str:
+        async with limit:
+            with span("stt.chunk", index=index, seconds=round(chunk.seconds, 2)):
+                return await transcribe_with_retry(chunk.wav_bytes())
+
+    results = await asyncio.gather(*(run(i, c) for i, c in enumerate(chunks)), return_exceptions=True)
+    failed = [r for r in results if isinstance(r, BaseException)]
+    STT_CHUNKS.inc(len(results) - len(failed), outcome="ok")
+    if failed:
+        STT_CHUNKS.inc(len(failed), outcome="failed")
+        if len(failed) == len(results):
+            raise failed[0]
+        logger.warning("⚠️ %d of %d STT chunk(s) failed after retries; transcript is partial: %s",
+                       len(failed), len(results), failed[0])
+    logger.debug("🧩 Transcribed %d chunk(s) of %s s", len(chunks), [round(c.seconds, 1) for c in chunks])
+    return " ".join(r for r in results if r and not isinstance(r, BaseException))
@@ -11,16 +11,21 @@ possible_paths = [
     Path(__file__).resolve().parent / ".env",                # backend/ml/
 ]
 
-env_loaded = False
+env_path = None
 for path in possible_paths:
     if path.exists():
         load_dotenv(dotenv_path=path)
-        print(f"✅ .env file found and loaded from: {path}")
-        env_loaded = True
+        env_path = path
         break
 
-if not env_loaded:
-    print("⚠️ No .env file found in expected locations!")
+# ------------------------------------------------------
+# 📝 Logging (see logs.py)
+# ------------------------------------------------------
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "text" (human readable) or "json" (one object per line, for log shippers)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+# Keep only a share of DEBUG/INFO records for noisy loggers, e.g. "backend.ml.avatar_generator_did=0.1"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
 
 # ------------------------------------------------------
 # 🔑 Load environment variables
@@ -32,20 +37,236 @@ ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# ------------------------------------------------------
+# 🧠 LLM gateway: backend, per-task model routing, deadlines, retries
+# ------------------------------------------------------
+# "gemini" (default) or "local" (deterministic offline stand-in for benchmarks / CI)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+# Local backend latency: "fixed:<ms>", "uniform:<lo>,<hi>" or "lognormal:<median_ms>,<sigma>"
+LLM_LOCAL_LATENCY = os.getenv("LLM_LOCAL_LATENCY", "0")
+LLM_LOCAL_ERROR_RATE = float(os.getenv("LLM_LOCAL_ERROR_RATE", "0"))
+LLM_LOCAL_SEED = int(os.getenv("LLM_LOCAL_SEED", "42"))
+LLM_LOCAL_RESPONSES_FILE = os.getenv("LLM_LOCAL_RESPONSES_FILE")
+
+# Override any task's model with LLM_MODEL_<TASK>, e.g. LLM_MODEL_ROADMAP=gemini-2.5-flash
+LLM_TASK_MODELS = {
+    task: os.getenv(f"LLM_MODEL_{task.upper()}", default)
+    for task, default in {
+        "question": GEMINI_MODEL,
+        "technical_score": GEMINI_MODEL,
+        "report_feedback": "gemini-2.5-flash",
+        "recommendations": "gemini-2.5-flash",
+        "roadmap": GEMINI_MODEL,
+        "audio_turn": GEMINI_MODEL,
+    }.items()
+}
+# Per-attempt deadline (seconds); the interactive question turn gets a tighter one
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_TASK_TIMEOUTS = {
+    "question": float(os.getenv("LLM_QUESTION_TIMEOUT_SECONDS", "15")),
+    "audio_turn": float(os.getenv("LLM_AUDIO_TURN_TIMEOUT_SECONDS", "20")),
+}
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+
+# Hedged requests: if a call is slower than the task's recent p<percentile> latency, fire a
+# second identical request and take whichever answers first (capped to a share of calls)
+LLM_HEDGE_TASKS = {t.strip() for t in os.getenv("LLM_HEDGE_TASKS", "question").split(",") if t.strip()}
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY_SECONDS", "3"))
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "0.5"))
+LLM_HEDGE_MAX_RATIO = float(os.getenv("LLM_HEDGE_MAX_RATIO", "0.1"))
+# Threads running hedged calls (primary + backup). 0 = two per interview turn worker, so a
+# primary never queues behind other turns' calls and a backup always finds a free thread
+LLM_HEDGE_POOL_SIZE = int(os.getenv("LLM_HEDGE_POOL_SIZE", "0"))
+
+# Answer turn: "two_step" (STT, then the question prompt on the transcript) or "multimodal" (the
+# answer audio goes to the "audio_turn" model once, returning transcript + next question; any
+# failure falls back to two_step). Answers longer than the max always take the two-step path.
+TURN_MODE = os.getenv("TURN_MODE", "two_step")
+TURN_MULTIMODAL_MAX_SECONDS = float(os.getenv("TURN_MULTIMODAL_MAX_SECONDS", "180"))
+
+# ------------------------------------------------------
+# 🎙️ Speech-to-text engine (see stt_backends.py)
+# ------------------------------------------------------
+# "google" (speech_recognition's web API, default) or "vosk" (offline CPU model)
+STT_BACKEND = os.getenv("STT_BACKEND", "google")
+STT_LANGUAGE = os.getenv("STT_LANGUAGE", "en-US")
+# Unpacked Vosk model directory, e.g. https://alphacephei.com/vosk/models (vosk-model-small-en-us-0.15)
+STT_VOSK_MODEL_PATH = os.getenv("STT_VOSK_MODEL_PATH", "models/vosk-model-small-en-us-0.15")
+# Load the engine / model when the API starts instead of on the first answer
+STT_PRELOAD = os.getenv("STT_PRELOAD", "true").lower() in ("1", "true", "yes")
+# Transcription worker threads per process, and how many more jobs may wait before rejecting
+STT_POOL_SIZE = int(os.getenv("STT_POOL_SIZE", "4"))
+STT_MAX_PENDING = int(os.getenv("STT_MAX_PENDING", "16"))
+STT_TIMEOUT_SECONDS = float(os.getenv("STT_TIMEOUT_SECONDS", "60"))
+# Streaming answers (WS /api/interview/answer/stream, see streaming_stt.py): segments are cut at
+# pauses once this long, or forcibly at the max; a stream idle this long is treated as ended
+STT_STREAM_MIN_SEGMENT_SECONDS = float(os.getenv("STT_STREAM_MIN_SEGMENT_SECONDS", "4"))
+STT_STREAM_MAX_SEGMENT_SECONDS = float(os.getenv("STT_STREAM_MAX_SEGMENT_SECONDS", "15"))
+STT_STREAM_PAUSE_SECONDS = float(os.getenv("STT_STREAM_PAUSE_SECONDS", "0.4"))
+STT_STREAM_MAX_SECONDS = float(os.getenv("STT_STREAM_MAX_SECONDS", "600"))
+STT_STREAM_IDLE_SECONDS = float(os.getenv("STT_STREAM_IDLE_SECONDS", "10"))
+
+# ------------------------------------------------------
+# 🎧 Uploaded answer audio (see audio_decoding.py)
+# ------------------------------------------------------
+# Uploads are decoded in memory, downmixed to mono and resampled to this rate before STT
+STT_SAMPLE_RATE = int(os.getenv("STT_SAMPLE_RATE", "16000"))
+AUDIO_MAX_UPLOAD_BYTES = int(os.getenv("AUDIO_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+AUDIO_MAX_SECONDS = float(os.getenv("AUDIO_MAX_SECONDS", "600"))
+# WebM / Ogg / MP3 / FLAC go through ffmpeg over pipes; WAV never needs it
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+AUDIO_DECODE_TIMEOUT_SECONDS = float(os.getenv("AUDIO_DECODE_TIMEOUT_SECONDS", "30"))
+# Threads decoding uploads (CPU-bound; never queued behind interview turns waiting on renders)
+AUDIO_DECODE_WORKERS = int(os.getenv("AUDIO_DECODE_WORKERS", str(os.cpu_count() or 2)))
+# Silence trimming before STT (vad.py): speech kept around voiced frames, pauses at least this
+# long are cut out, and the silence left between the joined pieces
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() in ("1", "true", "yes")
+VAD_PAD_SECONDS = float(os.getenv("VAD_PAD_SECONDS", "0.2"))
+VAD_SPLIT_PAUSE_SECONDS = float(os.getenv("VAD_SPLIT_PAUSE_SECONDS", "0.8"))
+VAD_JOIN_GAP_SECONDS = float(os.getenv("VAD_JOIN_GAP_SECONDS", "0.25"))
+# Long answers are transcribed as chunks of about this length (cut in silence, never over the
+# max), a few at a time per answer; a failed chunk is retried on its own with backoff
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", "20"))
+STT_CHUNK_MAX_SECONDS = float(os.getenv("STT_CHUNK_MAX_SECONDS", "30"))
+STT_CHUNK_CONCURRENCY = int(os.getenv("STT_CHUNK_CONCURRENCY", "4"))
+STT_CHUNK_RETRIES = int(os.getenv("STT_CHUNK_RETRIES", "2"))
+STT_CHUNK_RETRY_BACKOFF_SECONDS = float(os.getenv("STT_CHUNK_RETRY_BACKOFF_SECONDS", "0.5"))
+
+# ------------------------------------------------------
+# 🔊 Interviewer speech (see text_to_speech.py)
+# ------------------------------------------------------
+# Delivery profile when the client doesn't ask for one: an ElevenLabs output format such as
+# mp3_44100_128, mp3_22050_32 or opus_48000_32 (clients pick per request with `audio_profile`)
+TTS_DEFAULT_PROFILE = os.getenv("TTS_DEFAULT_PROFILE", "mp3_44100_128")
+# Synthesized lines kept per (profile, voice, text); 0 disables the cache. The cache also holds at
+# most TTS_CACHE_MAX_BYTES of base64 audio, and a single line over a quarter of that isn't kept
+TTS_CACHE_MAX_ENTRIES = int(os.getenv("TTS_CACHE_MAX_ENTRIES", "256"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# ------------------------------------------------------
+# 🎬 D-ID avatar videos (see avatar_generator_did.py)
+# ------------------------------------------------------
+# Point at a stand-in server for local runs (python -m backend.ml.loadtest.did_server)
+DID_API_URL = os.getenv("DID_API_URL", "https://api.d-id.com").rstrip("/")
+# Public URL of POST /api/did/webhook on this API. When set, D-ID calls it as each talk finishes
+# and waiting requests wake up at once; status polling only starts after the grace period
+# (covers lost webhooks, or ones that reach another worker)
+DID_WEBHOOK_URL = os.getenv("DID_WEBHOOK_URL")
+# Shared secret sent as ?token= on the webhook URL and checked on receipt. Required: without it no
+# webhook is requested from D-ID and POST /api/did/webhook refuses every call (polling only)
+DID_WEBHOOK_TOKEN = os.getenv("DID_WEBHOOK_TOKEN")
+DID_WEBHOOK_GRACE_SECONDS = float(os.getenv("DID_WEBHOOK_GRACE_SECONDS", "20"))
+# Status polls back off exponentially from DID_POLL_INTERVAL up to this interval
+DID_POLL_MAX_INTERVAL_SECONDS = float(os.getenv("DID_POLL_MAX_INTERVAL_SECONDS", "8"))
+# Worker threads for interview turns (question, speech and the wait on the D-ID render). Turns
+# spend most of their time waiting, so this is sized for concurrent renders and kept apart from
+# the pools that decode audio
+INTERVIEW_TURN_WORKERS = int(os.getenv("INTERVIEW_TURN_WORKERS", "32"))
+
+# ------------------------------------------------------
+# 🎞️ Pre-rendered fixed lines (see prerender.py)
+# ------------------------------------------------------
+# Greeting / "please repeat" / closing / farewell clips per presenter: manifest + audio files live
+# here (build them with `python -m backend.ml.prerender`)
+PRERENDER_DIR = os.getenv("PRERENDER_DIR", "prerendered")
+# Audio delivery profiles to render each line in (text_to_speech.AUDIO_PROFILES)
+PRERENDER_PROFILES = [p.strip() for p in os.getenv("PRERENDER_PROFILES", "mp3_44100_128,opus_48000_32").split(",")
+                      if p.strip()]
+PRERENDER_VIDEO = os.getenv("PRERENDER_VIDEO", "true").lower() in ("1", "true", "yes")
+# Storage bucket the rendered avatar videos are copied to (D-ID result URLs expire)
+PRERENDER_BUCKET = os.getenv("PRERENDER_BUCKET", "audio")
+# Render missing clips in a background thread when the API starts
+PRERENDER_ON_STARTUP = os.getenv("PRERENDER_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+# ------------------------------------------------------
+# 💬 Prompt size controls
+# ------------------------------------------------------
+# Approximate token budget for the resume digest pasted into question prompts
+RESUME_DIGEST_TOKEN_BUDGET = int(os.getenv("RESUME_DIGEST_TOKEN_BUDGET", "250"))
+
+# How many recent Q/A turns the question prompt sees verbatim (older ones live in the summary)
+CONVERSATION_MEMORY_TURNS = int(os.getenv("CONVERSATION_MEMORY_TURNS", "3"))
+
+# Static prompt prefix caching: "off" or "local" (test stand-in). Provider (Gemini) context
+# caching cannot engage here: our prefixes are a few hundred tokens, below its minimum size.
+CONTEXT_CACHE_MODE = os.getenv("CONTEXT_CACHE_MODE", "off")
+CONTEXT_CACHE_MAX_ENTRIES = int(os.getenv("CONTEXT_CACHE_MAX_ENTRIES", "512"))
+
+# ------------------------------------------------------
+# 🧮 Heuristic answer scoring (see heuristic_scoring.py)
+# ------------------------------------------------------
+# JSON lexicons / thresholds; defaults to backend/ml/lexicons/heuristics.json
+HEURISTIC_LEXICONS_FILE = os.getenv("HEURISTIC_LEXICONS_FILE")
+# Acoustic delivery metrics from spoken answers (delivery_metrics.py); audio past this is ignored
+DELIVERY_METRICS_ENABLED = os.getenv("DELIVERY_METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+DELIVERY_MAX_SECONDS = float(os.getenv("DELIVERY_MAX_SECONDS", "600"))
+
+# ------------------------------------------------------
+# 📈 Observability
+# ------------------------------------------------------
+# Finished request traces kept in memory for GET /api/traces
+TRACE_RECENT_LIMIT = int(os.getenv("TRACE_RECENT_LIMIT", "200"))
+# Requests slower than this print a per-stage breakdown (0 disables)
+TRACE_SLOW_REQUEST_SECONDS = float(os.getenv("TRACE_SLOW_REQUEST_SECONDS", "10"))
+
+# Opt-in per-request sampling profiler (X-Profile: 1 or ?profile=1), see profiling.py
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+# Profiling triggers and /api/debug/* require a matching X-Profile-Token header; they are
+# refused while this is unset, even with PROFILING_ENABLED / TRACEMALLOC_ENABLED on
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_MAX_STORED = int(os.getenv("PROFILING_MAX_STORED", "50"))
+PROFILING_PATHS = ("/api/interview/answer", "/api/interview/stop", "/api/resume/upload")
+
+# Periodic tracemalloc heap snapshots for diagnosing worker memory growth
+TRACEMALLOC_ENABLED = os.getenv("TRACEMALLOC_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "10"))
+TRACEMALLOC_INTERVAL_SECONDS = float(os.getenv("TRACEMALLOC_INTERVAL_SECONDS", "300"))
+TRACEMALLOC_KEEP = int(os.getenv("TRACEMALLOC_KEEP", "3"))
+
+# ------------------------------------------------------
+# 💰 Cost ledger (see cost_ledger.py) — list prices in USD, adjust to your plan
+# ------------------------------------------------------
+# Per 1M tokens: (prompt, response) by model; unknown models are counted but not priced
+LLM_TOKEN_PRICES = {
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+}
+ELEVENLABS_PRICE_PER_1K_CHARS = float(os.getenv("ELEVENLABS_PRICE_PER_1K_CHARS", "0.30"))
+DID_PRICE_PER_MINUTE = float(os.getenv("DID_PRICE_PER_MINUTE", "0.56"))
+# Storage is billed per GB-month; the ledger charges one month for every uploaded byte
+STORAGE_PRICE_PER_GB_MONTH = float(os.getenv("STORAGE_PRICE_PER_GB_MONTH", "0.021"))
+# Sessions whose ledgers are kept in memory for /api/costs (oldest dropped first)
+COST_LEDGER_MAX_SESSIONS = int(os.getenv("COST_LEDGER_MAX_SESSIONS", "500"))
+
 # ------------------------------------------------------
 # ✅ Sanity checks with warnings
 # ------------------------------------------------------
-if GEMINI_API_KEY:
-    print("🔹 Gemini API key loaded successfully.")
+from .logs import get_logger  # noqa: E402  (logs reads the LOG_* settings above)
+
+logger = get_logger(__name__)
+
+if env_path:
+    logger.info("✅ .env file found and loaded from: %s", env_path)
 else:
-    print("❌ GEMINI_API_KEY missing in .env file!")
+    logger.warning("⚠️ No .env file found in expected locations!")
+
+if GEMINI_API_KEY:
+    logger.debug("🔹 Gemini API key loaded successfully.")
+elif LLM_BACKEND == "gemini":
+    logger.error("❌ GEMINI_API_KEY missing in .env file!")
 
 if ELEVENLABS_API_KEY:
-    print("🔹 ElevenLabs API key loaded successfully.")
+    logger.debug("🔹 ElevenLabs API key loaded successfully.")
 else:
-    print("⚠️ ELEVENLABS_API_KEY missing — voice synthesis may not work.")
+    logger.warning("⚠️ ELEVENLABS_API_KEY missing — voice synthesis may not work.")
 
 if SUPABASE_URL and SUPABASE_KEY:
-    print("🔹 Supabase credentials loaded successfully.")
+    logger.debug("🔹 Supabase credentials loaded successfully.")
 else:
-    print("⚠️ Missing Supabase credentials in .env file.")
+    logger.warning("⚠️ Missing Supabase credentials in .env file.")
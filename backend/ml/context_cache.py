@@ -0,0 +1,129 @@
+# backend/ml/context_cache.py
+"""
+Per-session caching of static prompt prefixes.
+
+Within one interview the interviewer instructions + resume digest never change, and the
+technical-scoring rubric never changes at all. Instead of resending them every turn we
+register them once and only send the per-turn part afterwards.
+
+Backends (config CONTEXT_CACHE_MODE):
+  - "off"    : no caching, callers send the full prompt (default)
+  - "local"  : in-process stand-in for tests — keeps the prefix locally and prepends it
+
+There is no provider-side (Gemini CachedContent) backend: the prefixes we reuse are a few
+hundred tokens (instructions + resume digest) and ~60 tokens (rubric), far below the
+provider's explicit-caching minimum, so a CachedContent could never be created for them.
+Padding prefixes up to that size would cost more per turn than it saves. The static part
+still goes first in every prompt, which is what the provider's own implicit caching keys on.
+
+Callers ask for a model bound to a cache key and call `generate_content(dynamic_part)` on it.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Any
+
+from .config import CONTEXT_CACHE_MODE, CONTEXT_CACHE_MAX_ENTRIES
+from .llm_backends import get_backend
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+
+def _backend_model(model_name: str):
+    return get_backend().model(model_name)
+
+
+class _PrefixedModel:
+    """Model wrapper that prepends a static prefix to each prompt (used by every mode)."""
+
+    def __init__(self, model, prefix: str):
+        self._model = model
+        self.prefix = prefix
+
+    def generate_content(self, prompt, **kwargs):
+        if isinstance(prompt, list):   # multimodal parts
+            return self._model.generate_content([self.prefix, *prompt], **kwargs)
+        return self._model.generate_content(f"{self.prefix}\n\n{prompt}", **kwargs)
+
+
+class ContextCache:
+    """Base / 'off' implementation: always send the prefix inline."""
+
+    mode = "off"
+
+    def __init__(self, model_factory=None):
+        self._lock = threading.Lock()
+        self._model_factory = model_factory or _backend_model
+        self.stats = {"hits": 0, "misses": 0, "released": 0, "evicted": 0}
+
+    def model_for(self, key: str, model_name: str, prefix: str):
+        """Return an object with `generate_content(dynamic_prompt)` that has `prefix` in its context."""
+        return _PrefixedModel(self._model_factory(model_name), prefix)
+
+    def release(self, key: str):
+        """Forget a cache entry (e.g. when the interview ends)."""
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, **self.stats}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+
+class LocalContextCache(ContextCache):
+    """
+    Test stand-in for a provider cache: the first call for a key registers the prefix, later
+    calls are hits. Prompts still reach the model whole.
+    """
+
+    mode = "local"
+
+    def __init__(self, model_factory=None, max_entries: int = CONTEXT_CACHE_MAX_ENTRIES):
+        super().__init__(model_factory)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _PrefixedModel]" = OrderedDict()
+
+    def model_for(self, key: str, model_name: str, prefix: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.prefix == prefix:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+            self.stats["misses"] += 1
+            entry = _PrefixedModel(self._model_factory(model_name), prefix)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+            return entry
+
+    def release(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats["released"] += 1
+
+
+def _build_cache(mode: str) -> ContextCache:
+    if mode == "gemini":
+        logger.warning("⚠️ CONTEXT_CACHE_MODE=gemini is not supported (prefixes are below the provider minimum), caching is off.")
+        return ContextCache()
+    if mode == "local":
+        return LocalContextCache()
+    return ContextCache()
+
+
+context_cache: ContextCache = _build_cache((CONTEXT_CACHE_MODE or "off").lower())
+
+
+def set_context_cache(cache: ContextCache):
+    """Swap the process-wide cache (tests install a LocalContextCache here)."""
+    global context_cache
+    context_cache = cache
+
+
+def get_context_cache() -> ContextCache:
+    return context_cache
@@ -0,0 +1,130 @@
+# backend/ml/conversation_memory.py
+"""
+Bounded rolling conversation memory per interview session.
+
+Each session keeps:
+  - topics covered so far (capped list, oldest dropped first),
+  - a short running summary (capped characters, oldest clauses dropped first),
+  - the last K question/answer turns (each trimmed).
+
+It is updated incrementally after every answer, so the block handed to the
+question prompt stays the same size no matter how long the interview runs.
+"""
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from .config import CONVERSATION_MEMORY_TURNS
+
+MAX_CACHED_SESSIONS = 512     # abandoned interviews never call clear_session; oldest dropped first
+MAX_TOPICS = 12
+SUMMARY_MAX_CHARS = 400
+TURN_MAX_CHARS = 240
+
+# General interview topics we track besides the candidate's own skills/projects.
+TOPIC_KEYWORDS = [
+    "python", "java", "javascript", "sql", "machine learning", "deep learning", "nlp",
+    "aws", "cloud", "docker", "kubernetes", "api", "database", "system design",
+    "data structures", "algorithms", "testing", "debugging", "performance",
+    "teamwork", "leadership", "conflict", "deadline", "motivation", "failure",
+    "learning", "communication", "internship", "project", "strengths", "weaknesses",
+]
+
+
+@dataclass
+class ConversationState:
+    topics: List[str] = field(default_factory=list)
+    summary_clauses: Deque[str] = field(default_factory=deque)
+    recent_turns: Deque[Dict[str, str]] = field(default_factory=lambda: deque(maxlen=CONVERSATION_MEMORY_TURNS))
+    turn_count: int = 0
+    vocabulary: List[str] = field(default_factory=lambda: list(TOPIC_KEYWORDS))
+    _pattern: Optional[re.Pattern] = None
+
+    def topic_pattern(self) -> re.Pattern:
+        if self._pattern is None:
+            words = sorted({w.lower() for w in self.vocabulary if w}, key=len, reverse=True)
+            self._pattern = re.compile(r"\b(" + "|".join(re.escape(w) for w in words) + r")\b", re.I)
+        return self._pattern
+
+
+_sessions: "OrderedDict[str, ConversationState]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _trim(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[: limit - 1].rsplit(" ", 1)[0] + "…"
+
+
+def get_state(session_id: str, resume_data: Optional[dict] = None) -> ConversationState:
+    """Return (creating if needed) the state for a session; resume skills/projects seed the topic vocabulary."""
+    with _lock:
+        state = _sessions.get(session_id)
+        if state is not None:
+            _sessions.move_to_end(session_id)
+            return state
+        state = ConversationState()
+        if resume_data:
+            state.vocabulary += list(resume_data.get("skills") or [])
+            state.vocabulary += list((resume_data.get("structure") or {}).get("projects") or [])
+        _sessions[session_id] = state
+        while len(_sessions) > MAX_CACHED_SESSIONS:
+            _sessions.popitem(last=False)
+        return state
+
+
+def record_turn(session_id: str, question: str, answer: str, resume_data: Optional[dict] = None):
+    """Fold one answered question into the session memory (O(1) work and size per turn)."""
+    if not session_id:
+        return
+    state = get_state(session_id, resume_data)
+
+    found = []
+    for match in state.topic_pattern().finditer(f"{question} {answer}"):
+        topic = match.group(1).lower()
+        if topic not in found:
+            found.append(topic)
+
+    with _lock:
+        state.turn_count += 1
+        new = [t for t in found if t not in state.topics]
+        for topic in found:
+            if topic in state.topics:
+                state.topics.remove(topic)
+            state.topics.append(topic)
+        del state.topics[:-MAX_TOPICS]
+
+        # Prefer what this turn added; fall back to what it revisited, then to the question itself.
+        clause = f"Q{state.turn_count}: " + (", ".join((new or found)[:3]) if found else _trim(question, 60))
+        state.summary_clauses.append(clause)
+        while sum(len(c) + 2 for c in state.summary_clauses) > SUMMARY_MAX_CHARS:
+            state.summary_clauses.popleft()
+
+        state.recent_turns.append({
+            "question": _trim(question, TURN_MAX_CHARS),
+            "answer": _trim(answer, TURN_MAX_CHARS),
+        })
+
+
+def render_memory(session_id: Optional[str]) -> str:
+    """Fixed-size text block describing the conversation so far (empty if nothing recorded)."""
+    with _lock:
+        state = _sessions.get(session_id) if session_id else None
+        if state is None or not state.turn_count:
+            return ""
+        lines = []
+        if state.topics:
+            lines.append("Topics already covered: " + ", ".join(state.topics))
+        lines.append("Summary so far: " + "; ".join(state.summary_clauses))
+        lines.append("Most recent turns:")
+        for turn in state.recent_turns:
+            lines.append(f'- Q: "{turn["question"]}"\n  A: "{turn["answer"]}"')
+        return "\n".join(lines)
+
+
+def clear_session(session_id: str):
+    """Forget a session's memory (called when the interview ends)."""
+    with _lock:
+        _sessions.pop(session_id, None)
@@ -0,0 +1,146 @@
+# backend/ml/cost_ledger.py
+"""
+Per-session usage, cost and latency ledger.
+
+Every billable call reports what it consumed:
+
+    record_usage("llm.question", seconds=0.8, model="gemini-2.0-flash", prompt_tokens=812, response_tokens=54)
+    record_usage("tts.elevenlabs", seconds=1.2, characters=143)
+    record_usage("avatar.did", seconds=21.5, render_seconds=9.4)
+    record_usage("storage.upload.audio", seconds=0.2, bytes=48213)
+
+Usage is attributed to the interview session bound to the current request (logs.bind_session),
+priced with the list prices in config, and summed per stage. stop_interview persists the
+session's ledger inside the report; GET /api/costs/top ranks stages across recent sessions.
+Totals per stage and unit are also exported to /metrics.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .config import (
+    LLM_TOKEN_PRICES,
+    ELEVENLABS_PRICE_PER_1K_CHARS,
+    DID_PRICE_PER_MINUTE,
+    STORAGE_PRICE_PER_GB_MONTH,
+    COST_LEDGER_MAX_SESSIONS,
+)
+from .logs import get_logger, session_id_var
+from .metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+UNITS = ("prompt_tokens", "response_tokens", "characters", "render_seconds", "bytes")
+
+# USD per unit for the non-LLM units (tokens are priced per model)
+UNIT_PRICES = {
+    "characters": ELEVENLABS_PRICE_PER_1K_CHARS / 1000,
+    "render_seconds": DID_PRICE_PER_MINUTE / 60,
+    "bytes": STORAGE_PRICE_PER_GB_MONTH / 1e9,
+}
+
+USAGE_UNITS = REGISTRY.counter("usage_units_total", "Billable units consumed", ("stage", "unit"))
+USAGE_COST = REGISTRY.counter("usage_cost_usd_total", "Estimated spend in USD", ("stage",))
+
+_sessions: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def price(units: Dict[str, float], model: Optional[str] = None) -> float:
+    """Estimated USD for one call's units."""
+    prompt_price, response_price = LLM_TOKEN_PRICES.get(model, (0.0, 0.0))
+    cost = (units.get("prompt_tokens", 0) * prompt_price + units.get("response_tokens", 0) * response_price) / 1e6
+    return cost + sum(units.get(unit, 0) * unit_price for unit, unit_price in UNIT_PRICES.items())
+
+
+def estimate_speech_seconds(text: str, words_per_second: float = 2.5) -> float:
+    """Rough spoken duration of `text`, for renders whose provider didn't report one."""
+    return round(len(text.split()) / words_per_second, 2)
+
+
+def _empty_stage() -> Dict[str, Any]:
+    return {"calls": 0, "seconds": 0.0, "cost_usd": 0.0, **{unit: 0 for unit in UNITS}}
+
+
+def record_usage(stage: str, seconds: Optional[float] = None, *, session_id: Optional[str] = None,
+                 model: Optional[str] = None, **units: float):
+    """Add one call's units and latency to the session's ledger (current session by default)."""
+    units = {unit: value for unit, value in units.items() if value}
+    cost = price(units, model)
+    for unit, value in units.items():
+        USAGE_UNITS.inc(value, stage=stage, unit=unit)
+    if cost:
+        USAGE_COST.inc(cost, stage=stage)
+
+    session_id = session_id or session_id_var.get()
+    if not session_id:
+        return
+    with _lock:
+        ledger = _sessions.get(session_id)
+        if ledger is None:
+            ledger = _sessions[session_id] = {}
+            while len(_sessions) > COST_LEDGER_MAX_SESSIONS:
+                dropped, _ = _sessions.popitem(last=False)
+                logger.debug("💰 Cost ledger for session %s dropped (capacity)", dropped)
+        entry = ledger.setdefault(stage, _empty_stage())
+        entry["calls"] += 1
+        entry["seconds"] += seconds or 0.0
+        entry["cost_usd"] += cost
+        for unit, value in units.items():
+            entry[unit] = entry.get(unit, 0) + value
+
+
+def _rounded(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Rounded copy without the units a stage never uses."""
+    out = {k: v for k, v in entry.items() if k not in UNITS or v}
+    return {**out, "seconds": round(entry["seconds"], 3), "cost_usd": round(entry["cost_usd"], 6)}
+
+
+def session_ledger(session_id: str) -> Optional[Dict[str, Any]]:
+    """Per-stage usage of one session plus totals, costliest stage first (None if unknown)."""
+    with _lock:
+        ledger = _sessions.get(session_id)
+        stages = {stage: dict(entry) for stage, entry in (ledger or {}).items()}
+    if ledger is None:
+        return None
+
+    totals = _empty_stage()
+    for entry in stages.values():
+        for key in totals:
+            totals[key] += entry.get(key, 0)
+    ordered = sorted(stages.items(), key=lambda item: item[1]["cost_usd"], reverse=True)
+    return {
+        "session_id": session_id,
+        "stages": {stage: _rounded(entry) for stage, entry in ordered},
+        "totals": _rounded(totals),
+    }
+
+
+def top_stages(limit: int = 10, by: str = "cost_usd") -> Dict[str, Any]:
+    """Stages ranked by total `by` ("cost_usd" or "seconds") across the sessions still in memory."""
+    with _lock:
+        ledgers = [{stage: dict(entry) for stage, entry in ledger.items()} for ledger in _sessions.values()]
+
+    combined: Dict[str, Dict[str, Any]] = {}
+    for ledger in ledgers:
+        for stage, entry in ledger.items():
+            total = combined.setdefault(stage, {**_empty_stage(), "sessions": 0})
+            total["sessions"] += 1
+            for key, value in entry.items():
+                total[key] += value
+
+    grand = sum(entry[by] for entry in combined.values()) or 1
+    ranked = sorted(combined.items(), key=lambda item: item[1][by], reverse=True)[:limit]
+    return {
+        "sessions": len(ledgers),
+        "by": by,
+        "stages": [
+            {
+                "stage": stage,
+                **_rounded(entry),
+                "per_session_usd": round(entry["cost_usd"] / entry["sessions"], 6),
+                "share": round(entry[by] / grand, 4),
+            }
+            for stage, entry in ranked
+        ],
+    }
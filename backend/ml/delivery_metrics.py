@@ -0,0 +1,152 @@
+# backend/ml/delivery_metrics.py
+"""
+Cheap, local delivery metrics from a spoken answer's audio (no network calls).
+
+The WAV PCM is decoded once, split into 20 ms frames and reduced with NumPy:
+  - speech_seconds / duration_seconds : frames above an adaptive loudness threshold
+  - speaking_rate_wpm                 : transcript words per minute of speech
+  - pause_ratio                       : share of silence between the first and last spoken frame
+  - long_silences                     : pauses of at least LONG_SILENCE_SECONDS inside the answer
+  - longest_pause_seconds             : longest of those inner pauses
+  - leading_silence_seconds           : time before the candidate starts speaking
+  - loudness_std_db                   : spread of loudness over spoken frames (low = monotone)
+  - filler_segments                   : short, steady, isolated voiced bursts ("um", "uh"), which
+                                        speech-to-text usually drops from the transcript
+
+handle_answer stores the result on each turn ("delivery"); heuristic_scoring folds it into the
+communication and confidence scores (thresholds and weights in lexicons/heuristics.json).
+"""
+import io
+import wave
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .config import DELIVERY_MAX_SECONDS
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+FRAME_SECONDS = 0.02
+SILENCE_FLOOR_DBFS = -50.0      # never call anything quieter than this speech
+NOISE_MARGIN_DB = 12.0          # speech is at least this much louder than the noise floor...
+PEAK_MARGIN_DB = 20.0           # ...or within this much of the loud end (continuous speech)
+LONG_SILENCE_SECONDS = 1.0
+FILLER_MIN_SECONDS, FILLER_MAX_SECONDS = 0.15, 0.6
+FILLER_GAP_SECONDS = 0.25       # silence needed on both sides of a filler
+FILLER_MAX_STD_DB = 3.0         # fillers are held vowels: nearly flat loudness
+
+
+def decode_wav(data: bytes, max_seconds: float = DELIVERY_MAX_SECONDS) -> Optional[Tuple[np.ndarray, int]]:
+    """Mono float32 samples in [-1, 1] and the sample rate, or None if `data` isn't PCM WAV."""
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            channels, width, rate = wf.getnchannels(), wf.getsampwidth(), wf.getframerate()
+            raw = wf.readframes(int(max_seconds * rate) if max_seconds else wf.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        samples = (np.where(ints & 0x800000, ints - 0x1000000, ints)).astype(np.float32) / 8388608.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        return None
+
+    if channels > 1:
+        samples = samples[: len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return samples, rate
+
+
+def frame_levels(samples: np.ndarray, rate: int) -> np.ndarray:
+    """RMS loudness (dBFS) of consecutive FRAME_SECONDS frames."""
+    size = max(int(rate * FRAME_SECONDS), 1)
+    count = len(samples) // size
+    frames = samples[: count * size].reshape(count, size)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def voiced_frames(db: np.ndarray) -> np.ndarray:
+    """Frames louder than an adaptive threshold: above the noise floor, or near the loud end."""
+    threshold = max(SILENCE_FLOOR_DBFS,
+                    min(np.percentile(db, 10) + NOISE_MARGIN_DB, np.percentile(db, 95) - PEAK_MARGIN_DB))
+    return db > threshold
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start index and length of every run of True in `mask`."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+
+def analyze_delivery(data: bytes, transcript: str = "") -> Optional[Dict[str, float]]:
+    """Delivery metrics for one answer's WAV bytes; None if the audio can't be decoded or is empty."""
+    decoded = decode_wav(data)
+    if decoded is None:
+        logger.debug("🎚️ Delivery metrics skipped: not a PCM WAV upload")
+        return None
+    return analyze_samples(*decoded, transcript)
+
+
+def analyze_samples(samples: np.ndarray, rate: int, transcript: str = "") -> Optional[Dict[str, float]]:
+    """Delivery metrics for already-decoded mono float samples; None if there is no audio."""
+    samples = samples[: int(DELIVERY_MAX_SECONDS * rate)] if DELIVERY_MAX_SECONDS else samples
+    db = frame_levels(samples, rate)
+    if not len(db):
+        return None
+
+    voiced = voiced_frames(db)
+    duration = len(db) * FRAME_SECONDS
+    speech_seconds = float(voiced.sum()) * FRAME_SECONDS
+    metrics = {
+        "duration_seconds": round(duration, 2),
+        "speech_seconds": round(speech_seconds, 2),
+        "speaking_rate_wpm": None,
+        "pause_ratio": None,
+        "long_silences": 0,
+        "longest_pause_seconds": None,
+        "leading_silence_seconds": None,
+        "loudness_std_db": None,
+        "filler_segments": 0,
+    }
+    if not speech_seconds:
+        return metrics
+
+    # Only pauses inside the answer count, not leading / trailing silence
+    spoken = np.flatnonzero(voiced)
+    inner = voiced[spoken[0]: spoken[-1] + 1]
+    _, gap_lengths = _runs(~inner)
+    seg_starts, seg_lengths = _runs(inner)
+
+    words = len(transcript.split())
+    if words:
+        metrics["speaking_rate_wpm"] = round(words / speech_seconds * 60.0, 1)
+    metrics["pause_ratio"] = round(1.0 - float(inner.sum()) / len(inner), 3)
+    metrics["long_silences"] = int((gap_lengths * FRAME_SECONDS >= LONG_SILENCE_SECONDS).sum())
+    metrics["longest_pause_seconds"] = round(float(gap_lengths.max(initial=0)) * FRAME_SECONDS, 2)
+    metrics["leading_silence_seconds"] = round(float(spoken[0]) * FRAME_SECONDS, 2)
+    metrics["loudness_std_db"] = round(float(db[voiced].std()), 2)
+
+    # Filler candidates: short voiced segments with flat loudness and a pause on both sides
+    spoken_db = db[spoken[0]: spoken[-1] + 1]
+    sums = np.add.reduceat(spoken_db * inner, seg_starts)
+    squares = np.add.reduceat(spoken_db * spoken_db * inner, seg_starts)
+    seg_std = np.sqrt(np.maximum(squares / seg_lengths - (sums / seg_lengths) ** 2, 0.0))
+    seconds = seg_lengths * FRAME_SECONDS
+    gap_frames = int(round(FILLER_GAP_SECONDS / FRAME_SECONDS))
+    gap_before = np.zeros(len(seg_starts), dtype=np.int64)
+    gap_after = np.zeros(len(seg_starts), dtype=np.int64)
+    gap_before[1:] = gap_lengths     # inner starts and ends voiced: segments and gaps alternate
+    gap_after[:-1] = gap_lengths
+    fillers = ((seconds >= FILLER_MIN_SECONDS) & (seconds <= FILLER_MAX_SECONDS) & (seg_std <= FILLER_MAX_STD_DB)
+               & (gap_before >= gap_frames) & (gap_after >= gap_frames))
+    metrics["filler_segments"] = int(fillers.sum())
+    return metrics
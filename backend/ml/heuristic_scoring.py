@@ -0,0 +1,189 @@
+# backend/ml/heuristic_scoring.py
+"""
+Heuristic communication / confidence / professionalism scoring.
+
+Lexicons and thresholds come from a JSON file (lexicons/heuristics.json, or
+HEURISTIC_LEXICONS_FILE). A lexicon is a base score, a [min, max] clamp and an ordered list of
+[term, weight] pairs; the score is the base plus the weight of every term found in the answer.
+
+Each answer is lowercased and split once, then every distinct term of every lexicon is looked
+up once in the lowercased text (for a batch: once through the whole batch). Matching is a plain substring test, exactly like the original
+per-keyword scorer: "worked" also matches "networked", and terms written with capitals
+("I did") can never match lowercased text. They are kept in the default file so scores don't move.
+
+score() / score_sessions() work on whole sessions (or batches of sessions) at once: term hits
+form an (answers x terms) matrix and each lexicon adds its weights column by column in file
+order, which keeps the floating-point results identical to the sequential loops.
+
+Spoken answers also carry acoustic delivery metrics (delivery_metrics.py). The "delivery"
+section of the file turns them into flags (pace out of range, long pauses, monotone, fillers...)
+whose weights are added to the communication / confidence scores. Typed answers get no
+adjustment, so their scores are unchanged.
+"""
+import json
+from bisect import bisect_right
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import HEURISTIC_LEXICONS_FILE
+
+DEFAULT_LEXICONS_FILE = Path(__file__).resolve().parent / "lexicons" / "heuristics.json"
+LEXICON_DIMENSIONS = ("confidence", "professionalism")
+DIMENSIONS = ("communication",) + LEXICON_DIMENSIONS
+
+
+class Lexicon:
+    def __init__(self, spec: Dict[str, Any]):
+        self.base = float(spec["base"])
+        self.low = float(spec.get("min", 0.0))
+        self.high = float(spec.get("max", 1.0))
+        self.terms = [(str(term), float(weight)) for term, weight in spec["terms"]]
+
+    def score_text(self, text: str) -> float:
+        """Score one already-lowercased answer."""
+        score = self.base
+        for term, weight in self.terms:
+            if term in text:
+                score += weight
+        return min(max(score, self.low), self.high)
+
+
+class HeuristicScorer:
+    def __init__(self, spec: Dict[str, Any]):
+        comm = spec["communication"]
+        self.short_words = int(comm["short_words"])
+        self.medium_words = int(comm["medium_words"])
+        self.max_sentences = int(comm["max_sentences"])
+        self.comm_scores = {k: float(v) for k, v in comm["scores"].items()}
+        self.lexicons = {name: Lexicon(spec[name]) for name in LEXICON_DIMENSIONS}
+        self.delivery = spec.get("delivery") or {}
+
+        # Every distinct term once, across lexicons; each lexicon keeps (column, weight) in file order
+        self.terms: List[str] = list(dict.fromkeys(t for lex in self.lexicons.values() for t, _ in lex.terms))
+        column = {term: i for i, term in enumerate(self.terms)}
+        self._columns = {name: [(column[t], w) for t, w in lex.terms] for name, lex in self.lexicons.items()}
+
+    @classmethod
+    def from_file(cls, path) -> "HeuristicScorer":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    # ---------- one answer ----------
+    def communication(self, answer: str) -> float:
+        words = len(answer.split())
+        if words < self.short_words:
+            return self.comm_scores["short"]
+        if words < self.medium_words:
+            return self.comm_scores["medium"]
+        if answer.count(".") > self.max_sentences:
+            return self.comm_scores["long_many_sentences"]
+        return self.comm_scores["long"]
+
+    def lexicon_score(self, name: str, answer: str) -> float:
+        return self.lexicons[name].score_text(answer.lower())
+
+    # ---------- whole sessions ----------
+    def features(self, answers: Sequence[str]):
+        """(word counts, '.' counts, answers x terms hit matrix) for a batch of answers."""
+        words = np.array([len(a.split()) for a in answers], dtype=np.int64)
+        sentences = np.array([a.count(".") for a in answers], dtype=np.int64)
+
+        # One lowercased text for the whole batch ("\0" can't occur in a term, so no match spans
+        # two answers); each term is searched through it once, skipping to the next answer on a hit.
+        lowered = [a.lower() for a in answers]
+        starts = [0]
+        for text in lowered:
+            starts.append(starts[-1] + len(text) + 1)
+        joined = "\0".join(lowered)
+
+        hits = np.zeros((len(answers), len(self.terms)), dtype=np.float64)
+        for col, term in enumerate(self.terms):
+            pos = joined.find(term)
+            while pos != -1:
+                row = bisect_right(starts, pos) - 1
+                hits[row, col] = 1.0
+                pos = joined.find(term, starts[row + 1])
+        return words, sentences, hits
+
+    def delivery_adjustments(self, deliveries: Sequence[Optional[Dict[str, Any]]]) -> Dict[str, np.ndarray]:
+        """Score offsets per answer from its delivery metrics (0 where an answer has none)."""
+        def column(key):
+            return np.array([np.nan if (d or {}).get(key) is None else d[key] for d in deliveries], dtype=np.float64)
+
+        spec = self.delivery
+        rate = column("speaking_rate_wpm")
+        slow, fast = spec.get("pace_wpm", (0, np.inf))
+        # comparisons with NaN are False, so missing metrics never raise a flag
+        flags = {
+            "slow_pace": rate < slow,
+            "fast_pace": rate > fast,
+            "steady_pace": (rate >= slow) & (rate <= fast),
+            "long_pauses": column("pause_ratio") > spec.get("max_pause_ratio", np.inf),
+            "long_silences": column("long_silences") > spec.get("max_long_silences", np.inf),
+            "monotone": column("loudness_std_db") < spec.get("min_loudness_std_db", -np.inf),
+            "fillers": column("filler_segments") > spec.get("max_filler_segments", np.inf),
+        }
+        adjustments = {}
+        for dim in ("communication", "confidence"):
+            total = np.zeros(len(deliveries))
+            for flag, weight in (spec.get(dim) or {}).items():
+                total += flags[flag] * float(weight)
+            adjustments[dim] = total
+        return adjustments
+
+    def score(self, answers: Sequence[str],
+              deliveries: Optional[Sequence[Optional[Dict[str, Any]]]] = None) -> Dict[str, np.ndarray]:
+        """
+        Per-answer scores for every dimension, as arrays aligned with `answers`.
+        `deliveries` (aligned, None for typed answers) adjusts communication and confidence.
+        """
+        words, sentences, hits = self.features(answers)
+        scores = {
+            "communication": np.select(
+                [words < self.short_words, words < self.medium_words, sentences > self.max_sentences],
+                [self.comm_scores["short"], self.comm_scores["medium"], self.comm_scores["long_many_sentences"]],
+                default=self.comm_scores["long"],
+            ),
+        }
+        for name, lex in self.lexicons.items():
+            total = np.full(len(answers), lex.base)
+            for col, weight in self._columns[name]:
+                total += hits[:, col] * weight
+            scores[name] = np.clip(total, lex.low, lex.high)
+
+        if deliveries is not None and self.delivery and any(deliveries):
+            adjustments = self.delivery_adjustments(deliveries)
+            scores["communication"] = np.clip(scores["communication"] + adjustments["communication"], 0.0, 1.0)
+            lex = self.lexicons["confidence"]
+            scores["confidence"] = np.clip(scores["confidence"] + adjustments["confidence"], lex.low, lex.high)
+        return scores
+
+    def score_sessions(self, sessions: Sequence[Sequence[str]],
+                       deliveries: Optional[Sequence[Sequence[Optional[Dict[str, Any]]]]] = None,
+                       ) -> List[Dict[str, float]]:
+        """Session-level percentages (mean per dimension x 100, 2 decimals) for a batch of sessions."""
+        answers = [a for session in sessions for a in session]
+        flat = [d for session in deliveries for d in session] if deliveries is not None else None
+        scores = self.score(answers, flat)
+        bounds = np.cumsum([0] + [len(session) for session in sessions])
+        return [
+            {dim: round(np.mean(scores[dim][start:end]) * 100, 2) for dim in DIMENSIONS}
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+
+
+_scorer: Optional[HeuristicScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_scorer() -> HeuristicScorer:
+    """Process-wide scorer built from HEURISTIC_LEXICONS_FILE (or the bundled lexicons)."""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = HeuristicScorer.from_file(HEURISTIC_LEXICONS_FILE or DEFAULT_LEXICONS_FILE)
+    return _scorer
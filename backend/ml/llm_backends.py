@@ -0,0 +1,214 @@
+# backend/ml/llm_backends.py
+"""
+Pluggable LLM backends behind the gateway (config LLM_BACKEND).
+
+  - "gemini": google.generativeai (default)
+  - "local" : deterministic offline stand-in. Returns canned / templated text and JSON
+              with a configurable latency distribution and error rate, so the whole
+              interview flow can be benchmarked or run in CI without quota or network.
+
+A backend hands out model objects that look like genai.GenerativeModel for what we use:
+`generate_content(prompt, request_options=None)` returning something with `.text`
+(and `.usage_metadata` token counts).
+"""
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Any, List, Optional, Tuple
+
+from .config import (
+    GEMINI_API_KEY,
+    LLM_BACKEND,
+    LLM_LOCAL_LATENCY,
+    LLM_LOCAL_ERROR_RATE,
+    LLM_LOCAL_SEED,
+    LLM_LOCAL_RESPONSES_FILE,
+)
+
+
+class LLMBackend:
+    """Interface: `model(name)` returns a generate_content-capable model for that model name."""
+
+    name = "base"
+
+    def model(self, model_name: str):
+        raise NotImplementedError
+
+
+# ------------------------------------------------------
+# ☁️ Gemini
+# ------------------------------------------------------
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str] = GEMINI_API_KEY):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self._genai = genai
+
+    def model(self, model_name: str):
+        return self._genai.GenerativeModel(model_name)
+
+
+# ------------------------------------------------------
+# 🧪 Local deterministic stand-in
+# ------------------------------------------------------
+# (marker found in the prompt, response template). First match wins; "{n}" is replaced by a
+# stable number derived from the prompt and "{n100}" by the same folded into 40–95.
+DEFAULT_LOCAL_RESPONSES: List[Tuple[str, str]] = [
+    ('"next_question"', json.dumps({
+        "transcript": "Local transcript #{n}: I built the service with my team and owned the API and the tests.",
+        "next_question": "Local question #{n}: what was the hardest trade-off you made in that service?",
+    })),
+    ('"focus_areas"', json.dumps({
+        "focus_areas": ["System design depth", "Structured answers", "Testing practice"],
+        "actions": ["Solve two design problems a week", "Answer with the STAR method", "Add tests to a side project"],
+        "resources": ["https://example.com/system-design", "https://example.com/star-method"],
+    })),
+    ('"short_term"', json.dumps({
+        "short_term": ["Revisit the weakest answer and rewrite it.", "Practice 3 timed mock questions."],
+        "long_term": ["Ship an end-to-end project in your target stack."],
+    })),
+    ('"score"', '{"score": {n100}, "feedback": "Local stand-in evaluation #{n}."}'),
+    ("Start the interview", "Local opener #{n}: tell me a little about yourself and what you're working on."),
+    ("next best interview question", "Local question #{n}: can you go deeper on the hardest decision in that project?"),
+]
+DEFAULT_LOCAL_FALLBACK = "Local stand-in feedback #{n}: solid fundamentals, add more depth on trade-offs."
+
+
+def parse_latency(spec: str):
+    """
+    Latency spec -> sampler(rng) returning seconds.
+      "0" / "fixed:<ms>"                 constant
+      "uniform:<lo_ms>,<hi_ms>"          uniform
+      "lognormal:<median_ms>,<sigma>"    log-normal (realistic long tail)
+    """
+    spec = (spec or "0").strip().lower()
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    values = [float(v) for v in args.split(",") if v]
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000.0
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000.0
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000.0
+    raise ValueError(f"Unknown latency spec: {spec}")
+
+
+class _LocalModel:
+    def __init__(self, backend: "LocalBackend", model_name: str):
+        self._backend = backend
+        self.model_name = model_name
+
+    def generate_content(self, prompt, request_options=None, **kwargs):
+        return self._backend.respond(self.model_name, prompt, (request_options or {}).get("timeout"))
+
+
+class LocalBackend(LLMBackend):
+    name = "local"
+
+    def __init__(
+        self,
+        latency: str = LLM_LOCAL_LATENCY,
+        error_rate: float = LLM_LOCAL_ERROR_RATE,
+        seed: int = LLM_LOCAL_SEED,
+        responses: Optional[List[Tuple[str, str]]] = None,
+        fallback: str = DEFAULT_LOCAL_FALLBACK,
+    ):
+        self._sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.responses = responses or DEFAULT_LOCAL_RESPONSES
+        self.fallback = fallback
+        self.calls = 0
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "LocalBackend":
+        """Load canned responses from JSON: {"responses": [[marker, template], ...], "fallback": "..."}."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(responses=[tuple(r) for r in data.get("responses", [])] or None,
+                   fallback=data.get("fallback", DEFAULT_LOCAL_FALLBACK), **kwargs)
+
+    def model(self, model_name: str):
+        return _LocalModel(self, model_name)
+
+    def render(self, prompt: str) -> str:
+        """Deterministic response for a prompt (same prompt -> same text)."""
+        n = zlib.crc32(prompt.encode("utf-8"))
+        template = next((t for marker, t in self.responses if marker in prompt), self.fallback)
+        return template.replace("{n100}", str(40 + n % 56)).replace("{n}", str(n % 10000))
+
+    @staticmethod
+    def prompt_text(prompt: Any) -> str:
+        """Text form of a prompt; inline blobs (audio...) become a short placeholder with their checksum."""
+        if isinstance(prompt, str):
+            return prompt
+        if isinstance(prompt, list):
+            return "\n\n".join(LocalBackend.prompt_text(part) for part in prompt)
+        if isinstance(prompt, dict) and isinstance(prompt.get("data"), (bytes, bytearray)):
+            return f"<{prompt.get('mime_type')} {len(prompt['data'])} bytes crc={zlib.crc32(prompt['data'])}>"
+        return json.dumps(prompt, default=str)
+
+    def respond(self, model_name: str, prompt: Any, timeout: Optional[float] = None):
+        text_prompt = self.prompt_text(prompt)
+        with self._rng_lock:
+            self.calls += 1
+            delay = self._sample_latency(self._rng)
+            fail = self._rng.random() < self.error_rate
+
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"local backend: {delay:.2f}s exceeds {timeout}s deadline")
+        time.sleep(delay)
+        if fail:
+            raise ConnectionError("local backend: injected failure")
+
+        text = self.render(text_prompt)
+        usage = SimpleNamespace(
+            prompt_token_count=(len(text_prompt) + 3) // 4,
+            candidates_token_count=(len(text) + 3) // 4,
+        )
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+# ------------------------------------------------------
+# 🔌 Selection
+# ------------------------------------------------------
+def build_backend(name: str = LLM_BACKEND) -> LLMBackend:
+    name = (name or "gemini").lower()
+    if name == "local":
+        if LLM_LOCAL_RESPONSES_FILE:
+            return LocalBackend.from_file(LLM_LOCAL_RESPONSES_FILE)
+        return LocalBackend()
+    if name == "gemini":
+        return GeminiBackend()
+    raise ValueError(f"Unknown LLM_BACKEND: {name}")
+
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> LLMBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = build_backend()
+    return _backend
+
+
+def set_backend(backend: LLMBackend):
+    """Swap the process-wide backend (benchmarks / tests install a LocalBackend here)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
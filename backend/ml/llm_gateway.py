@@ -0,0 +1,343 @@
+# backend/ml/llm_gateway.py
+"""
+Single entry point for every LLM call in backend/ml.
+
+- talks to the configured backend (Gemini or the local stand-in, see llm_backends.py)
+  and keeps one pooled model client per model name,
+- routes each task ("question", "technical_score", "roadmap", ...) to its model (config.LLM_TASK_MODELS),
+- applies a per-attempt deadline and retries transient failures with jittered exponential backoff,
+- plugs in the static-prefix context cache,
+- records per-task call timings (see get_call_stats()),
+- hedges slow calls for latency-critical tasks (config.LLM_HEDGE_TASKS): once a call runs past
+  the task's recent p95, an identical backup request is fired and the first answer wins.
+- traces every call as an "llm.<task>" span and exports call/retry/hedge counters and the
+  prompt caches' hit ratios to /metrics.
+- books the prompt / response token counts of every successful call into the session's
+  cost ledger (cost_ledger.py). Only the winning response of a hedged call reports usage.
+
+Usage:
+    from .llm_gateway import generate_text
+    text = generate_text("roadmap", prompt)
+"""
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Optional, Union
+
+from .config import (
+    GEMINI_MODEL,
+    LLM_TASK_MODELS,
+    LLM_TIMEOUT_SECONDS,
+    LLM_TASK_TIMEOUTS,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_HEDGE_TASKS,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS,
+    LLM_HEDGE_MIN_DELAY_SECONDS,
+    LLM_HEDGE_MAX_RATIO,
+    LLM_HEDGE_POOL_SIZE,
+    INTERVIEW_TURN_WORKERS,
+)
+from .cost_ledger import record_usage
+from .context_cache import get_context_cache
+from .llm_backends import LLMBackend, get_backend, set_backend
+from .logs import get_logger
+from .metrics import REGISTRY
+from .profiling import profiled
+from .tracing import span
+
+try:
+    from google.api_core import exceptions as google_exceptions
+
+    RETRYABLE_ERRORS = (
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.TooManyRequests,
+        TimeoutError,
+        ConnectionError,
+    )
+except ImportError:  # api_core ships with google-generativeai, but don't make it a hard import
+    RETRYABLE_ERRORS = (TimeoutError, ConnectionError)
+
+logger = get_logger(__name__)
+
+TIMING_WINDOW = 500  # latencies kept per task for percentiles
+
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+_stats: Dict[str, Dict[str, Any]] = {}
+_stats_lock = threading.Lock()
+
+_hedge_pool = ThreadPoolExecutor(max_workers=LLM_HEDGE_POOL_SIZE or 2 * INTERVIEW_TURN_WORKERS,
+                                 thread_name_prefix="llm-hedge")
+_hedge_stats: Dict[str, Dict[str, int]] = {}
+
+
+# ------------------------------------------------------
+# 🔁 Pooled clients + routing
+# ------------------------------------------------------
+def model_for_task(task: str) -> str:
+    return LLM_TASK_MODELS.get(task, GEMINI_MODEL)
+
+
+def get_model(model_name: str):
+    """Return the shared model client for `model_name` (created once per process)."""
+    model = _models.get(model_name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_name)
+            if model is None:
+                model = get_backend().model(model_name)
+                _models[model_name] = model
+    return model
+
+
+def use_backend(backend: LLMBackend):
+    """Switch every LLM call in this process to `backend` (drops pooled clients built for the old one)."""
+    set_backend(backend)
+    with _models_lock:
+        _models.clear()
+
+
+# ------------------------------------------------------
+# ⏱️ Timings
+# ------------------------------------------------------
+def _record(task: str, seconds: float, ok: bool, attempts: int, attempt_seconds: Optional[float] = None):
+    """`seconds` spans the whole call incl. retries and backoff; `attempt_seconds` only the successful request."""
+    with _stats_lock:
+        entry = _stats.setdefault(task, {
+            "calls": 0, "errors": 0, "retries": 0,
+            "latencies": deque(maxlen=TIMING_WINDOW), "attempt_latencies": deque(maxlen=TIMING_WINDOW),
+        })
+        entry["calls"] += 1
+        entry["retries"] += attempts - 1
+        if ok:
+            entry["latencies"].append(seconds)
+            entry["attempt_latencies"].append(attempt_seconds if attempt_seconds is not None else seconds)
+        else:
+            entry["errors"] += 1
+
+
+def _percentile(sorted_values, q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[idx]
+
+
+def get_call_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-task call counts, errors, retries, latency percentiles (seconds) and hedge counters."""
+    with _stats_lock:
+        snapshot = {task: dict(entry, latencies=sorted(entry["latencies"])) for task, entry in _stats.items()}
+        hedges = {task: dict(entry) for task, entry in _hedge_stats.items()}
+    result = {}
+    for task, entry in snapshot.items():
+        lat = entry.pop("latencies")
+        entry.pop("attempt_latencies")
+        result[task] = {
+            **entry,
+            "model": model_for_task(task),
+            "p50": _percentile(lat, 0.50),
+            "p95": _percentile(lat, 0.95),
+            "p99": _percentile(lat, 0.99),
+        }
+        if task in hedges:
+            result[task]["hedge"] = hedges[task]
+    return result
+
+
+def get_hedge_stats() -> Dict[str, Dict[str, int]]:
+    """Per-task hedge counters: attempts, hedges fired, backup wins, primary wins, hedges skipped by the cap."""
+    with _stats_lock:
+        return {task: dict(entry) for task, entry in _hedge_stats.items()}
+
+
+# ------------------------------------------------------
+# 🪞 Hedging
+# ------------------------------------------------------
+def hedge_delay(task: str) -> float:
+    """How long to wait on the primary before hedging: the task's recent per-request latency percentile."""
+    with _stats_lock:
+        entry = _stats.get(task)
+        latencies = sorted(entry["attempt_latencies"]) if entry else []
+    if len(latencies) < LLM_HEDGE_MIN_SAMPLES:
+        return LLM_HEDGE_DEFAULT_DELAY_SECONDS
+    return max(_percentile(latencies, LLM_HEDGE_PERCENTILE), LLM_HEDGE_MIN_DELAY_SECONDS)
+
+
+def _hedge_counter(task: str) -> Dict[str, int]:
+    return _hedge_stats.setdefault(task, {
+        "attempts": 0, "hedged": 0, "backup_wins": 0, "primary_wins": 0, "capped": 0,
+    })
+
+
+def _reserve_hedge(task: str) -> bool:
+    """Allow a backup request only while hedges stay under LLM_HEDGE_MAX_RATIO of attempts (+1 of slack)."""
+    with _stats_lock:
+        counter = _hedge_counter(task)
+        if counter["hedged"] >= LLM_HEDGE_MAX_RATIO * counter["attempts"] + 1:
+            counter["capped"] += 1
+            return False
+        counter["hedged"] += 1
+        return True
+
+
+def _hedged_generate(task: str, model, prompt, timeout: float, **kwargs):
+    """
+    Run the primary request; if it is still pending hedge_delay() after it started, fire one
+    identical backup and return whichever succeeds first. The loser is cancelled if it has not started;
+    a request already in flight cannot be aborted, so its result is simply discarded.
+    """
+    with _stats_lock:
+        _hedge_counter(task)["attempts"] += 1
+
+    # Each attempt runs in its own copy of the caller's context (trace / log ids, request profiler)
+    generate = profiled(model.generate_content)
+    started = threading.Event()
+
+    def run_primary():
+        started.set()
+        return generate(prompt, request_options={"timeout": timeout}, **kwargs)
+
+    # The hedge clock starts when the primary does: time spent queued for a thread is not its latency
+    primary = _hedge_pool.submit(contextvars.copy_context().run, run_primary)
+    started.wait()
+    done, _ = wait([primary], timeout=hedge_delay(task))
+    if done or not _reserve_hedge(task):
+        return primary.result()
+
+    backup = _hedge_pool.submit(contextvars.copy_context().run, generate, prompt,
+                                request_options={"timeout": timeout}, **kwargs)
+    pending = {primary, backup}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                response = future.result()
+            except Exception as e:
+                error = e
+                continue
+            for other in pending:
+                other.cancel()
+            with _stats_lock:
+                _hedge_counter(task)["backup_wins" if future is backup else "primary_wins"] += 1
+            return response
+    raise error
+
+
+# ------------------------------------------------------
+# 🚀 Calls
+# ------------------------------------------------------
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def generate_text(
+    task: str,
+    prompt: Union[str, List[Any]],
+    *,
+    prefix: Optional[str] = None,
+    cache_key: Optional[str] = None,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+    hedge: Optional[bool] = None,
+    generation_config: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Run one text generation for `task` and return the stripped response text.
+
+    `prompt` is a string, or a list of parts for multimodal calls
+    (e.g. ["instructions", {"mime_type": "audio/wav", "data": wav_bytes}]).
+    `prefix` is static context for the prompt. With a `cache_key` and CONTEXT_CACHE_MODE on it is
+    registered once in the context cache, otherwise it is simply prepended.
+    `hedge` defaults to whether the task is listed in LLM_HEDGE_TASKS.
+    `generation_config` is passed through (e.g. {"response_mime_type": "application/json"}).
+    Raises the last error once retries are exhausted.
+    """
+    model_name = model_for_task(task)
+    timeout = timeout or LLM_TASK_TIMEOUTS.get(task, LLM_TIMEOUT_SECONDS)
+    retries = LLM_MAX_RETRIES if retries is None else retries
+    hedge = task in LLM_HEDGE_TASKS if hedge is None else hedge
+
+    cache = get_context_cache()
+    if prefix and cache_key and cache.mode != "off":
+        model = cache.model_for(cache_key, model_name, prefix)
+    else:
+        model = get_model(model_name)
+        if prefix:
+            prompt = [prefix, *prompt] if isinstance(prompt, list) else f"{prefix}\n\n{prompt}"
+    extra = {"generation_config": generation_config} if generation_config else {}
+
+    with span(f"llm.{task}"):
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                attempt_start = time.perf_counter()
+                if hedge:
+                    response = _hedged_generate(task, model, prompt, timeout, **extra)
+                else:
+                    response = model.generate_content(prompt, request_options={"timeout": timeout}, **extra)
+                attempt_seconds = time.perf_counter() - attempt_start
+                text = response.text.strip()
+                elapsed = time.perf_counter() - start
+                _record(task, elapsed, True, attempt + 1, attempt_seconds)
+                usage = getattr(response, "usage_metadata", None)
+                record_usage(
+                    f"llm.{task}", elapsed, model=model_name,
+                    prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+                    response_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+                )
+                return text
+            except RETRYABLE_ERRORS as e:
+                if attempt >= retries:
+                    _record(task, time.perf_counter() - start, False, attempt + 1)
+                    raise
+                delay = _backoff(attempt)
+                logger.warning("⚠️ LLM call '%s' failed (%s), retry %d/%d in %.2fs",
+                               task, type(e).__name__, attempt + 1, retries, delay)
+                time.sleep(delay)
+                attempt += 1
+            except Exception:
+                _record(task, time.perf_counter() - start, False, attempt + 1)
+                raise
+
+
+# ------------------------------------------------------
+# 📈 /metrics
+# ------------------------------------------------------
+def _collect_metrics():
+    """Scrape-time export of call / retry / hedge counters and the prompt caches' hit ratios."""
+    from .resume_digest import get_digest_stats
+
+    stats = get_call_stats()
+    yield ("llm_calls_total", "counter", "LLM calls per task",
+           [({"task": t}, s["calls"]) for t, s in stats.items()])
+    yield ("llm_call_errors_total", "counter", "LLM calls that failed after retries",
+           [({"task": t}, s["errors"]) for t, s in stats.items()])
+    yield ("llm_call_retries_total", "counter", "LLM retry attempts",
+           [({"task": t}, s["retries"]) for t, s in stats.items()])
+    hedges = get_hedge_stats()
+    yield ("llm_hedges_total", "counter", "Hedge outcomes per task",
+           [({"task": t, "outcome": k}, v) for t, h in hedges.items() for k, v in h.items() if k != "attempts"])
+
+    caches = {"context_cache": get_context_cache().get_stats(), "resume_digest": get_digest_stats()}
+    yield ("cache_requests_total", "counter", "Prompt cache lookups by result",
+           [({"cache": name, "result": r}, c[r]) for name, c in caches.items() for r in ("hits", "misses")])
+    yield ("cache_hit_ratio", "gauge", "Prompt cache hits / lookups",
+           [({"cache": name}, c["hits"] / (c["hits"] + c["misses"]) if c["hits"] + c["misses"] else None)
+            for name, c in caches.items()])
+
+
+REGISTRY.register_collector(_collect_metrics)
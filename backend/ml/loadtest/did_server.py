@@ -0,0 +1,158 @@
+# backend/ml/loadtest/did_server.py
+"""
+Local stand-in for the D-ID talks API over real HTTP, for exercising the completion webhook.
+
+  POST /talks       -> {"id", "status": "created"}; the talk "renders" for --render-seconds, then
+                       the finished talk is POSTed to the request's "webhook" URL (unless dropped)
+  GET  /talks/{id}  -> {"id", "status": "started" | "done", "result_url"?}
+  GET  /videos/...  -> a few bytes of placeholder MP4 (what result_url points at)
+
+Run it next to the API (from the project root):
+    python -m backend.ml.loadtest.did_server --port 8099 --render-seconds 4 --drop-webhooks 0.2
+    DID_API_URL=http://127.0.0.1:8099 DID_WEBHOOK_URL=http://127.0.0.1:8000/api/did/webhook \
+        DID_WEBHOOK_TOKEN=local-secret uvicorn backend.ml.api:app
+
+or in-process (served from a daemon thread):
+    server = start_did_server(render_seconds=2)
+    server.url          # base URL for DID_API_URL
+    server.requests     # request counts per endpoint, e.g. {"create": 3, "status": 5, "webhook": 3}
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+import requests
+
+from backend.ml.logs import get_logger
+
+logger = get_logger(__name__)
+
+
+class DIDStandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, render_seconds: float = 3.0, drop_webhooks: float = 0.0, seed: int = 7):
+        super().__init__(address, _Handler)
+        self.render_seconds = render_seconds
+        self.drop_webhooks = drop_webhooks
+        self.requests: Dict[str, int] = {}
+        self._talks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._rng = random.Random(seed)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, endpoint: str):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def create(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        talk_id = f"tlk_local_{next(self._ids)}"
+        with self._lock:
+            self._talks[talk_id] = {"ready_at": time.monotonic() + self.render_seconds}
+            drop = self._rng.random() < self.drop_webhooks
+        webhook = body.get("webhook")
+        if webhook and not drop:
+            timer = threading.Timer(self.render_seconds, self._fire_webhook, (webhook, talk_id))
+            timer.daemon = True
+            timer.start()
+        return {"id": talk_id, "status": "created"}
+
+    def status(self, talk_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            talk = self._talks.get(talk_id)
+        if talk is None:
+            return None
+        if time.monotonic() < talk["ready_at"]:
+            return {"id": talk_id, "status": "started"}
+        return {"id": talk_id, "status": "done", "result_url": f"{self.url}/videos/{talk_id}.mp4",
+                "duration": round(self.render_seconds, 2)}
+
+    def _fire_webhook(self, webhook: str, talk_id: str):
+        self.count("webhook")
+        try:
+            requests.post(webhook, json=self.status(talk_id), timeout=10)
+        except Exception as e:
+            logger.warning("⚠️ Stand-in D-ID webhook to %s failed: %s", webhook, e)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: DIDStandIn
+
+    def _reply(self, payload: Dict[str, Any], code: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/talks":
+            return self._reply({"kind": "NotFoundError"}, 404)
+        self.server.count("create")
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._reply({"kind": "ValidationError"}, 400)
+        self._reply(self.server.create(body), 201)
+
+    def do_GET(self):
+        if self.path.startswith("/videos/"):
+            self.server.count("video")
+            body = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 1024
+            self.send_response(200)
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if not self.path.startswith("/talks/"):
+            return self._reply({"kind": "NotFoundError"}, 404)
+        self.server.count("status")
+        talk = self.server.status(self.path.rstrip("/").rsplit("/", 1)[-1])
+        self._reply(talk or {"kind": "NotFoundError"}, 200 if talk else 404)
+
+    def log_message(self, format, *args):
+        logger.debug("🎬 stand-in D-ID: " + format, *args)
+
+
+def start_did_server(host: str = "127.0.0.1", port: int = 0, **options) -> DIDStandIn:
+    """Serve a DIDStandIn from a daemon thread (port 0 picks a free port); stop with .shutdown()."""
+    server = DIDStandIn((host, port), **options)
+    threading.Thread(target=server.serve_forever, name="did-stand-in", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--render-seconds", type=float, default=3.0)
+    parser.add_argument("--drop-webhooks", type=float, default=0.0,
+                        help="share of talks whose webhook is never sent (exercises the polling fallback)")
+    args = parser.parse_args()
+
+    server = DIDStandIn((args.host, args.port), render_seconds=args.render_seconds, drop_webhooks=args.drop_webhooks)
+    logger.info("🎬 Stand-in D-ID API on %s (render %.1fs, dropping %.0f%% of webhooks)",
+                server.url, args.render_seconds, args.drop_webhooks * 100)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info("📊 Requests served: %s", server.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+# backend/ml/loadtest/run.py
+"""
+End-to-end concurrent interview load test against an in-process `api.app`.
+
+Every simulated candidate:
+  POST /api/resume/upload  ->  POST /api/interview/answer ("start")
+  ->  N x POST /api/interview/answer (audio or text)  ->  POST /api/interview/stop
+
+Gemini, ElevenLabs, D-ID, Google STT and Supabase are replaced by local stubs
+(see stubs.py) with configurable latency and error rates.
+
+Run from the project root:
+    python -m backend.ml.loadtest.run --candidates 20 --turns 4
+    python -m backend.ml.loadtest.run --candidates 50 --llm-latency lognormal:1200,0.5 --llm-error-rate 0.02
+
+Reports throughput plus p50/p95/p99 latency per endpoint and per stubbed stage.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+from .stubs import StubConfig, install_stubs
+
+SERVICES = ("llm", "stt", "tts", "did_api", "did_render", "db", "storage")
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"n": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(values)
+
+    def pick(q):
+        return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+    return {"n": len(ordered), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+class EndpointRecorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.samples.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+
+async def _timed(recorder, name, coro):
+    start = time.perf_counter()
+    try:
+        response = await coro
+    except Exception as e:
+        recorder.record(name, time.perf_counter() - start, False)
+        raise RuntimeError(f"{name} raised {e!r}")
+    body = response.json() if response.status_code == 200 else {}
+    ok = response.status_code == 200 and body.get("status") in ("success", "finished")
+    recorder.record(name, time.perf_counter() - start, ok)
+    return body
+
+
+def _is_audio_turn(n: int, audio_percent: int) -> bool:
+    """Spread audio turns evenly over the run's n-th turns, so any run size gets the requested share."""
+    return (n * audio_percent) % 100 < audio_percent
+
+
+async def run_candidate(client, idx: int, args, recorder: EndpointRecorder, payloads) -> bool:
+    resumes, wav = payloads
+    user_name = f"Loadtest Candidate {idx}"
+    docx = resumes[idx % len(resumes)]
+
+    upload = await _timed(recorder, "POST /api/resume/upload", client.post(
+        "/api/resume/upload",
+        files={"file": (f"candidate_{idx}.docx", docx,
+                        "application/vnd.openxmlformats-officedocument.wordprocessingml.document")},
+    ))
+    resume_json = json.dumps(upload.get("data") or {})
+
+    form = {
+        "user_name": user_name,
+        "difficulty": "medium",
+        "voice_name": ("Monika", "Devajit", "Shaurya", "Sia")[idx % 4],
+        "resume_data": resume_json,
+        "current_question": "start",
+    }
+    body = await _timed(recorder, "POST /api/interview/answer (start)",
+                        client.post("/api/interview/answer", data=form))
+    session_id = body.get("session_id")
+    question = body.get("next_question") or "Tell me about yourself."
+
+    for turn in range(args.turns):
+        data = dict(form, session_id=session_id, current_question=question)
+        if _is_audio_turn(idx * args.turns + turn, args.audio_percent):
+            files = {"audio_file": (f"answer_{turn}.wav", wav, "audio/wav")}
+            body = await _timed(recorder, "POST /api/interview/answer (audio)",
+                                client.post("/api/interview/answer", data=data, files=files))
+        else:
+            data["user_answer"] = f"Turn {turn}: I developed the service with my team and worked on SQL tuning."
+            body = await _timed(recorder, "POST /api/interview/answer (text)",
+                                client.post("/api/interview/answer", data=data))
+        question = body.get("next_question") or question
+
+    body = await _timed(recorder, "POST /api/interview/stop", client.post(
+        "/api/interview/stop", json={"session_id": session_id, "user_name": user_name, "difficulty": "medium"},
+    ))
+    return body.get("status") == "success"
+
+
+async def run(args):
+    import httpx
+    from backend.ml.benchmarks.corpus import load_resume_texts, build_docx, build_wav
+
+    config = StubConfig(did_poll_interval=args.did_poll_interval, seed=args.seed)
+    for name in SERVICES:
+        latency = getattr(args, f"{name}_latency")
+        if latency:
+            getattr(config, name).latency = latency
+        getattr(config, name).error_rate = getattr(args, f"{name}_error_rate")
+    handles = install_stubs(config)
+
+    from backend.ml.api import app
+    from backend.ml.llm_gateway import get_call_stats
+
+    payloads = ([build_docx(t) for t in load_resume_texts()], build_wav(args.audio_seconds))
+    recorder = EndpointRecorder()
+
+    async def one(idx):
+        try:
+            return await run_candidate(client, idx, args, recorder, payloads)
+        except Exception as e:
+            print(f"⚠️ candidate {idx} aborted: {e}")
+            return False
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one(i) for i in range(args.candidates)))
+        elapsed = time.perf_counter() - start
+
+    requests_done = sum(len(v) for v in recorder.samples.values())
+    print(f"\n📊 {args.candidates} concurrent candidates x {args.turns} turns in {elapsed:.1f}s")
+    print(f"   completed interviews: {sum(results)}/{len(results)}  "
+          f"({sum(results) / elapsed:.2f} interviews/s, {requests_done / elapsed:.2f} requests/s)")
+    split = {mode: len(recorder.samples.get(f"POST /api/interview/answer ({mode})", []))
+             for mode in ("audio", "text")}
+    print(f"   answer turns: {split['audio']} audio / {split['text']} text (--audio-percent {args.audio_percent})")
+
+    def table(title, samples, errors):
+        print(f"\n{title:<40} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+        for name in sorted(samples):
+            p = _percentiles(samples[name])
+            print(f"{name:<40} {p['n']:>6} {p['p50']:>8.3f}s {p['p95']:>8.3f}s {p['p99']:>8.3f}s "
+                  f"{errors.get(name, 0):>7}")
+
+    table("endpoint", recorder.samples, recorder.errors)
+    table("stage (stubbed service)", handles.recorder.samples, handles.recorder.errors)
+
+    print(f"\n{'llm task':<40} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+    for task, s in sorted(get_call_stats().items()):
+        print(f"{task:<40} {s['calls']:>6} {s['p50'] or 0:>8.3f}s {s['p95'] or 0:>8.3f}s "
+              f"{s['p99'] or 0:>8.3f}s {s['errors']:>7}")
+    print(f"\nstorage uploaded: {handles.supabase.uploaded_bytes / 1e6:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "elapsed_seconds": elapsed,
+                "candidates": args.candidates,
+                "completed": sum(results),
+                "answer_turns": split,
+                "endpoints": {k: _percentiles(v) for k, v in recorder.samples.items()},
+                "endpoint_errors": recorder.errors,
+                "stages": {k: _percentiles(v) for k, v in handles.recorder.samples.items()},
+                "stage_errors": handles.recorder.errors,
+                "llm": get_call_stats(),
+            }, f, indent=2)
+        print(f"💾 JSON report written to {args.json}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=10, help="simultaneous simulated candidates")
+    parser.add_argument("--turns", type=int, default=3, help="answer turns per candidate (after 'start')")
+    parser.add_argument("--audio-percent", type=int, default=50, help="share of turns answered with audio")
+    parser.add_argument("--audio-seconds", type=float, default=4.0)
+    parser.add_argument("--did-poll-interval", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="also write the report as JSON to this path")
+    for name in SERVICES:
+        flag = name.replace("_", "-")
+        parser.add_argument(f"--{flag}-latency", help=f"{name} latency spec, e.g. lognormal:800,0.4")
+        parser.add_argument(f"--{flag}-error-rate", type=float, default=0.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+# backend/ml/loadtest/stubs.py
+"""
+Local stand-ins for every external service the interview flow touches, each with a
+configurable latency distribution and error rate:
+
+  - Gemini       -> llm_backends.LocalBackend
+  - ElevenLabs   -> StubElevenLabs     (client.text_to_speech.convert)
+  - D-ID         -> StubDIDRequests    (requests.post / requests.get used by avatar_generator_did)
+                    (did_server.py serves the same API over real HTTP, with completion webhooks)
+  - Google STT   -> stub_recognize_google (speech_recognition.Recognizer.recognize_google)
+  - Supabase     -> StubSupabase       (table().insert/select/eq/order/limit/execute, storage uploads)
+
+install_stubs() must run BEFORE backend.ml.api is imported: Supabase credentials and the
+LLM backend are read at import time.
+"""
+import itertools
+import os
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+DUMMY_SUPABASE_URL = "http://supabase.stub.local"
+DUMMY_SUPABASE_KEY = "stub.stub.stub"   # JWT-shaped so the client accepts it
+
+STUB_TRANSCRIPTS = [
+    "I worked on a churn prediction model in Python and deployed it on AWS with my team.",
+    "Maybe I would use a cache here, I think it depends on the read to write ratio.",
+    "We definitely collaborated closely, I developed the API and wrote the SQL queries.",
+    "I'm not sure, probably I would start by profiling the slowest endpoint first.",
+    "Of course, I led the migration and we cut latency by sixty percent.",
+]
+
+
+# ------------------------------------------------------
+# ⏱️ Stage recording
+# ------------------------------------------------------
+class StageRecorder:
+    """Thread-safe per-stage latency samples and error counts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, stage: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+            if not ok:
+                self.errors[stage] = self.errors.get(stage, 0) + 1
+
+
+@dataclass
+class ServiceProfile:
+    """Latency spec (see llm_backends.parse_latency) + error rate for one stubbed service."""
+    latency: str = "0"
+    error_rate: float = 0.0
+
+
+@dataclass
+class StubConfig:
+    llm: ServiceProfile = field(default_factory=lambda: ServiceProfile("lognormal:900,0.4"))
+    stt: ServiceProfile = field(default_factory=lambda: ServiceProfile("lognormal:700,0.3"))
+    tts: ServiceProfile = field(default_factory=lambda: ServiceProfile("lognormal:600,0.3"))
+    did_api: ServiceProfile = field(default_factory=lambda: ServiceProfile("lognormal:150,0.3"))
+    did_render: ServiceProfile = field(default_factory=lambda: ServiceProfile("lognormal:4000,0.3"))
+    db: ServiceProfile = field(default_factory=lambda: ServiceProfile("lognormal:60,0.3"))
+    storage: ServiceProfile = field(default_factory=lambda: ServiceProfile("lognormal:120,0.3"))
+    did_poll_interval: float = 0.5
+    seed: int = 7
+
+
+class _Service:
+    def __init__(self, stage: str, profile: ServiceProfile, recorder: StageRecorder, seed: int):
+        from backend.ml.llm_backends import parse_latency
+
+        self.stage = stage
+        self.error_rate = profile.error_rate
+        self._sample = parse_latency(profile.latency)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.recorder = recorder
+
+    def delay(self) -> float:
+        with self._lock:
+            return self._sample(self._rng)
+
+    def hit(self, stage: Optional[str] = None):
+        """Sleep for one sampled latency, record it, and raise if this call is an injected failure."""
+        with self._lock:
+            delay = self._sample(self._rng)
+            fail = self._rng.random() < self.error_rate
+        time.sleep(delay)
+        self.recorder.record(stage or self.stage, delay, ok=not fail)
+        if fail:
+            raise ConnectionError(f"stub {stage or self.stage}: injected failure")
+
+
+# ------------------------------------------------------
+# 🗄️ Supabase
+# ------------------------------------------------------
+class _StubQuery:
+    def __init__(self, client: "StubSupabase", table: str):
+        self._client, self._table = client, table
+        self._op, self._payload = "select", None
+        self._filters, self._order, self._limit = [], None, None
+
+    def insert(self, row):
+        self._op, self._payload = "insert", row
+        return self
+
+    def update(self, values):
+        self._op, self._payload = "update", values
+        return self
+
+    def select(self, columns="*"):
+        self._op = "select"
+        return self
+
+    def eq(self, column, value):
+        self._filters.append((column, value))
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        self._client.db.hit(f"supabase.{self._op}")
+        with self._client.lock:
+            rows = self._client.tables.setdefault(self._table, [])
+            if self._op == "insert":
+                new = self._payload if isinstance(self._payload, list) else [self._payload]
+                rows.extend(dict(r) for r in new)
+                return SimpleNamespace(data=[dict(r) for r in new])
+            matched = [r for r in rows if all(r.get(c) == v for c, v in self._filters)]
+            if self._op == "update":
+                for row in matched:
+                    row.update(self._payload)
+            data = [dict(r) for r in matched]
+        if self._order:
+            data.sort(key=lambda r: str(r.get(self._order[0])), reverse=self._order[1])
+        if self._limit is not None:
+            data = data[: self._limit]
+        return SimpleNamespace(data=data)
+
+
+class _StubBucket:
+    def __init__(self, client: "StubSupabase", name: str):
+        self._client, self.name = client, name
+
+    def upload(self, path, file, *args, **kwargs):
+        size = os.path.getsize(file) if isinstance(file, str) else len(file)
+        self._client.storage_service.hit("supabase.storage_upload")
+        with self._client.lock:
+            self._client.uploaded_bytes += size
+        return SimpleNamespace(path=path)
+
+    def get_public_url(self, path):
+        return f"{DUMMY_SUPABASE_URL}/storage/v1/object/public/{self.name}/{path}"
+
+
+class StubSupabase:
+    """In-memory Supabase client covering the calls made in backend/ml."""
+
+    def __init__(self, db: _Service, storage: _Service):
+        self.db, self.storage_service = db, storage
+        self.lock = threading.Lock()
+        self.tables: Dict[str, List[dict]] = {}
+        self.uploaded_bytes = 0
+        self.storage = SimpleNamespace(from_=lambda bucket: _StubBucket(self, bucket))
+
+    def table(self, name: str) -> _StubQuery:
+        return _StubQuery(self, name)
+
+
+# ------------------------------------------------------
+# 🔊 ElevenLabs
+# ------------------------------------------------------
+class StubElevenLabs:
+    """Mimics `ElevenLabs(...).text_to_speech.convert(...)`: mp3- / ogg-ish chunks sized by the bitrate."""
+
+    def __init__(self, service: _Service):
+        self._service = service
+        self.text_to_speech = SimpleNamespace(convert=self.convert)
+
+    def convert(self, voice_id, model_id, text, output_format="mp3_44100_128", **kwargs):
+        self._service.hit("elevenlabs.convert")
+        codec, _, kbps = output_format.split("_")
+        size = max(len(text), 1) * 180 * int(kbps) // 128     # 180 B/char ~ 128 kbps at ~14 chars/s
+        head = b"OggS" if codec == "opus" else b"\xff\xfb"
+        return iter([head + b"\x00" * (size // 2), b"\x00" * max(size - size // 2 - len(head), 0)])
+
+
+# ------------------------------------------------------
+# 🎬 D-ID
+# ------------------------------------------------------
+class _StubResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload, self.status_code = payload, status_code
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class StubDIDRequests:
+    """Replaces the `requests` module inside avatar_generator_did: POST /talks, GET /talks/{id}."""
+
+    def __init__(self, api: _Service, render: _Service):
+        self._api, self._render = api, render
+        self._lock = threading.Lock()
+        self._talks: Dict[str, float] = {}    # talk_id -> ready_at (monotonic)
+        self._ids = itertools.count(1)
+
+    def post(self, url, headers=None, json=None, timeout=None, **kwargs):
+        self._api.hit("did.create")
+        talk_id = f"tlk_stub_{next(self._ids)}"
+        with self._lock:
+            self._talks[talk_id] = time.monotonic() + self._render.delay()
+        return _StubResponse({"id": talk_id, "status": "created"}, 201)
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self._api.hit("did.poll")
+        talk_id = url.rstrip("/").rsplit("/", 1)[-1]
+        with self._lock:
+            ready_at = self._talks.get(talk_id)
+        if ready_at is None:
+            return _StubResponse({"kind": "NotFoundError"}, 404)
+        if time.monotonic() >= ready_at:
+            return _StubResponse({"id": talk_id, "status": "done",
+                                  "result_url": f"https://did.stub.local/{talk_id}.mp4"})
+        return _StubResponse({"id": talk_id, "status": "started"})
+
+
+# ------------------------------------------------------
+# 🎤 Google STT
+# ------------------------------------------------------
+def make_stub_recognize_google(service: _Service):
+    counter = itertools.count()
+
+    def recognize_google(self, audio_data, *args, **kwargs):
+        import speech_recognition as sr
+
+        try:
+            service.hit("stt.recognize_google")
+        except ConnectionError as e:
+            raise sr.RequestError(str(e))
+        return STUB_TRANSCRIPTS[next(counter) % len(STUB_TRANSCRIPTS)]
+
+    return recognize_google
+
+
+# ------------------------------------------------------
+# 🔌 Install
+# ------------------------------------------------------
+def install_stubs(config: Optional[StubConfig] = None) -> SimpleNamespace:
+    """Point every external dependency at a local stub; returns handles (recorder, supabase, ...)."""
+    config = config or StubConfig()
+    recorder = StageRecorder()
+    seeds = itertools.count(config.seed)
+
+    def service(stage, profile):
+        return _Service(stage, profile, recorder, next(seeds))
+
+    # Read at import time by config.py / supabase_config.py / llm_backends.py
+    os.environ.setdefault("SUPABASE_URL", DUMMY_SUPABASE_URL)
+    os.environ.setdefault("SUPABASE_KEY", DUMMY_SUPABASE_KEY)
+    os.environ.setdefault("ELEVENLABS_API_KEY", "stub")
+    os.environ.setdefault("DID_API_KEY", "stub:stub")
+    os.environ["LLM_BACKEND"] = "local"
+
+    import speech_recognition as sr
+    from backend.ml import supabase_config, text_to_speech, avatar_generator_did, Evaluation
+    from backend.ml.llm_backends import LocalBackend
+    from backend.ml.llm_gateway import use_backend
+
+    use_backend(LocalBackend(latency=config.llm.latency, error_rate=config.llm.error_rate, seed=next(seeds)))
+
+    supabase = StubSupabase(service("supabase", config.db), service("supabase.storage", config.storage))
+    for module in (supabase_config, text_to_speech, Evaluation):
+        module.supabase = supabase
+
+    text_to_speech.USE_ELEVEN = True
+    text_to_speech.client = StubElevenLabs(service("elevenlabs", config.tts))
+
+    did = StubDIDRequests(service("did", config.did_api), service("did.render", config.did_render))
+    avatar_generator_did.requests = did
+    avatar_generator_did.DID_API_KEY = avatar_generator_did.DID_API_KEY or "stub:stub"
+    avatar_generator_did.POLL_INTERVAL_SECONDS = config.did_poll_interval
+
+    sr.Recognizer.recognize_google = make_stub_recognize_google(service("stt", config.stt))
+
+    return SimpleNamespace(recorder=recorder, supabase=supabase, did=did, run_id=uuid.uuid4().hex[:8])
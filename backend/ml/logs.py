@@ -0,0 +1,193 @@
+# backend/ml/logs.py
+"""
+Structured, level-controlled logging for backend/ml.
+
+    from .logs import get_logger, preview
+    logger = get_logger(__name__)
+    logger.info("✅ Resume parsed: %d skills", len(skills))
+    logger.debug("🔹 Raw Gemini output: %s", preview(text))   # formatted only if DEBUG is on
+
+- LOG_LEVEL sets the level for every backend.ml logger; LOG_FORMAT is "text" or "json".
+- Every record carries the request id (set by TracingMiddleware, honouring X-Request-ID) and the
+  interview session id (bind_session()), both kept in contextvars.
+- LOG_SAMPLE_RATES keeps only a share of DEBUG/INFO records per logger
+  ("backend.ml.avatar_generator_did=0.1,backend.ml.supabase_config=0.5"); WARNING and above
+  are never sampled out.
+- Payloads go through lazy() / preview(): they are only rendered when the record is emitted,
+  and previews are truncated so resumes and answers don't end up in logs wholesale.
+"""
+import contextvars
+import json
+import logging
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+session_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("session_id", default=None)
+
+ROOT_LOGGER = "backend.ml"
+PREVIEW_CHARS = 200
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "session_id",
+}
+
+_configured = False
+
+
+# ------------------------------------------------------
+# 💤 Lazy payloads
+# ------------------------------------------------------
+class lazy:
+    """Defer an expensive rendering (json.dumps, ...) until the record is actually formatted."""
+
+    __slots__ = ("_fn", "_args")
+
+    def __init__(self, fn: Callable[..., Any], *args):
+        self._fn, self._args = fn, args
+
+    def __str__(self):
+        return str(self._fn(*self._args))
+
+
+def _preview(value: Any, limit: int) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, default=str, ensure_ascii=False)
+    text = text.replace("\n", " ")
+    return text if len(text) <= limit else f"{text[:limit]}… ({len(text)} chars)"
+
+
+def preview(value: Any, limit: int = PREVIEW_CHARS) -> lazy:
+    """Truncated one-line rendering of a string / JSON-able payload, built lazily."""
+    return lazy(_preview, value, limit)
+
+
+# ------------------------------------------------------
+# 🏷️ Correlation ids
+# ------------------------------------------------------
+def bind_request(request_id: Optional[str]):
+    """Set the request id for this context; returns tokens for reset_context()."""
+    return request_id_var.set(request_id), session_id_var.set(None)
+
+
+def reset_context(tokens):
+    request_token, session_token = tokens
+    session_id_var.reset(session_token)
+    request_id_var.reset(request_token)
+
+
+def bind_session(session_id: Optional[str]):
+    """Attach the interview session id to every record logged from this request onwards."""
+    session_id_var.set(session_id)
+
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.session_id = session_id_var.get()
+        return True
+
+
+class _SamplingFilter(logging.Filter):
+    """Keep only `rate` of sub-WARNING records for loggers under a configured prefix."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._by_logger: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._by_logger.get(name)
+        if rate is None:
+            prefixes = [p for p in self.rates if name == p or name.startswith(p + ".")]
+            rate = self.rates[max(prefixes, key=len)] if prefixes else 1.0
+            self._by_logger[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+# ------------------------------------------------------
+# 🖨️ Formatters
+# ------------------------------------------------------
+def _extra_fields(record) -> Dict[str, Any]:
+    return {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": record.request_id,
+            "session_id": record.session_id,
+            **_extra_fields(record),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s%(ids)s %(message)s%(fields)s")
+
+    def format(self, record):
+        ids = [f"{key}={value}" for key, value in (("req", record.request_id), ("session", record.session_id)) if value]
+        record.ids = f" [{' '.join(ids)}]" if ids else ""
+        fields = _extra_fields(record)
+        fields.pop("ids", None)
+        fields.pop("fields", None)
+        record.fields = "".join(f" {k}={v}" for k, v in fields.items())
+        return super().format(record)
+
+
+# ------------------------------------------------------
+# 🔧 Setup
+# ------------------------------------------------------
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    rates = {}
+    for item in (spec or "").split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, sample_rates: Optional[str] = None):
+    """(Re)configure the backend.ml logger tree. Called automatically by the first get_logger()."""
+    global _configured
+    from .config import LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE_RATES
+
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if (fmt or LOG_FORMAT).lower() == "json" else TextFormatter())
+    handler.addFilter(_ContextFilter())
+    rates = parse_sample_rates(LOG_SAMPLE_RATES if sample_rates is None else sample_rates)
+    if rates:
+        handler.addFilter(_SamplingFilter(rates))
+
+    root.addHandler(handler)
+    root.setLevel((level or LOG_LEVEL).upper())
+    root.propagate = False
+    _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the backend.ml tree (module __name__ works both as a package and a script)."""
+    if not _configured:
+        configure_logging()
+    if not name.startswith(ROOT_LOGGER):
+        name = f"{ROOT_LOGGER}.{name.rsplit('.', 1)[-1]}"
+    return logging.getLogger(name)
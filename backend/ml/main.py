@@ -195,9 +195,11 @@
 import json
 import uuid
 from datetime import datetime
-from .question_generator import generate_question
+from .question_generator import generate_question, release_session_context
+from .conversation_memory import record_turn, clear_session as clear_conversation
+from .resume_digest import clear_resume_digest
 from .speech_to_text import listen_to_user
-from .text_to_speech import speak_text, set_voice
+from .text_to_speech import speak_text, set_voice, clear_voice
 from .supabase_config import (
     save_interview_session,
     save_evaluation,
@@ -208,6 +210,9 @@ from .supabase_config import (
 from .Evaluation import get_evaluation
 from .report_generator import compile_scores
 from .roadmap import generate_roadmap_dynamic
+from .logs import bind_session, get_logger, preview
+
+logger = get_logger(__name__)
 
 
 def start_interview(user_name: str, difficulty_level: str, interviewer_voice: str):
@@ -215,48 +220,48 @@ def start_interview(user_name: str, difficulty_level: str, interviewer_voice: st
     Runs the adaptive AI Mock Interview with voice + Supabase integration.
     Designed for web use — frontend will send inputs (no CLI prompts).
     """
-    print(f"\n🎯 Starting interview for: {user_name}")
-    print(f"🧩 Difficulty Level: {difficulty_level.capitalize()}")
-    print(f"🎙️ Selected Voice: {interviewer_voice}")
-    print("------------------------------------------")
-
-    # ✅ Set interviewer voice (frontend avatar selection)
-    set_voice(interviewer_voice)
+    logger.info("🎯 Starting interview: difficulty=%s voice=%s", difficulty_level, interviewer_voice)
 
     # ✅ Load resume data from Supabase
     try:
         resume_data = fetch_resume(user_name)
-        print("✅ Resume data successfully loaded from Supabase.")
+        logger.info("✅ Resume data successfully loaded from Supabase.")
     except Exception as e:
-        print(f"⚠️ Failed to fetch resume for {user_name}: {e}")
+        logger.warning("⚠️ Failed to fetch resume: %s", e)
         resume_data = {}
 
     # 🧾 Initialize conversation log
+    session_id = str(uuid.uuid4())
+    bind_session(session_id)
     conversation_log = []
 
+    # ✅ Set interviewer voice (frontend avatar selection) for this session only
+    set_voice(interviewer_voice, session_id=session_id)
+
     # 🎤 Start with a warm-up question
     question = generate_question(resume_data, difficulty=difficulty_level, first_question=True)
-    speak_text(f"Hello {user_name}, let's begin your interview. {question}")
-    print(f"👩‍💼 Interviewer: {question}")
+    speak_text(f"Hello {user_name}, let's begin your interview. {question}", session_id=session_id)
+    logger.info("👩‍💼 Interviewer: %s", question)
 
     while True:
         # In frontend, this will be replaced by user audio input
         user_answer = listen_to_user()
         if not user_answer:
-            speak_text("I didn’t catch that. Could you please repeat?")
+            speak_text("I didn’t catch that. Could you please repeat?", session_id=session_id)
             continue
 
-        print(f"🗣️ Candidate ({user_name}): {user_answer}")
+        logger.debug("🗣️ Candidate: %s", preview(user_answer))
 
         conversation_log.append({
             "question": question,
             "answer": user_answer
         })
+        record_turn(session_id, question, user_answer, resume_data)
 
         # Exit condition
         if user_answer.lower() in ["exit", "quit", "stop", "stop the interview"]:
-            speak_text("That concludes our interview. It was great talking to you!")
-            print("👩‍💼 Interviewer: Great! That concludes our session. Goodbye!")
+            speak_text("That concludes our interview. It was great talking to you!", session_id=session_id)
+            logger.info("👩‍💼 Interviewer: Great! That concludes our session. Goodbye!")
             break
 
         # 🎯 Generate next adaptive question
@@ -264,22 +269,26 @@ def start_interview(user_name: str, difficulty_level: str, interviewer_voice: st
             resume_data,
             previous_answer=user_answer,
             difficulty=difficulty_level,
-            first_question=False
+            first_question=False,
+            session_id=session_id,
         )
 
         if not next_question:
-            speak_text("That concludes our interview. Thank you!")
-            print("👩‍💼 Interviewer: Thank you for your time. Goodbye!")
+            speak_text("That concludes our interview. Thank you!", session_id=session_id)
+            logger.info("👩‍💼 Interviewer: Thank you for your time. Goodbye!")
             break
 
-        speak_text(next_question)
-        print(f"👩‍💼 Interviewer: {next_question}")
+        speak_text(next_question, session_id=session_id)
+        logger.info("👩‍💼 Interviewer: %s", next_question)
         question = next_question
 
+    clear_conversation(session_id)
+    clear_voice(session_id)
+    clear_resume_digest(session_id)
+    release_session_context(session_id)
+
     # 🧠 After interview — save session, evaluation, report, and roadmap
     try:
-        session_id = str(uuid.uuid4())
-
         # ✅ Save interview session
         save_interview_session(
             session_id=session_id,
@@ -287,13 +296,13 @@ def start_interview(user_name: str, difficulty_level: str, interviewer_voice: st
             difficulty=difficulty_level,
             qa_pairs=conversation_log,
         )
-        print("\n✅ Interview data successfully saved to Supabase!")
+        logger.info("✅ Interview data successfully saved to Supabase!")
 
         # ✅ Generate evaluation
-        print("\n🧠 Generating evaluation for your interview... please wait...")
+        logger.info("🧠 Generating evaluation for your interview... please wait...")
         evaluation = get_evaluation(session_id)
         save_evaluation(session_id, evaluation)
-        print("✅ Evaluation saved to Supabase successfully!")
+        logger.info("✅ Evaluation saved to Supabase successfully!")
 
         # ✅ Generate detailed report
         report_data = compile_scores(
@@ -305,16 +314,16 @@ def start_interview(user_name: str, difficulty_level: str, interviewer_voice: st
             },
         )
         save_report(session_id, report_data)
-        print("✅ Report saved to Supabase successfully!")
+        logger.info("✅ Report saved to Supabase successfully!")
 
         # ✅ Generate personalized roadmap
-        print("\n🧭 Generating personalized learning roadmap...")
+        logger.info("🧭 Generating personalized learning roadmap...")
         roadmap = generate_roadmap_dynamic(
             evaluation,
             role=resume_data.get("role", "Software Engineer")
         )
         save_roadmap(session_id, user_name, roadmap)
-        print("✅ Roadmap saved to Supabase successfully!")
+        logger.info("✅ Roadmap saved to Supabase successfully!")
 
         # ✅ Return structured response (for API integration)
         return {
@@ -327,7 +336,7 @@ def start_interview(user_name: str, difficulty_level: str, interviewer_voice: st
         }
 
     except Exception as e:
-        print(f"\n⚠️ Failed to save data, evaluation, report, or roadmap to Supabase: {e}")
+        logger.exception("⚠️ Failed to save data, evaluation, report, or roadmap to Supabase: %s", e)
         return {"status": "error", "message": str(e)}
 
 
@@ -0,0 +1,263 @@
+# backend/ml/prerender.py
+"""
+Pre-rendered interviewer clips for the fixed lines (greeting, "please repeat", closing, farewell).
+
+These scripts are the same for every candidate, so instead of a live ElevenLabs + D-ID render in
+every interview they are rendered once per presenter (the PRESENTER_MAP / VOICE_OPTIONS pair of
+the same name) and audio delivery profile, then served from a manifest:
+
+    python -m backend.ml.prerender                     # render what's missing or whose script changed
+    python -m backend.ml.prerender --presenter Sia --no-video --force
+
+    clip = fixed_clip("farewell", "Sia", "opus_48000_32")     # None if not rendered → render live
+    clip["audio_base64"], clip["audio_url"], clip["video_url"]
+
+PRERENDER_DIR/manifest.json maps presenter → line → {script hash, video URL, audio per profile};
+the audio files sit next to it, so a clip is served from memory without any network call.
+Videos are copied to storage because D-ID result URLs expire. A clip whose script no longer
+matches FIXED_LINES is ignored until it is rendered again.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+from .avatar_generator_did import PRESENTER_MAP, generate_avatar_video
+from .config import (
+    PRERENDER_DIR, PRERENDER_PROFILES, PRERENDER_VIDEO, PRERENDER_BUCKET, PRERENDER_ON_STARTUP, SUPABASE_URL,
+)
+from .logs import get_logger
+from .metrics import REGISTRY
+from .supabase_config import supabase
+from .text_to_speech import AUDIO_PROFILES, resolve_profile, speak_text
+
+logger = get_logger(__name__)
+
+FIXED_LINES = {
+    "greeting": "Hello, and welcome! Let's begin your interview.",
+    "repeat": "I didn't catch that. Could you please repeat?",
+    "closing": "That concludes our interview. Thank you!",
+    "farewell": "That concludes our interview. It was great talking to you!",
+}
+
+PRERENDERED_CLIPS = REGISTRY.counter("prerendered_clips_total", "Fixed interviewer lines requested", ("line", "outcome"))
+
+RENDER_WORKERS = 4
+
+_manifest: Optional[Dict[str, Any]] = None
+_audio_cache: Dict[str, str] = {}      # audio file → base64
+_lock = threading.Lock()
+
+
+def script_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def _manifest_path() -> Path:
+    return Path(PRERENDER_DIR) / "manifest.json"
+
+
+# ------------------------------------------------------
+# 📖 Serving
+# ------------------------------------------------------
+def load_manifest(reload: bool = False) -> Dict[str, Any]:
+    """The clip manifest (read once, then kept in memory); empty if nothing was rendered yet."""
+    global _manifest
+    with _lock:
+        if _manifest is None or reload:
+            try:
+                _manifest = json.loads(_manifest_path().read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                _manifest = {"clips": {}}
+            except (OSError, ValueError) as e:
+                logger.warning("⚠️ Unreadable clip manifest %s: %s", _manifest_path(), e)
+                _manifest = {"clips": {}}
+            _audio_cache.clear()
+        return _manifest
+
+
+def _audio_base64(file: str) -> Optional[str]:
+    with _lock:
+        if file in _audio_cache:
+            return _audio_cache[file]
+    try:
+        data = (Path(PRERENDER_DIR) / file).read_bytes()
+    except OSError:
+        return None
+    encoded = base64.b64encode(data).decode("utf-8")
+    with _lock:
+        _audio_cache[file] = encoded
+    return encoded
+
+
+def _lookup(line: str, presenter: str, profile: str) -> Optional[Dict[str, Any]]:
+    entry = load_manifest()["clips"].get(presenter, {}).get(line)
+    if not entry or entry.get("script") != script_hash(FIXED_LINES[line]):
+        return None
+    audio = (entry.get("audio") or {}).get(profile)
+    if not audio:
+        return None
+    return {
+        "text": FIXED_LINES[line],
+        "audio_file": audio["file"],
+        "audio_url": audio.get("audio_url"),
+        "audio_profile": profile,
+        "audio_mime": AUDIO_PROFILES[profile]["mime"],
+        "video_url": entry.get("video_url"),
+    }
+
+
+def fixed_clip(line: str, presenter: str, profile: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """A fixed line's pre-rendered clip for this presenter and profile, or None (render it live)."""
+    clip = _lookup(line, presenter, resolve_profile(profile))
+    if clip is None:
+        PRERENDERED_CLIPS.inc(line=line, outcome="missing")
+        return None
+    clip["audio_base64"] = _audio_base64(clip.pop("audio_file"))
+    PRERENDERED_CLIPS.inc(line=line, outcome="hit")
+    return clip
+
+
+def presenter_clips(presenter: str, profile: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Every rendered fixed line for a presenter, as URLs only (for clients to prefetch)."""
+    profile = resolve_profile(profile)
+    clips = {}
+    for line in FIXED_LINES:
+        clip = _lookup(line, presenter, profile)
+        if clip:
+            clip.pop("audio_file")
+            clips[line] = clip
+    return clips
+
+
+# ------------------------------------------------------
+# 🎞️ Rendering
+# ------------------------------------------------------
+def _persist_video(url: str, presenter: str, line: str) -> Optional[str]:
+    """Copy a rendered D-ID video into storage; its public URL, or None on failure."""
+    try:
+        resp = requests.get(url, timeout=60)
+        resp.raise_for_status()
+        path = f"prerendered/{presenter}/{line}-{uuid.uuid4().hex[:8]}.mp4"
+        supabase.storage.from_(PRERENDER_BUCKET).upload(path, resp.content)
+    except Exception as e:
+        logger.warning("⚠️ Could not store pre-rendered video %s/%s: %s", presenter, line, e)
+        return None
+    return f"{SUPABASE_URL}/storage/v1/object/public/{PRERENDER_BUCKET}/{path}"
+
+
+def render_clip(line: str, presenter: str, profiles: Iterable[str], video: bool = PRERENDER_VIDEO,
+                previous: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Render one line for one presenter; the manifest entry, or None if no audio could be made."""
+    text = FIXED_LINES[line]
+    folder = Path(PRERENDER_DIR) / presenter
+    folder.mkdir(parents=True, exist_ok=True)
+    entry = {"script": script_hash(text), "audio": {}, "video_url": None, "rendered_at": int(time.time())}
+    if previous and previous.get("script") == entry["script"]:
+        entry["audio"], entry["video_url"] = dict(previous.get("audio") or {}), previous.get("video_url")
+
+    for profile in profiles:
+        if profile in entry["audio"]:
+            continue
+        result = speak_text(text, voice_name=presenter, profile=profile)
+        if result.get("audio_profile") != profile or not result.get("audio_base64"):
+            logger.warning("⚠️ No %s audio for %s/%s", profile, presenter, line)
+            continue
+        file = f"{presenter}/{line}.{profile}.{AUDIO_PROFILES[profile]['extension']}"
+        (Path(PRERENDER_DIR) / file).write_bytes(base64.b64decode(result["audio_base64"]))
+        entry["audio"][profile] = {"file": file, "audio_url": result.get("audio_url")}
+
+    if video and not entry["video_url"]:
+        avatar = PRESENTER_MAP[presenter]
+        url = generate_avatar_video(text, avatar["image"], avatar["voice"])
+        if url and url.startswith("http"):
+            entry["video_url"] = _persist_video(url, presenter, line)
+    return entry if entry["audio"] else None
+
+
+def _write_manifest(manifest: Dict[str, Any]):
+    path = _manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def prerender_clips(presenters: Optional[List[str]] = None, profiles: Optional[List[str]] = None,
+                    lines: Optional[List[str]] = None, force: bool = False,
+                    video: bool = PRERENDER_VIDEO) -> Dict[str, int]:
+    """Render every missing / outdated (presenter, line) clip and update the manifest."""
+    profiles = [p for p in (profiles or PRERENDER_PROFILES) if p in AUDIO_PROFILES] or [resolve_profile()]
+    manifest = json.loads(json.dumps(load_manifest(reload=True)))
+    manifest["lines"] = dict(FIXED_LINES)
+    clips = manifest.setdefault("clips", {})
+    summary = {"rendered": 0, "kept": 0, "failed": 0}
+
+    todo = []
+    for presenter in presenters or list(PRESENTER_MAP):
+        for line in lines or list(FIXED_LINES):
+            current = None if force else clips.get(presenter, {}).get(line)
+            complete = (current and current.get("script") == script_hash(FIXED_LINES[line])
+                        and all(p in (current.get("audio") or {}) for p in profiles)
+                        and (current.get("video_url") or not video))
+            if complete:
+                summary["kept"] += 1
+            else:
+                todo.append((presenter, line, current))
+
+    write_lock = threading.Lock()
+
+    def render(job):
+        presenter, line, current = job
+        try:
+            entry = render_clip(line, presenter, profiles, video, current)
+        except Exception as e:
+            logger.error("❌ Pre-rendering %s/%s failed: %s", presenter, line, e)
+            entry = None
+        with write_lock:
+            if entry is None:
+                summary["failed"] += 1
+                return
+            clips.setdefault(presenter, {})[line] = entry
+            summary["rendered"] += 1
+            _write_manifest(manifest)          # after every clip, so an interrupted job keeps its work
+            logger.info("🎞️ Pre-rendered %s/%s (%s)", presenter, line, ", ".join(entry["audio"]))
+
+    with ThreadPoolExecutor(RENDER_WORKERS, thread_name_prefix="prerender") as pool:
+        list(pool.map(render, todo))
+    if not todo:
+        _write_manifest(manifest)
+    load_manifest(reload=True)
+    logger.info("🎞️ Fixed-line clips: %s", summary)
+    return summary
+
+
+def start_prerender():
+    """Render missing clips in a background thread at API startup (no-op unless PRERENDER_ON_STARTUP)."""
+    if PRERENDER_ON_STARTUP:
+        threading.Thread(target=prerender_clips, name="prerender", daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--presenter", action="append", choices=list(PRESENTER_MAP))
+    parser.add_argument("--profile", action="append", choices=list(AUDIO_PROFILES))
+    parser.add_argument("--line", action="append", choices=list(FIXED_LINES))
+    parser.add_argument("--force", action="store_true", help="re-render clips that are already up to date")
+    parser.add_argument("--no-video", action="store_true", help="audio only, skip the D-ID renders")
+    args = parser.parse_args()
+    summary = prerender_clips(args.presenter, args.profile, args.line, args.force,
+                              video=PRERENDER_VIDEO and not args.no_video)
+    raise SystemExit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+# backend/ml/profiling.py
+"""
+Opt-in diagnostics for a running worker (off unless PROFILING_ENABLED / TRACEMALLOC_ENABLED).
+
+🔬 Per-request sampling profiler
+    Send `X-Profile: 1` (or `?profile=1`) to /api/interview/answer, /api/interview/stop or
+    /api/resume/upload, plus `X-Profile-Token: <PROFILING_TOKEN>`. While that request
+    runs, a sampler thread records the Python stack of every thread working on it, every
+    PROFILING_INTERVAL_MS:
+      - wall profile: one count per thread per sample (where the request spent time, including waiting),
+      - CPU profile : each sample weighted by the thread CPU time used since the previous one
+                      (pthread_getcpuclockid; Unix only).
+    Profiles are stored as collapsed stacks ("a;b;c 12", for flamegraph.pl / speedscope) under
+    PROFILING_DIR and listed by GET /api/debug/profiles. The response carries X-Profile-Id.
+
+    The serving (event loop) thread is always sampled. Blocking work handed to a worker thread
+    is sampled while it runs when the callable is wrapped in profiled() and started in a copy of
+    the request's context (the API's turn / decode pools, the STT and LLM hedge pools do this).
+    While such workers run, the loop's idle waits in the selector are left out. Other requests
+    served on the same loop can still show up; profile on a quiet worker.
+
+🧠 tracemalloc snapshots
+    With TRACEMALLOC_ENABLED a background thread snapshots the heap every
+    TRACEMALLOC_INTERVAL_SECONDS. GET /api/debug/memory shows the top allocation sites and the
+    growth since the first snapshot; snapshots can be downloaded for offline comparison.
+
+Every trigger and /api/debug/* endpoint requires PROFILING_TOKEN; without one they are refused.
+"""
+import asyncio
+import contextvars
+import functools
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from .config import (
+    PROFILING_ENABLED,
+    PROFILING_TOKEN,
+    PROFILING_INTERVAL_MS,
+    PROFILING_DIR,
+    PROFILING_MAX_STORED,
+    PROFILING_PATHS,
+    TRACEMALLOC_ENABLED,
+    TRACEMALLOC_FRAMES,
+    TRACEMALLOC_INTERVAL_SECONDS,
+    TRACEMALLOC_KEEP,
+)
+from .logs import get_logger
+
+logger = get_logger(__name__)
+
+MAX_STACK_DEPTH = 64
+_LINE_RE = re.compile(r":\d+\)$")
+
+
+def check_token(token: Optional[str]) -> bool:
+    """Diagnostics endpoints and the profile trigger require PROFILING_TOKEN (refused while it is unset)."""
+    return bool(PROFILING_TOKEN) and hmac.compare_digest(token or "", PROFILING_TOKEN)
+
+
+if (PROFILING_ENABLED or TRACEMALLOC_ENABLED) and not PROFILING_TOKEN:
+    logger.warning("⚠️ Diagnostics are enabled but PROFILING_TOKEN is not set; "
+                   "profile triggers and /api/debug/* are refused")
+
+
+def _storage_dir() -> Path:
+    path = Path(PROFILING_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+# ------------------------------------------------------
+# 🔬 Sampling profiler
+# ------------------------------------------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _collapse(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _thread_cpu_clock(thread_ident: int):
+    """Return a callable reading the thread's CPU time in seconds, or None where unsupported."""
+    try:
+        clock_id = time.pthread_getcpuclockid(thread_ident)
+        time.clock_gettime(clock_id)
+    except (AttributeError, OSError):
+        return None
+    return lambda: time.clock_gettime(clock_id)
+
+
+def _idle_in_selector(frame) -> bool:
+    """The event loop is parked in its selector (waiting for I/O or a worker thread)."""
+    return os.path.basename(frame.f_code.co_filename) == "selectors.py"
+
+
+class SamplingProfiler:
+    """
+    Samples the serving thread's stack, plus any worker thread attach()ed to the request, from a
+    helper thread until stop() is called.
+    """
+
+    def __init__(self, thread_ident: int, interval: float = PROFILING_INTERVAL_MS / 1000.0):
+        self.thread_ident = thread_ident
+        self.interval = interval
+        self.wall: Counter = Counter()
+        self.cpu: Counter = Counter()        # stack -> CPU microseconds
+        self.samples = 0
+        self.cpu_supported = False
+        self._workers: Dict[int, int] = {}   # worker thread ident -> nested attach() count
+        self._workers_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self.started = self.duration = None
+
+    @contextmanager
+    def attach(self):
+        """Sample the calling (worker) thread as part of this request until the block exits."""
+        ident = threading.get_ident()
+        with self._workers_lock:
+            self._workers[ident] = self._workers.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            with self._workers_lock:
+                self._workers[ident] -= 1
+                if not self._workers[ident]:
+                    del self._workers[ident]
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _cpu_used(self, clocks: Dict[int, Any], ident: int) -> int:
+        """CPU microseconds the thread used since it was last sampled (0 on its first sample)."""
+        if ident not in clocks:
+            clock = _thread_cpu_clock(ident)
+            clocks[ident] = [clock, clock() if clock else 0.0]
+            return 0
+        clock, last = clocks[ident]
+        if clock is None:
+            return 0
+        try:
+            now = clock()
+        except OSError:           # the thread exited between listing and reading
+            return 0
+        clocks[ident][1] = now
+        return int((now - last) * 1e6)
+
+    def _run(self):
+        clocks: Dict[int, Any] = {}          # thread ident -> [cpu clock, last reading]
+        self._cpu_used(clocks, self.thread_ident)
+        self.cpu_supported = clocks[self.thread_ident][0] is not None
+        while not self._stop.wait(self.interval):
+            with self._workers_lock:
+                workers = [ident for ident in self._workers if ident != self.thread_ident]
+            frames = sys._current_frames()
+            for ident in [self.thread_ident, *workers]:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                used = self._cpu_used(clocks, ident)
+                if ident == self.thread_ident and workers and _idle_in_selector(frame):
+                    continue      # the loop is just waiting for this request's workers
+                stack = _collapse(frame)
+                self.wall[stack] += 1
+                self.samples += 1
+                if used > 0:
+                    self.cpu[stack] += used
+            for ident in [i for i in clocks if i != self.thread_ident and i not in workers]:
+                del clocks[ident]     # re-baselined if the thread is attached again
+
+
+_request_profiler: contextvars.ContextVar[Optional[SamplingProfiler]] = contextvars.ContextVar(
+    "request_profiler", default=None)
+
+
+def profiled(fn):
+    """
+    Wrap a callable handed to a worker thread so the current request's profiler (if any) samples
+    that thread while it runs. The worker must run in a copy of the request's context.
+    """
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        profiler = _request_profiler.get()
+        if profiler is None:
+            return fn(*args, **kwargs)
+        with profiler.attach():
+            return fn(*args, **kwargs)
+    return run
+
+
+_profiles: "deque[Dict[str, Any]]" = deque()
+_profiles_lock = threading.Lock()
+
+
+def _top_functions(stacks: Counter, limit: int = 15) -> List[Dict[str, Any]]:
+    """Self and inclusive share per function (line numbers folded), sorted by self share."""
+    own, total = Counter(), Counter()
+    for stack, weight in stacks.items():
+        frames = [_LINE_RE.sub(")", label) for label in stack.split(";")]
+        own[frames[-1]] += weight
+        for label in set(frames):
+            total[label] += weight
+    grand = sum(stacks.values()) or 1
+    ranked = sorted(total, key=lambda label: (own[label], total[label]), reverse=True)[:limit]
+    return [
+        {"function": label, "self": round(own[label] / grand, 4), "total": round(total[label] / grand, 4)}
+        for label in ranked
+    ]
+
+
+def finish_profile(profiler: SamplingProfiler, method: str, path: str, status: int) -> Dict[str, Any]:
+    """Stop the sampler and save its profile (blocking: joins a thread and writes files)."""
+    profiler.stop()
+    return save_profile(profiler, method, path, status)
+
+
+def save_profile(profiler: SamplingProfiler, method: str, path: str, status: int) -> Dict[str, Any]:
+    """Persist the collapsed stacks and keep an index entry (oldest profiles are evicted)."""
+    profile_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:8]
+    directory = _storage_dir()
+    for kind, stacks in (("wall", profiler.wall), ("cpu", profiler.cpu)):
+        if stacks:
+            with open(directory / f"{profile_id}.{kind}.folded", "w", encoding="utf-8") as f:
+                f.writelines(f"{stack} {weight}\n" for stack, weight in stacks.most_common())
+
+    entry = {
+        "profile_id": profile_id,
+        "request": f"{method} {path}",
+        "status": status,
+        "created_at": time.time(),
+        "duration_ms": round(profiler.duration * 1000, 2),
+        "samples": profiler.samples,
+        "interval_ms": profiler.interval * 1000,
+        "cpu_ms": round(sum(profiler.cpu.values()) / 1000, 2) if profiler.cpu_supported else None,
+        "kinds": [k for k, s in (("wall", profiler.wall), ("cpu", profiler.cpu)) if s],
+        "top_wall": _top_functions(profiler.wall),
+        "top_cpu": _top_functions(profiler.cpu) if profiler.cpu else [],
+    }
+    with open(directory / f"{profile_id}.json", "w", encoding="utf-8") as f:
+        json.dump(entry, f, indent=2)
+
+    with _profiles_lock:
+        _profiles.append(entry)
+        evicted = [_profiles.popleft() for _ in range(max(0, len(_profiles) - PROFILING_MAX_STORED))]
+    for old in evicted:
+        for suffix in (".json", ".wall.folded", ".cpu.folded"):
+            (directory / f"{old['profile_id']}{suffix}").unlink(missing_ok=True)
+
+    logger.info("🔬 Profile %s stored: %s %.0fms, %d samples", profile_id, entry["request"],
+                entry["duration_ms"], entry["samples"])
+    return entry
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    with _profiles_lock:
+        return [{k: v for k, v in p.items() if not k.startswith("top_")} for p in reversed(_profiles)]
+
+
+def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    with _profiles_lock:
+        return next((dict(p) for p in _profiles if p["profile_id"] == profile_id), None)
+
+
+def profile_file(profile_id: str, kind: str) -> Optional[Path]:
+    if kind not in ("wall", "cpu") or get_profile(profile_id) is None:
+        return None
+    path = _storage_dir() / f"{profile_id}.{kind}.folded"
+    return path if path.exists() else None
+
+
+class ProfilingMiddleware:
+    """Profiles requests that opt in via X-Profile / ?profile=1 (only when PROFILING_ENABLED)."""
+
+    def __init__(self, app, paths=PROFILING_PATHS):
+        self.app = app
+        self.paths = set(paths)
+
+    @staticmethod
+    def _requested(scope) -> bool:
+        headers = dict(scope.get("headers") or ())
+        query = parse_qs((scope.get("query_string") or b"").decode("latin-1"))
+        flag = headers.get(b"x-profile", b"").decode("latin-1") or (query.get("profile") or [""])[0]
+        if flag.lower() not in ("1", "true", "yes"):
+            return False
+        token = headers.get(b"x-profile-token", b"").decode("latin-1") or None
+        if not check_token(token):
+            logger.warning("⚠️ Profile requested with a missing or wrong X-Profile-Token; ignored")
+            return False
+        return True
+
+    async def __call__(self, scope, receive, send):
+        if (not PROFILING_ENABLED or scope["type"] != "http"
+                or scope.get("path") not in self.paths or not self._requested(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = {"entry": None}
+        status = {"code": 500}
+        profiler = SamplingProfiler(threading.get_ident()).start()
+        context_token = _request_profiler.set(profiler)
+        loop = asyncio.get_running_loop()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                # The body is sent right after this; finish the profile so its id can go in a header.
+                profile_id["entry"] = await loop.run_in_executor(
+                    None, finish_profile, profiler, scope.get("method", ""), scope["path"], status["code"])
+                message["headers"] = list(message.get("headers") or []) + [
+                    (b"x-profile-id", profile_id["entry"]["profile_id"].encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_profiler.reset(context_token)
+            if profile_id["entry"] is None:
+                await loop.run_in_executor(
+                    None, finish_profile, profiler, scope.get("method", ""), scope["path"], status["code"])
+
+
+# ------------------------------------------------------
+# 🧠 tracemalloc snapshots
+# ------------------------------------------------------
+_snapshots: "deque[Dict[str, Any]]" = deque(maxlen=TRACEMALLOC_KEEP)
+_baseline: Optional[Dict[str, Any]] = None
+_snapshot_lock = threading.Lock()
+_snapshot_thread: Optional[threading.Thread] = None
+
+
+def take_snapshot() -> Dict[str, Any]:
+    """Snapshot the heap now (starts tracemalloc if needed); the first one becomes the baseline."""
+    global _baseline
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    entry = {
+        "snapshot_id": time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6],
+        "taken_at": time.time(),
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "snapshot": snapshot,
+    }
+    with _snapshot_lock:
+        if _baseline is None:
+            _baseline = entry
+        _snapshots.append(entry)
+    return entry
+
+
+def _stat_rows(stats, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+    for stat in stats[:limit]:
+        frame = stat.traceback[0]
+        row = {"site": f"{frame.filename}:{frame.lineno}", "size_bytes": stat.size, "count": stat.count}
+        if hasattr(stat, "size_diff"):
+            row.update(size_diff_bytes=stat.size_diff, count_diff=stat.count_diff)
+        rows.append(row)
+    return rows
+
+
+def memory_report(limit: int = 20, fresh: bool = False) -> Dict[str, Any]:
+    """Top allocation sites in the latest snapshot and growth since the baseline snapshot."""
+    if fresh or not _snapshots:
+        take_snapshot()
+    with _snapshot_lock:
+        latest, baseline = _snapshots[-1], _baseline
+        available = [s["snapshot_id"] for s in _snapshots]
+    report = {
+        "snapshot_id": latest["snapshot_id"],
+        "taken_at": latest["taken_at"],
+        "traced_bytes": latest["traced_bytes"],
+        "peak_bytes": latest["peak_bytes"],
+        "top": _stat_rows(latest["snapshot"].statistics("lineno"), limit),
+        "snapshots": available,
+    }
+    if baseline is not None and baseline is not latest:
+        report["baseline_id"] = baseline["snapshot_id"]
+        report["growth_since_baseline"] = _stat_rows(
+            latest["snapshot"].compare_to(baseline["snapshot"], "lineno"), limit)
+    return report
+
+
+def dump_snapshot(snapshot_id: str) -> Optional[Path]:
+    """Write a kept snapshot to PROFILING_DIR (loadable with tracemalloc.Snapshot.load)."""
+    with _snapshot_lock:
+        entry = next((s for s in list(_snapshots) + [_baseline] if s and s["snapshot_id"] == snapshot_id), None)
+    if entry is None:
+        return None
+    path = _storage_dir() / f"{snapshot_id}.tracemalloc"
+    if not path.exists():
+        entry["snapshot"].dump(str(path))
+    return path
+
+
+def _snapshot_loop():
+    while True:
+        try:
+            entry = take_snapshot()
+            logger.info("🧠 tracemalloc snapshot %s: %.1f MB traced (peak %.1f MB)", entry["snapshot_id"],
+                        entry["traced_bytes"] / 1e6, entry["peak_bytes"] / 1e6)
+        except Exception as e:
+            logger.warning("⚠️ tracemalloc snapshot failed: %s", e)
+        time.sleep(TRACEMALLOC_INTERVAL_SECONDS)
+
+
+def start_memory_snapshots():
+    """Start tracemalloc and the periodic snapshot thread once (no-op unless TRACEMALLOC_ENABLED)."""
+    global _snapshot_thread
+    if not TRACEMALLOC_ENABLED or _snapshot_thread is not None:
+        return
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    _snapshot_thread = threading.Thread(target=_snapshot_loop, name="tracemalloc-snapshots", daemon=True)
+    _snapshot_thread.start()
@@ -1,19 +1,85 @@
 
 
 # backend/ml/question_generator.py
-from .config import GEMINI_API_KEY, GEMINI_MODEL
-import google.generativeai as genai
 import json
+import re
 
-# Initialize Gemini client
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel(GEMINI_MODEL)
+from .resume_digest import get_resume_digest
+from .conversation_memory import render_memory
+from .context_cache import get_context_cache
+from .llm_gateway import generate_text
 
-def generate_question(resume_data, previous_answer=None, difficulty="easy", first_question=False):
+
+def _interviewer_prefix(resume_summary, difficulty):
+    """Static part of the follow-up prompt: identical for every turn of a session."""
+    return f"""
+        You are a professional interviewer conducting a {difficulty}-level interview.
+
+        Candidate's resume digest (for reference):
+        {resume_summary}
+
+        For every turn you will get the conversation so far and the candidate's previous answer.
+        Based on those:
+        - If the answer mentions a specific project or skill, ask a deeper question *only* about that topic.
+        - If not, continue with a general follow-up (like motivation, teamwork, or learning challenges).
+        - Keep your question relevant, natural, and conversational.
+        - Avoid repeating topics already covered.
+        """
+
+
+AUDIO_TURN_INSTRUCTIONS = """
+        Now do two things with the attached recording of the candidate answering "{question}":
+        1. Transcribe the answer verbatim (plain text, no timestamps or speaker labels; "" if nothing was said).
+        2. Ask the next best interview question, following the rules above.
+
+        Return ONLY valid JSON like:
+        {{"transcript": "...", "next_question": "..."}}
+        """
+
+
+def generate_question_from_audio(resume_data, audio_wav, current_question, difficulty="easy", session_id=None):
+    """
+    One multimodal call instead of STT + generate_question: the answer audio goes to the
+    "audio_turn" model with the interviewer prompt, which returns the transcript and the next question.
+    Raises (ValueError on malformed output) so the caller can fall back to the two-step path.
     """
-    Generates the next interview question using Gemini API.
+    resume_summary = get_resume_digest(session_id, resume_data)
+    memory = render_memory(session_id) or "This is the first follow-up question."
+    prefix = _interviewer_prefix(resume_summary, difficulty)
+    turn = [
+        f"""
+        Conversation so far:
+        {memory}
+        """ + AUDIO_TURN_INSTRUCTIONS.format(question=current_question),
+        {"mime_type": "audio/wav", "data": audio_wav},
+    ]
+
+    cache_key = f"audio_turn:{session_id}" if session_id else None
+    text = generate_text("audio_turn", turn, prefix=prefix, cache_key=cache_key, retries=0,
+                         generation_config={"response_mime_type": "application/json"})
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    parsed = json.loads(match.group()) if match else None
+    if not isinstance(parsed, dict) or not str(parsed.get("next_question", "")).strip():
+        raise ValueError(f"Malformed audio turn response: {text[:200]!r}")
+    return {
+        "transcript": str(parsed.get("transcript") or "").strip(),
+        "next_question": str(parsed["next_question"]).strip(),
+    }
+
+
+def release_session_context(session_id):
+    """Drop the session's cached interviewer prefixes (called when the interview ends)."""
+    get_context_cache().release(f"question:{session_id}")
+    get_context_cache().release(f"audio_turn:{session_id}")
+
+
+def generate_question(resume_data, previous_answer=None, difficulty="easy", first_question=False, session_id=None):
+    """
+    Generates the next interview question using Gemini (through the LLM gateway).
+    The resume goes in as a compact digest, built once per session_id and cached;
+    the session's bounded conversation memory tells the model what was already covered.
+    With CONTEXT_CACHE_MODE on, the static interviewer prefix is registered once per session.
     """
-    resume_summary = json.dumps(resume_data, indent=2)
 
     # --- Case 1: Start of interview ---
     if first_question:
@@ -23,27 +89,21 @@ def generate_question(resume_data, previous_answer=None, difficulty="easy", firs
         Ask something like "Tell me about yourself" or "Can you walk me through your projects?"
         Don't directly jump into resume details yet.
         """
-    
-    # --- Case 2: After candidate's first response ---
-    else:
-        prompt = f"""
-        You are a professional interviewer conducting a {difficulty}-level interview.
+        return generate_text("question", prompt)
 
-        Candidate's resume (for reference):
-        {resume_summary}
+    # --- Case 2: After candidate's first response ---
+    resume_summary = get_resume_digest(session_id, resume_data)
+    memory = render_memory(session_id) or "This is the first follow-up question."
+    prefix = _interviewer_prefix(resume_summary, difficulty)
+    turn = f"""
+        Conversation so far:
+        {memory}
 
         Candidate's previous answer:
         "{previous_answer or 'N/A'}"
 
-        Based on the above:
-        - If the answer mentions a specific project or skill, ask a deeper question *only* about that topic.
-        - If not, continue with a general follow-up (like motivation, teamwork, or learning challenges).
-        - Keep your question relevant, natural, and conversational.
-        - Avoid repeating topics already discussed.
-
         Now ask the next best interview question.
         """
 
-    response = model.generate_content(prompt)
-    return response.text.strip()
-
+    cache_key = f"question:{session_id}" if session_id else None
+    return generate_text("question", turn, prefix=prefix, cache_key=cache_key)
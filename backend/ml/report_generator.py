@@ -1,11 +1,10 @@
-import google.generativeai as genai
-import os
 from typing import Dict, Optional
 import json
 import re
+from .llm_gateway import generate_text
+from .logs import get_logger
 
-# ✅ Load Gemini API key from environment
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+logger = get_logger(__name__)
 
 def generate_technical_feedback(score: int, per_question: list, role: Optional[str] = None) -> str:
     """
@@ -23,16 +22,14 @@ def generate_technical_feedback(score: int, per_question: list, role: Optional[s
         Keep it specific and actionable, avoid generic lines.
         """
 
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        response = model.generate_content(prompt)
-        feedback = response.text.strip()
+        feedback = generate_text("report_feedback", prompt)
 
         if not feedback:
             raise ValueError("Empty Gemini response.")
         return feedback
 
     except Exception as e:
-        print(f"⚠️ Gemini feedback generation failed: {e}")
+        logger.warning("⚠️ Gemini feedback generation failed: %s", e)
         # Fallback to your original rule-based system
         if score >= 85:
             return "Excellent technical understanding. Focus more on communicating trade-offs."
@@ -58,9 +55,7 @@ def generate_recommendations_dynamic(evaluation: dict, role: str):
             "long_term": ["..."]
         }}
         """
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = generate_text("recommendations", prompt)
 
         match = re.search(r"\{.*\}", text, re.DOTALL)
         if match:
@@ -79,7 +74,7 @@ def generate_recommendations_dynamic(evaluation: dict, role: str):
         }
 
     except Exception as e:
-        print("⚠️ Gemini recommendation generation failed:", e)
+        logger.warning("⚠️ Gemini recommendation generation failed: %s", e)
         return {
             "short_term": ["Review key concepts regularly."],
             "long_term": ["Build a project relevant to your target job role."]
@@ -0,0 +1,131 @@
+# backend/ml/resume_digest.py
+"""
+Compact, token-budgeted resume digest for question prompts.
+
+Instead of pasting `json.dumps(resume_data, indent=2)` (raw_text, every section, ...) into
+every Gemini prompt, we build a short digest once per session:
+
+    Experience: ~6 years
+    Recent roles: Data Scientist @ Fractal Analytics (2021-01 – 2026-10); ...
+    Projects: Resume Screener; Stock Sentiment Tracker
+    Skills: python, sql, nlp, ...
+
+and cache it by session_id.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from .config import RESUME_DIGEST_TOKEN_BUDGET
+
+MAX_CACHED_SESSIONS = 512
+MAX_ROLES = 3
+MAX_PROJECTS = 5
+MAX_SKILLS = 12
+
+_digest_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+_digest_stats = {"hits": 0, "misses": 0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def _recent_roles(structure: Dict[str, Any]) -> List[str]:
+    roles = []
+    experience = [d for d in structure.get("dates", []) if d.get("section") == "experience"]
+    for d in sorted(experience, key=lambda d: d.get("end", ""), reverse=True)[:MAX_ROLES]:
+        who = " @ ".join(p for p in (d.get("role"), d.get("employer")) if p)
+        if who:
+            roles.append(f"{who} ({d['start']} – {d['end']})")
+    return roles
+
+
+def _fallback_text(resume_data: Dict[str, Any], key: str, limit: int) -> str:
+    """Older resume_data without `structure`: use a trimmed slice of the section text."""
+    text = (resume_data.get("sections") or {}).get(key) or ""
+    return text[:limit].rsplit(" ", 1)[0] if len(text) > limit else text
+
+
+def build_resume_digest(resume_data: Dict[str, Any], token_budget: int = RESUME_DIGEST_TOKEN_BUDGET) -> str:
+    """Build the digest, dropping the lowest-priority items until it fits `token_budget`."""
+    if not resume_data:
+        return "No resume provided."
+
+    structure = resume_data.get("structure") or {}
+    skills = list(resume_data.get("skills") or [])[:MAX_SKILLS]
+    projects = list(structure.get("projects") or [])[:MAX_PROJECTS]
+    roles = _recent_roles(structure)
+
+    years = round(structure.get("experience_months", 0) / 12, 1)
+    headline = f"Experience: ~{years:g} years" if years else ""
+
+    if not structure:
+        roles = [r for r in [_fallback_text(resume_data, "experience", 300)] if r]
+        projects = [p for p in [_fallback_text(resume_data, "projects", 300)] if p]
+
+    def render() -> str:
+        lines = [headline] if headline else []
+        if roles:
+            lines.append("Recent roles: " + "; ".join(roles))
+        if projects:
+            lines.append("Projects: " + "; ".join(projects))
+        if skills:
+            lines.append("Skills: " + ", ".join(skills))
+        return "\n".join(lines) or "No resume details available."
+
+    digest = render()
+    # Trim from the least useful end: extra skills, older projects, older roles.
+    while estimate_tokens(digest) > token_budget and (skills or projects or roles):
+        if len(skills) > 3:
+            skills.pop()
+        elif len(projects) > 1:
+            projects.pop()
+        elif len(roles) > 1:
+            roles.pop()
+        elif skills:
+            skills.pop()
+        elif projects:
+            projects.pop()
+        else:
+            roles.pop()
+        digest = render()
+
+    if estimate_tokens(digest) > token_budget:
+        digest = digest[: token_budget * 4]
+    return digest
+
+
+def get_resume_digest(session_id: Optional[str], resume_data: Dict[str, Any]) -> str:
+    """Return the cached digest for this session, building it on first use."""
+    if not session_id:
+        return build_resume_digest(resume_data)
+
+    with _cache_lock:
+        digest = _digest_cache.get(session_id)
+        if digest is not None:
+            _digest_cache.move_to_end(session_id)
+            _digest_stats["hits"] += 1
+            return digest
+        _digest_stats["misses"] += 1
+
+    digest = build_resume_digest(resume_data)
+    with _cache_lock:
+        _digest_cache[session_id] = digest
+        while len(_digest_cache) > MAX_CACHED_SESSIONS:
+            _digest_cache.popitem(last=False)
+    return digest
+
+
+def clear_resume_digest(session_id: str):
+    """Drop a session's digest (called when the interview ends)."""
+    with _cache_lock:
+        _digest_cache.pop(session_id, None)
+
+
+def get_digest_stats() -> Dict[str, int]:
+    """Digest cache hits / misses and current size."""
+    with _cache_lock:
+        return {**_digest_stats, "size": len(_digest_cache)}
@@ -2,11 +2,14 @@ from fastapi import APIRouter, UploadFile, File
 import spacy
 import PyPDF2
 import docx2txt
-import re
 import json
 from .supabase_config import save_resume   # ✅ Supabase saving
+from .resume_sections import SECTION_NAMES, segment_resume, section_text
+from .logs import get_logger
 from datetime import datetime
 
+logger = get_logger(__name__)
+
 # Use APIRouter instead of creating a new FastAPI() instance
 router = APIRouter(prefix="/api/resume", tags=["Resume Parser"])
 
@@ -19,14 +22,6 @@ SKILL_KEYWORDS = [
     "nlp", "excel", "aws", "tensorflow", "keras", "pandas", "numpy"
 ]
 
-# Regex patterns for section headers
-SECTION_PATTERNS = {
-    "experience": re.compile(r"(experience|work history|professional experience)", re.I),
-    "education": re.compile(r"(education|academic background|qualifications)", re.I),
-    "projects": re.compile(r"(projects|research experience|portfolio)", re.I),
-    "skills": re.compile(r"(skills|technical skills|expertise)", re.I),
-}
-
 
 # ------------------------------------------------------
 # 📄 Helper Functions
@@ -49,26 +44,10 @@ def extract_skills(text: str):
     return list({skill for skill in SKILL_KEYWORDS if skill in text_lower})
 
 
-def extract_sections(text: str):
-    """Divide resume text into structured sections."""
-    sections = {key: [] for key in SECTION_PATTERNS.keys()}
-    lines = text.split("\n")
-    current_section = None
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        for section, pattern in SECTION_PATTERNS.items():
-            if pattern.search(line):
-                current_section = section
-                break
-
-        if current_section:
-            sections[current_section].append(line)
-
-    return {sec: " ".join(content) for sec, content in sections.items()}
+def extract_sections(text: str, structure: dict = None):
+    """Divide resume text into per-section strings (built from the single-pass segmenter)."""
+    structure = structure or segment_resume(text)
+    return {sec: section_text(structure, sec) for sec in SECTION_NAMES}
 
 
 # ------------------------------------------------------
@@ -80,12 +59,20 @@ async def upload_resume(file: UploadFile = File(...)):
     try:
         text = extract_text(file)
         skills = extract_skills(text)
-        sections = extract_sections(text)
+        structure = segment_resume(text)
+        sections = extract_sections(text, structure)
 
         parsed_resume = {
             "filename": file.filename,
             "skills": skills,
             "sections": sections,
+            "structure": {
+                "spans": structure["spans"],
+                "dates": structure["dates"],
+                "experience_months": structure["experience_months"],
+                "employers": structure["employers"],
+                "projects": structure["projects"],
+            },
             "raw_text": text[:500],  # short preview for debugging
             "uploaded_at": datetime.utcnow().isoformat(),
         }
@@ -98,7 +85,8 @@ async def upload_resume(file: UploadFile = File(...)):
         user_name = file.filename.split(".")[0].replace("_", " ").title()
         save_resume(user_name, parsed_resume)
 
-        print(f"✅ Resume uploaded and parsed for {user_name}")
+        logger.info("✅ Resume uploaded and parsed: %d skills, %d sections", len(skills),
+                    sum(1 for v in sections.values() if v))
         return {
             "status": "success",
             "message": "Resume parsed and saved to Supabase successfully.",
@@ -106,7 +94,7 @@ async def upload_resume(file: UploadFile = File(...)):
         }
 
     except Exception as e:
-        print(f"❌ Resume parsing error: {e}")
+        logger.exception("❌ Resume parsing error: %s", e)
         return {"status": "error", "message": str(e)}
 
 
@@ -0,0 +1,203 @@
+# backend/ml/resume_sections.py
+"""
+Single-pass resume segmenter.
+
+Walks the resume text once and, in the same scan:
+  - detects section headers with ONE combined, anchored pattern
+    (a line has to *be* a header, not merely contain the word "skills"),
+  - records per-section line spans over the non-empty lines,
+  - pulls out date ranges + durations, employers and project titles.
+
+Kept free of heavy imports (spaCy / Supabase) so it can be benchmarked on its own.
+"""
+import re
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+
+SECTION_NAMES = ("experience", "education", "projects", "skills")
+
+# ------------------------------------------------------
+# 🧭 Combined, anchored header pattern
+# ------------------------------------------------------
+# Group name == section name. Longer phrases come first inside each group so
+# "research experience" is a projects header, not an experience one.
+SECTION_HEADER_RE = re.compile(
+    r"^[\s#*•\-–]*(?:"
+    r"(?P<projects>research\s+experience|academic\s+projects|personal\s+projects|projects|portfolio)"
+    r"|(?P<experience>professional\s+experience|work\s+experience|work\s+history|employment(?:\s+history)?|internship(?:\s+experience)?|internships|experience)"
+    r"|(?P<education>academic\s+background|education|qualifications)"
+    r"|(?P<skills>technical\s+skills|core\s+skills|skills|expertise)"
+    r")\s*(?:[:\-–|]\s*(?P<rest>.*))?$",
+    re.I,
+)
+
+# ------------------------------------------------------
+# 📅 Date ranges (e.g. "Jan 2020 - Present", "06/2019 – 08/2021", "2018-2022")
+# ------------------------------------------------------
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)")
+_YEAR = r"(?:19|20)\d{2}"
+_POINT = rf"(?:\b{_MONTH}\.?\s+{_YEAR}|(?<![\d/])\d{{1,2}}/{_YEAR}|(?<![\d/]){_YEAR})(?!\d)"
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_POINT})\s*(?:-|–|—|\bto\b|\buntil\b)\s*"
+    rf"(?P<end>{_POINT}|\b(?:present|current|now|till\s+date|ongoing)\b)",
+    re.I,
+)
+
+# Cheap pre-check: a line without a plausible year can't hold a date range.
+_YEAR_RE = re.compile(rf"(?<!\d){_YEAR}(?!\d)")
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+
+_BULLET_RE = re.compile(r"^[•\-*–·▪●]\s*")
+_SPLIT_RE = re.compile(r"\s+(?:at|@)\s+|\s*[|,]\s*|\s+[-–—]\s+", re.I)
+
+ROLE_HINTS = ("engineer", "developer", "intern", "analyst", "manager", "scientist",
+              "lead", "consultant", "architect", "designer", "researcher", "assistant", "fellow")
+EMPLOYER_HINTS = ("inc", "ltd", "llc", "corp", "corporation", "company", "technologies",
+                  "solutions", "labs", "pvt", "systems", "group", "university", "institute",
+                  "services")
+
+
+# ------------------------------------------------------
+# 🔧 Helpers
+# ------------------------------------------------------
+def _parse_point(token: str, today: date) -> Optional[Tuple[int, int]]:
+    """Turn 'Jan 2020' / '06/2020' / '2020' / 'present' into (year, month)."""
+    token = token.strip().lower().rstrip(".")
+    if token in ("present", "current", "now", "ongoing") or token.startswith("till"):
+        return today.year, today.month
+    if "/" in token:
+        month, year = token.split("/")
+        return int(year), min(max(int(month), 1), 12)
+    parts = token.split()
+    if len(parts) == 2:
+        return int(parts[1]), _MONTHS.get(parts[0][:3], 1)
+    return int(token), 1
+
+
+def _months_between(start: Tuple[int, int], end: Tuple[int, int]) -> int:
+    return max((end[0] - start[0]) * 12 + (end[1] - start[1]), 0)
+
+
+def _split_role_employer(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split a 'Role, Company' / 'Company | Role' / 'Role at Company' line into (role, employer)."""
+    at_split = re.split(r"\s(?:at|@)\s", text, maxsplit=1, flags=re.I)
+    if len(at_split) == 2:
+        return at_split[0].strip(" ,|-–") or None, at_split[1].strip(" ,|-–") or None
+
+    parts = [p.strip() for p in _SPLIT_RE.split(text) if p and p.strip()]
+    if not parts:
+        return None, None
+    for i, part in enumerate(parts):
+        if any(w in EMPLOYER_HINTS for w in re.findall(r"[a-z]+", part.lower())):
+            others = parts[:i] + parts[i + 1:]
+            return (others[0] if others else None), part
+    if len(parts) > 1 and any(h in parts[0].lower() for h in ROLE_HINTS):
+        return parts[0], parts[1]
+    return (parts[1] if len(parts) > 1 else None), parts[0]
+
+
+def _project_title(line: str) -> Optional[str]:
+    """A project title is a short, non-sentence line; keep the part before ':' / '|' / ' - '."""
+    if _BULLET_RE.match(line) or line.endswith("."):
+        return None
+    title = re.split(r"\s*[:|]\s*|\s+[-–—]\s+", line, maxsplit=1)[0].strip()
+    if not title or len(title.split()) > 8:
+        return None
+    return title
+
+
+# ------------------------------------------------------
+# 🚀 Segmenter
+# ------------------------------------------------------
+def segment_resume(text: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Segment resume text in one pass.
+
+    Returns a compact structure:
+        {
+          "lines": [...non-empty stripped lines...],
+          "spans": {"experience": [[start, end], ...], ...},   # half-open indices into lines
+          "dates": [{"line": i, "section": s, "start": "2020-01", "end": "2022-06", "months": 29,
+                     "role": ..., "employer": ...}, ...],           # role/employer on experience dates only
+          "experience_months": 29,
+          "employers": [...],
+          "projects": [...],
+        }
+    """
+    today = today or date.today()
+    lines: List[str] = []
+    spans: Dict[str, List[List[int]]] = {name: [] for name in SECTION_NAMES}
+    dates: List[Dict[str, Any]] = []
+    employers: List[str] = []
+    projects: List[str] = []
+    experience_months = 0
+
+    current: Optional[str] = None
+    for raw in text.split("\n"):
+        line = raw.strip()
+        if not line:
+            continue
+
+        header = SECTION_HEADER_RE.match(line)
+        if header:
+            current = next(name for name in SECTION_NAMES if header.group(name))
+            spans[current].append([len(lines), len(lines)])
+            line = (header.group("rest") or "").strip()
+            if not line:
+                continue
+
+        idx = len(lines)
+        lines.append(line)
+        if current is None:
+            continue
+        spans[current][-1][1] = idx + 1
+
+        if current == "skills":
+            continue
+
+        match = DATE_RANGE_RE.search(line) if _YEAR_RE.search(line) else None
+        if match:
+            start = _parse_point(match.group("start"), today)
+            end = _parse_point(match.group("end"), today)
+            months = _months_between(start, end)
+            entry = {
+                "line": idx,
+                "section": current,
+                "start": f"{start[0]:04d}-{start[1]:02d}",
+                "end": f"{end[0]:04d}-{end[1]:02d}",
+                "months": months,
+            }
+            dates.append(entry)
+            if current == "experience":
+                experience_months += months
+                remainder = (line[:match.start()] + line[match.end():]).strip(" ,|-–—()")
+                role, employer = _split_role_employer(remainder) if remainder else (None, None)
+                entry["role"], entry["employer"] = role, employer
+                if employer and employer not in employers:
+                    employers.append(employer)
+                continue
+
+        if current == "projects":
+            title = _project_title(line[:match.start()].strip(" ,|-–—()") if match else line)
+            if title and title not in projects:
+                projects.append(title)
+
+    return {
+        "lines": lines,
+        "spans": {name: s for name, s in spans.items() if s},
+        "dates": dates,
+        "experience_months": experience_months,
+        "employers": employers,
+        "projects": projects,
+    }
+
+
+def section_text(structure: Dict[str, Any], section: str) -> str:
+    """Join the lines of one section back into a single string."""
+    lines = structure["lines"]
+    return " ".join(
+        line for start, end in structure["spans"].get(section, []) for line in lines[start:end]
+    )
@@ -1,19 +1,18 @@
-import google.generativeai as genai
 import json
 import re
-import os
 from dotenv import load_dotenv
+from .llm_gateway import generate_text
+from .logs import get_logger, preview
+
+logger = get_logger(__name__)
 
 # ✅ Load environment variables
 load_dotenv()
 
-# ✅ Configure Gemini API Key from .env
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 def generate_roadmap_dynamic(evaluation: dict, role: str = None) -> dict:
     """
     Generates a personalized roadmap for the user based on their evaluation results.
-    Uses Gemini 2.5 Flash model to identify strengths, weaknesses, and create an improvement plan.
+    Uses the gateway's "roadmap" model to identify strengths, weaknesses, and create an improvement plan.
     """
 
     role_line = f"Candidate role: {role}" if role else "The candidate's role was not specified."
@@ -51,10 +50,8 @@ Return ONLY valid JSON in this format:
 """
 
     try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        print("🔹 Raw Gemini Roadmap Output:", text)
+        text = generate_text("roadmap", prompt)
+        logger.debug("🔹 Raw Gemini Roadmap Output: %s", preview(text))
 
         # ✅ Try to extract JSON safely
         match = re.search(r"\{.*\}", text, re.DOTALL)
@@ -81,7 +78,7 @@ Return ONLY valid JSON in this format:
             }
 
     except Exception as e:
-        print("⚠️ Roadmap generation failed:", e)
+        logger.warning("⚠️ Roadmap generation failed: %s", e)
         # Final fallback in case of model or parsing error
         return {
             "focus_areas": ["Follow-up with mentor", "Project-based learning"],
@@ -35,8 +35,17 @@
 
 
 import speech_recognition as sr
-import tempfile
+from typing import Dict, Optional, Tuple
 from fastapi import UploadFile
+from .audio_decoding import DecodedAudio, decode_audio
+from .config import AUDIO_MAX_UPLOAD_BYTES, STT_SAMPLE_RATE, VAD_ENABLED
+from .logs import get_logger, preview
+from .stt_backends import STTUnavailable, transcribe
+from .tracing import span
+from .vad import TrimmedAudio, trim_silence
+from .chunked_stt import transcribe_chunked
+
+logger = get_logger(__name__)
 
 def listen_to_user():
     """🎤 Listens via microphone (CLI mode)."""
@@ -44,7 +53,7 @@ def listen_to_user():
     mic = sr.Microphone()
 
     with mic as source:
-        print("🎤 Listening... Speak now!")
+        logger.info("🎤 Listening... Speak now!")
         recognizer.adjust_for_ambient_noise(source, duration=1)
         recognizer.pause_threshold = 4
         recognizer.energy_threshold = 300
@@ -52,46 +61,73 @@ def listen_to_user():
 
         try:
             audio = recognizer.listen(source, timeout=None, phrase_time_limit=40)
-            print("⏳ Processing your answer...")
+            logger.info("⏳ Processing your answer...")
         except sr.WaitTimeoutError:
-            print("⚠️ Listening timed out, please try again.")
+            logger.warning("⚠️ Listening timed out, please try again.")
             return ""
 
     try:
-        user_text = recognizer.recognize_google(audio)
-        print(f"🗣️ You said: {user_text}")
-        return user_text
-    except sr.UnknownValueError:
-        print("⚠️ Sorry, I couldn't understand your response.")
+        user_text = transcribe(audio.get_wav_data())
+    except Exception as e:
+        logger.error("⚠️ Speech service is down: %s", e)
         return ""
-    except sr.RequestError:
-        print("⚠️ Speech service is down.")
+    if not user_text:
+        logger.warning("⚠️ Sorry, I couldn't understand your response.")
         return ""
+    logger.debug("🗣️ You said: %s", preview(user_text))
+    return user_text
 
 
-def convert_audio_to_text(file: UploadFile) -> str:
-    """🎧 Converts uploaded audio (from frontend) to text."""
-    recognizer = sr.Recognizer()
-    try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-            temp_audio.write(file.file.read())
-            temp_audio.flush()
-            temp_audio_path = temp_audio.name
-
-        # Load and transcribe
-        with sr.AudioFile(temp_audio_path) as source:
-            audio_data = recognizer.record(source)
-        text = recognizer.recognize_google(audio_data)
-        print(f"🗣️ Transcribed (file): {text}")
-        return text
-
-    except sr.UnknownValueError:
-        print("⚠️ Could not understand the audio.")
-        return "Sorry, I couldn’t understand that."
-    except sr.RequestError as e:
-        print(f"⚠️ Speech recognition API error: {e}")
+def _answer_text(text: Optional[str] = None, error: Optional[Exception] = None) -> str:
+    """Transcript, or the message the interview flow shows in its place."""
+    if isinstance(error, STTUnavailable):
+        logger.error("⚠️ Speech recognition API error: %s", error)
         return "Speech recognition service failed."
-    except Exception as e:
-        print(f"⚠️ Error processing uploaded audio: {e}")
+    if error is not None:
+        logger.error("⚠️ Error processing uploaded audio: %s", error, exc_info=error)
         return "Error processing audio."
+    if not text:
+        logger.warning("⚠️ Could not understand the audio.")
+        return "Sorry, I couldn’t understand that."
+    logger.debug("🗣️ Transcribed (file): %s", preview(text))
+    return text
+
+
+def decode_upload(file: UploadFile) -> DecodedAudio:
+    """🎧 Reads an upload (at most AUDIO_MAX_UPLOAD_BYTES) and decodes it in memory for STT."""
+    return decode_audio(file.file.read(AUDIO_MAX_UPLOAD_BYTES + 1), target_rate=STT_SAMPLE_RATE)
+
+
+def trim_speech(audio: DecodedAudio) -> Tuple[Optional[TrimmedAudio], Optional[Dict[str, float]]]:
+    """Silence-trimmed speech and the trim report ((None, None) when VAD is off)."""
+    if not VAD_ENABLED:
+        return None, None
+    with span("vad.trim"):
+        speech = trim_silence(audio)
+    report = speech.report()
+    logger.debug("✂️ VAD: %.1fs → %.1fs in %d segment(s)", report["input_seconds"], report["sent_seconds"],
+                 report["segments"])
+    return speech, report
+
+
+async def transcribe_answer(audio: DecodedAudio) -> Tuple[str, Optional[Dict[str, float]]]:
+    """
+    🎧 Transcript of a decoded answer and the VAD trim report. Only speech is sent, long answers
+    as concurrent chunks on the STT pool (chunked_stt.py).
+    """
+    speech, report = trim_speech(audio)
+    pieces = speech.pieces() if speech is not None else [audio.pcm]
+    if not pieces:
+        return _answer_text(""), report
+    try:
+        return _answer_text(await transcribe_chunked(pieces, audio.rate)), report
+    except Exception as e:
+        return _answer_text(error=e), report
+
+
+async def convert_audio_stream(stream) -> str:
+    """🎧 Final transcript of a StreamingTranscript; only its tail is still being transcribed."""
+    try:
+        return _answer_text(await stream.finish())
+    except Exception as e:
+        return _answer_text(error=e)
@@ -0,0 +1,205 @@
+# backend/ml/streaming_stt.py
+"""
+Incremental transcription of an answer while it is still being spoken.
+
+Raw PCM chunks are appended as they arrive. Once STT_STREAM_MIN_SEGMENT_SECONDS of audio is
+pending, the stream is cut in the middle of the latest pause (STT_STREAM_PAUSE_SECONDS of
+quiet frames), or unconditionally at STT_STREAM_MAX_SEGMENT_SECONDS, and that segment goes to
+the STT pool right away. By the time the candidate stops, everything but the last few seconds
+is already transcribed, so finish() only waits for that tail.
+
+    stream = StreamingTranscript(sample_rate=16000)
+    stream.accept(chunk)           # per received chunk; cheap, never blocks on STT
+    stream.partial_text()          # transcript of the segments finished so far, in order
+    text = await stream.finish()   # transcribe the tail and join all segments
+    wav = stream.wav_bytes()       # the whole answer, e.g. for delivery metrics
+
+Segments are cut at pauses so no word is split between two recognitions, and each one is
+silence-trimmed (vad.py) before it is sent; all-silent segments are never sent at all.
+"""
+import asyncio
+import io
+import wave
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .config import (
+    STT_STREAM_MIN_SEGMENT_SECONDS,
+    STT_STREAM_MAX_SEGMENT_SECONDS,
+    STT_STREAM_PAUSE_SECONDS,
+    STT_STREAM_MAX_SECONDS,
+    STT_TIMEOUT_SECONDS,
+    VAD_ENABLED,
+)
+from .audio_decoding import DecodedAudio
+from .delivery_metrics import FRAME_SECONDS, NOISE_MARGIN_DB, SILENCE_FLOOR_DBFS, _runs, frame_levels
+from .logs import get_logger
+from .stt_backends import STTUnavailable, get_stt_pool
+from .vad import trim_silence
+from .chunked_stt import transcribe_with_retry
+
+logger = get_logger(__name__)
+
+# Formats a client may declare for its PCM stream (the byte cap is derived from them)
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 48000
+MAX_CHANNELS = 2
+
+
+class StreamTooLong(ValueError):
+    """More audio than STT_STREAM_MAX_SECONDS was sent for one answer."""
+
+
+class StreamingTranscript:
+    """One answer's audio stream: 16-bit little-endian PCM, interleaved if multi-channel."""
+
+    SAMPLE_WIDTH = 2
+
+    def __init__(self, sample_rate: int = 16000, channels: int = 1,
+                 min_segment_seconds: float = STT_STREAM_MIN_SEGMENT_SECONDS,
+                 max_segment_seconds: float = STT_STREAM_MAX_SEGMENT_SECONDS,
+                 pause_seconds: float = STT_STREAM_PAUSE_SECONDS,
+                 max_seconds: float = STT_STREAM_MAX_SECONDS):
+        if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"sample_rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE}")
+        if not 1 <= channels <= MAX_CHANNELS:
+            raise ValueError(f"channels must be between 1 and {MAX_CHANNELS}")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._frame_bytes = self.SAMPLE_WIDTH * channels
+        self._min_bytes = int(min_segment_seconds * sample_rate) * self._frame_bytes
+        self._max_bytes = int(max_segment_seconds * sample_rate) * self._frame_bytes
+        self._limit_bytes = int(max_seconds * sample_rate) * self._frame_bytes
+        self._pause_frames = max(int(round(pause_seconds / FRAME_SECONDS)), 1)
+
+        self._pcm = bytearray()
+        self._cut = 0                                  # bytes already handed to STT
+        # In order: a Future per submitted segment, or the WAV bytes of one the pool refused
+        self._segments: List[Union[Future, bytes]] = []
+        self._wavs: List[bytes] = []                   # kept so a failed segment can be retried alone
+        self._vad = {"input_seconds": 0.0, "sent_seconds": 0.0, "segments": 0}
+
+    @property
+    def seconds(self) -> float:
+        return len(self._pcm) / self._frame_bytes / self.sample_rate
+
+    # ---------- ingest ----------
+    def accept(self, chunk: bytes):
+        """Append a chunk; submits a segment to STT when a pause (or the size cap) allows a cut."""
+        if len(self._pcm) + len(chunk) > self._limit_bytes:
+            raise StreamTooLong(f"Answer audio exceeds {self._limit_bytes // self._frame_bytes // self.sample_rate}s")
+        self._pcm += chunk
+        while len(self._pcm) - self._cut >= self._min_bytes:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            self._submit(self._cut, cut)
+            self._cut = cut
+
+    def _find_cut(self) -> Optional[int]:
+        """Byte offset in the middle of the latest long-enough pause, or None to wait for more audio."""
+        pending = len(self._pcm) - self._cut
+        pending -= pending % self._frame_bytes
+        samples = np.frombuffer(self._pcm, dtype="<i2", count=pending // 2, offset=self._cut).astype(np.float32)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        db = frame_levels(samples / 32768.0, self.sample_rate)
+
+        if len(db):
+            quiet = db < max(SILENCE_FLOOR_DBFS, float(np.percentile(db, 10)) + NOISE_MARGIN_DB)
+            starts, lengths = _runs(quiet)
+            # a pause that runs into the end of the buffer may just be the start of a longer one
+            inner = (lengths >= self._pause_frames) & (starts + lengths < len(db))
+            if inner.any():
+                middle = int(starts[inner][-1] + lengths[inner][-1] // 2)
+                offset = int(middle * FRAME_SECONDS * self.sample_rate) * self._frame_bytes
+                if offset >= self._min_bytes // 2:
+                    return self._cut + offset
+        if pending >= self._max_bytes:
+            return self._cut + self._max_bytes
+        return None
+
+    def _wav(self, start: int, end: int) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(self.channels)
+            wf.setsampwidth(self.SAMPLE_WIDTH)
+            wf.setframerate(self.sample_rate)
+            wf.writeframes(bytes(self._pcm[start:end]))
+        return buffer.getvalue()
+
+    def _submit(self, start: int, end: int):
+        pcm = np.frombuffer(bytes(self._pcm[start:end]), dtype="<i2")
+        if self.channels > 1:
+            pcm = pcm.reshape(-1, self.channels).mean(axis=1).astype(np.int16)
+        audio = DecodedAudio(pcm, self.sample_rate, "pcm")
+        if VAD_ENABLED:
+            speech = trim_silence(audio)
+            self._vad["input_seconds"] += speech.input_seconds
+            self._vad["sent_seconds"] += speech.audio.seconds
+            self._vad["segments"] += len(speech.segments)
+            if not speech.segments:
+                logger.debug("🎙️ Stream segment of %.1fs is silent, not transcribed", audio.seconds)
+                return
+            audio = speech.audio
+        wav = audio.wav_bytes()
+        self._wavs.append(wav)
+        try:
+            self._segments.append(get_stt_pool().submit(wav))
+        except STTUnavailable:
+            self._segments.append(wav)     # pool full: retried in finish()
+        logger.debug("🎙️ Stream segment %d: %.1fs submitted", len(self._segments), audio.seconds)
+
+    def vad_report(self) -> Optional[Dict[str, float]]:
+        """Seconds of audio received vs. sent to STT after silence trimming (None if VAD is off)."""
+        if not VAD_ENABLED:
+            return None
+        vad = self._vad
+        return {
+            "input_seconds": round(vad["input_seconds"], 2),
+            "sent_seconds": round(vad["sent_seconds"], 2),
+            "removed_seconds": round(max(vad["input_seconds"] - vad["sent_seconds"], 0.0), 2),
+            "segments": vad["segments"],
+        }
+
+    def wav_bytes(self) -> bytes:
+        """Everything received so far as one WAV file."""
+        return self._wav(0, len(self._pcm) - len(self._pcm) % self._frame_bytes)
+
+    # ---------- results ----------
+    def partial_text(self) -> str:
+        """Joined transcript of the leading segments that are already done."""
+        parts = []
+        for segment in self._segments:
+            if not isinstance(segment, Future) or not segment.done():
+                break
+            if segment.exception() is None and segment.result():
+                parts.append(segment.result())
+        return " ".join(parts)
+
+    async def finish(self, timeout: float = STT_TIMEOUT_SECONDS) -> str:
+        """Submit the tail, wait for every segment (retrying failed ones) and return the full transcript."""
+        end = len(self._pcm) - len(self._pcm) % self._frame_bytes
+        if end > self._cut:
+            self._submit(self._cut, end)
+            self._cut = end
+
+        async def settle(wav: bytes, segment: Union[Future, bytes]) -> str:
+            if isinstance(segment, Future):
+                try:
+                    return await asyncio.wrap_future(segment)
+                except STTUnavailable as e:
+                    logger.warning("🔁 Stream segment failed (%s), retrying", e)
+            return await transcribe_with_retry(wav)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(settle(w, s) for w, s in zip(self._wavs, self._segments)), return_exceptions=True),
+            timeout)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors and len(errors) == len(results):
+            raise errors[0]
+        if errors:
+            logger.warning("⚠️ %d of %d stream segment(s) failed: %s", len(errors), len(results), errors[0])
+        return " ".join(r for r in results if r and not isinstance(r, BaseException))
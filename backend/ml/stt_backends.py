@@ -0,0 +1,203 @@
+# backend/ml/stt_backends.py
+"""
+Pluggable speech-to-text engines behind one bounded worker pool (config STT_BACKEND).
+
+  - "google": speech_recognition's Google Web Speech API (default; a network round trip)
+  - "vosk"  : offline Kaldi model on the CPU. Needs `pip install vosk` and an unpacked model
+              directory in STT_VOSK_MODEL_PATH (vosk-model-small-en-us-0.15 is ~40 MB, runs
+              faster than real time on one core).
+
+The engine, and its model, is built once per worker process (preload_stt() at API start-up).
+Transcriptions run on a thread pool of STT_POOL_SIZE workers; at most STT_MAX_PENDING more jobs
+may wait, beyond that callers get STTUnavailable right away instead of queueing without bound.
+
+Engines take WAV bytes and return the transcript: "" when nothing intelligible was heard,
+STTUnavailable when the engine itself failed.
+
+    text = transcribe(wav_bytes)                # blocking
+    text = await transcribe_async(wav_bytes)    # from async endpoints
+"""
+import asyncio
+import contextvars
+import io
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from .config import (
+    STT_BACKEND,
+    STT_LANGUAGE,
+    STT_VOSK_MODEL_PATH,
+    STT_POOL_SIZE,
+    STT_MAX_PENDING,
+    STT_TIMEOUT_SECONDS,
+)
+from .logs import get_logger
+from .metrics import REGISTRY
+from .profiling import profiled
+from .tracing import span
+
+logger = get_logger(__name__)
+
+STT_REJECTED = REGISTRY.counter("stt_rejected_total", "Transcriptions refused because the STT pool was full")
+STT_QUEUED = REGISTRY.gauge("stt_jobs_in_pool", "Transcriptions running or waiting in the STT pool")
+
+
+class STTUnavailable(RuntimeError):
+    """The engine failed or is overloaded (as opposed to audio with no recognisable speech)."""
+
+
+class STTBackend:
+    """Interface: `transcribe(wav_bytes)` returns the transcript ("" if nothing was recognised)."""
+
+    name = "base"
+
+    def load(self):
+        """Load models up front; called once per process by preload_stt()."""
+
+    def transcribe(self, wav: bytes) -> str:
+        raise NotImplementedError
+
+
+# ------------------------------------------------------
+# ☁️ Google Web Speech (speech_recognition)
+# ------------------------------------------------------
+class GoogleSTT(STTBackend):
+    name = "google"
+
+    def __init__(self, language: str = STT_LANGUAGE):
+        import speech_recognition as sr
+
+        self._sr = sr
+        self.language = language
+
+    def transcribe(self, wav: bytes) -> str:
+        sr = self._sr
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(io.BytesIO(wav)) as source:
+            audio = recognizer.record(source)
+        try:
+            return recognizer.recognize_google(audio, language=self.language)
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise STTUnavailable(str(e)) from e
+
+
+# ------------------------------------------------------
+# 💻 Vosk (offline, CPU)
+# ------------------------------------------------------
+class VoskSTT(STTBackend):
+    name = "vosk"
+    CHUNK_FRAMES = 4000
+
+    def __init__(self, model_path: str = STT_VOSK_MODEL_PATH):
+        self.model_path = model_path
+        self._model = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from vosk import Model, SetLogLevel
+
+                    SetLogLevel(-1)
+                    self._model = Model(self.model_path)   # shared, read-only across threads
+                    logger.info("🎙️ Vosk model loaded from %s", self.model_path)
+        return self._model
+
+    def transcribe(self, wav: bytes) -> str:
+        from vosk import KaldiRecognizer
+        from .audio_decoding import decode_audio
+
+        audio = decode_audio(wav, max_bytes=0, max_seconds=0)    # mono int16; a view for 16-bit mono WAV
+        recognizer = KaldiRecognizer(self.load(), audio.rate)   # cheap; one per utterance
+        for start in range(0, len(audio.pcm), self.CHUNK_FRAMES):
+            recognizer.AcceptWaveform(audio.pcm[start:start + self.CHUNK_FRAMES].tobytes())
+        return json.loads(recognizer.FinalResult()).get("text", "")
+
+
+# ------------------------------------------------------
+# 🔌 Selection + bounded pool
+# ------------------------------------------------------
+def build_stt_backend(name: str = STT_BACKEND) -> STTBackend:
+    name = (name or "google").lower()
+    if name == "google":
+        return GoogleSTT()
+    if name == "vosk":
+        return VoskSTT()
+    raise ValueError(f"Unknown STT_BACKEND: {name}")
+
+
+class STTPool:
+    """Runs one backend on a fixed number of threads with a cap on waiting jobs."""
+
+    def __init__(self, backend: STTBackend, workers: int = STT_POOL_SIZE, max_pending: int = STT_MAX_PENDING):
+        self.backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"stt-{backend.name}")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def submit(self, wav: bytes) -> Future:
+        if not self._slots.acquire(blocking=False):
+            STT_REJECTED.inc()
+            raise STTUnavailable("Speech-to-text pool is full")
+        STT_QUEUED.inc()
+        ctx = contextvars.copy_context()   # keep the request's trace / log ids in the worker
+        try:
+            return self._executor.submit(ctx.run, profiled(self._run), wav)
+        except BaseException:
+            self._release()
+            raise
+
+    def _release(self):
+        STT_QUEUED.dec()
+        self._slots.release()
+
+    def _run(self, wav: bytes) -> str:
+        try:
+            with span(f"stt.{self.backend.name}"):
+                return self.backend.transcribe(wav)
+        finally:
+            self._release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[STTPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_stt_pool() -> STTPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = STTPool(build_stt_backend())
+    return _pool
+
+
+def use_stt_backend(backend: STTBackend, workers: int = STT_POOL_SIZE, max_pending: int = STT_MAX_PENDING):
+    """Swap the process-wide engine (benchmarks compare engines this way)."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, STTPool(backend, workers, max_pending)
+    if old is not None:
+        old.shutdown()
+
+
+def preload_stt():
+    """Build the engine and load its model now, so the first answer doesn't pay for it."""
+    pool = get_stt_pool()
+    pool.backend.load()
+    logger.info("🎙️ STT engine ready: %s", pool.backend.name)
+
+
+def transcribe(wav: bytes, timeout: float = STT_TIMEOUT_SECONDS) -> str:
+    return get_stt_pool().submit(wav).result(timeout=timeout)
+
+
+async def transcribe_async(wav: bytes, timeout: float = STT_TIMEOUT_SECONDS) -> str:
+    return await asyncio.wait_for(asyncio.wrap_future(get_stt_pool().submit(wav)), timeout)
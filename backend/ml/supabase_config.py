@@ -3,6 +3,10 @@ from datetime import datetime
 import json
 import os
 from dotenv import load_dotenv
+from .logs import get_logger
+from .tracing import span
+
+logger = get_logger(__name__)
 
 # ✅ Dynamically locate and load the .env file
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -16,10 +20,10 @@ possible_paths = [
 for path in possible_paths:
     if os.path.exists(path):
         load_dotenv(path)
-        print(f"✅ Loaded environment variables from: {path}")
+        logger.debug("✅ Loaded environment variables from: %s", path)
         break
 else:
-    print("⚠️ No .env file found in expected locations!")
+    logger.warning("⚠️ No .env file found in expected locations!")
 
 # ✅ Fetch credentials
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -30,7 +34,7 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 # ✅ Create Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-print("✅ Supabase client connected successfully!")
+logger.info("✅ Supabase client connected successfully!")
 
 def save_resume(user_name: str, resume_data: dict):
     """Save parsed resume data to Supabase."""
@@ -41,29 +45,31 @@ def save_resume(user_name: str, resume_data: dict):
             "created_at": datetime.utcnow().isoformat()
         }
 
-        response = supabase.table("resumes").insert(data).execute()
-        print("✅ Resume saved to Supabase:", response)
+        with span("supabase.insert.resumes"):
+            response = supabase.table("resumes").insert(data).execute()
+        logger.info("✅ Resume saved to Supabase (%d row(s))", len(response.data or []))
     except Exception as e:
-        print(f"⚠️ Failed to save resume: {e}")
+        logger.warning("⚠️ Failed to save resume: %s", e)
 
 
 
 def fetch_resume(user_name: str):
     """Fetch latest parsed resume for a given user from Supabase."""
     try:
-        response = supabase.table("resumes") \
-            .select("resume_data") \
-            .eq("user_name", user_name) \
-            .order("created_at", desc=True) \
-            .limit(1) \
-            .execute()
+        with span("supabase.select.resumes"):
+            response = supabase.table("resumes") \
+                .select("resume_data") \
+                .eq("user_name", user_name) \
+                .order("created_at", desc=True) \
+                .limit(1) \
+                .execute()
         
         if response.data:
             return json.loads(response.data[0]["resume_data"])
         else:
             raise ValueError(f"No resume found for user: {user_name}")
     except Exception as e:
-        print(f"⚠️ Error fetching resume: {e}")
+        logger.warning("⚠️ Error fetching resume: %s", e)
         return {}
 
 
@@ -78,19 +84,21 @@ def save_interview_session(session_id, user_name, difficulty, qa_pairs, feedback
       
     }
 
-    response = supabase.table("interviews").insert(data).execute()
-    print("✅ Saved to Supabase:", response)
+    with span("supabase.insert.interviews"):
+        supabase.table("interviews").insert(data).execute()
+    logger.info("✅ Interview session saved to Supabase (%d turn(s))", len(qa_pairs))
 
 def save_video_url(session_id: str, question: str, video_url: str):
     try:
-        supabase.table("interview_videos").insert({
-            "session_id": session_id,
-            "question": question,
-            "video_url": video_url
-        }).execute()
-        print("📹 Saved video URL to Supabase!")
+        with span("supabase.insert.interview_videos"):
+            supabase.table("interview_videos").insert({
+                "session_id": session_id,
+                "question": question,
+                "video_url": video_url
+            }).execute()
+        logger.debug("📹 Saved video URL to Supabase!")
     except Exception as e:
-        print("❌ Error saving video URL:", e)
+        logger.error("❌ Error saving video URL: %s", e)
 
 
 
@@ -102,7 +110,8 @@ def save_evaluation(session_id, evaluation):
     """
     try:
         # Step 1: Fetch user_name from 'interviews' table
-        user_resp = supabase.table("interviews").select("user_name").eq("session_id", session_id).execute()
+        with span("supabase.select.interviews"):
+            user_resp = supabase.table("interviews").select("user_name").eq("session_id", session_id).execute()
         user_name = user_resp.data[0]["user_name"] if user_resp.data else "Unknown User"
 
         # Step 2: Prepare data for insertion
@@ -117,14 +126,15 @@ def save_evaluation(session_id, evaluation):
         }
 
         # Step 3: Insert into Supabase 'evaluations' table
-        response = supabase.table("evaluations").insert(evaluation_data).execute()
+        with span("supabase.insert.evaluations"):
+            response = supabase.table("evaluations").insert(evaluation_data).execute()
 
         if response.data:
-            print(f"✅ Evaluation saved for {user_name} (session: {session_id})")
+            logger.info("✅ Evaluation saved to Supabase")
         else:
-            print("⚠️ Failed to save evaluation:", response)
+            logger.warning("⚠️ Failed to save evaluation: empty response")
     except Exception as e:
-        print("❌ Error saving evaluation:", e)
+        logger.error("❌ Error saving evaluation: %s", e)
 
 
 def save_report(session_id: str, report: dict, user_id: str = None):
@@ -139,31 +149,43 @@ def save_report(session_id: str, report: dict, user_id: str = None):
             "created_at": datetime.utcnow().isoformat()
         }
 
-        response = supabase.table("reports").insert(payload).execute()
+        with span("supabase.insert.reports"):
+            response = supabase.table("reports").insert(payload).execute()
         if hasattr(response, "data") and response.data:
-            print("✅ Report successfully saved to Supabase!")
+            logger.info("✅ Report successfully saved to Supabase!")
         else:
-            print("⚠️ Report save attempt made, but response was empty or invalid.")
+            logger.warning("⚠️ Report save attempt made, but response was empty or invalid.")
 
     except Exception as e:
-        print(f"❌ Error saving report to Supabase: {e}")
+        logger.error("❌ Error saving report to Supabase: %s", e)
+
+
+def update_report(session_id: str, report: dict):
+    """Overwrite a session's saved report (e.g. to attach the final cost ledger)."""
+    try:
+        with span("supabase.update.reports"):
+            supabase.table("reports").update({"report": report}).eq("session_id", session_id).execute()
+        logger.info("✅ Report updated in Supabase!")
+    except Exception as e:
+        logger.warning("⚠️ Failed to update report: %s", e)
 
 
 def save_roadmap(session_id: str, user_name: str, roadmap_data: dict):
     """Save AI-generated roadmap to Supabase."""
     try:
-        response = supabase.table("roadmaps").insert({
-            "session_id": session_id,
-            "user_name": user_name,
-            "focus_areas": roadmap_data.get("focus_areas", []),
-            "actions": roadmap_data.get("actions", []),
-            "resources": roadmap_data.get("resources", []),
-        }).execute()
-
-        print("✅ Roadmap saved successfully to Supabase!")
+        with span("supabase.insert.roadmaps"):
+            response = supabase.table("roadmaps").insert({
+                "session_id": session_id,
+                "user_name": user_name,
+                "focus_areas": roadmap_data.get("focus_areas", []),
+                "actions": roadmap_data.get("actions", []),
+                "resources": roadmap_data.get("resources", []),
+            }).execute()
+
+        logger.info("✅ Roadmap saved successfully to Supabase!")
         return response
 
     except Exception as e:
-        print(f"⚠️ Failed to save roadmap: {e}")
+        logger.warning("⚠️ Failed to save roadmap: %s", e)
 
 
@@ -68,11 +68,25 @@
 import os
 import base64
 import tempfile
+import subprocess
+import threading
 import uuid
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 import pyttsx3
 from elevenlabs import ElevenLabs
-from .config import ELEVENLABS_API_KEY
+from .config import (
+    ELEVENLABS_API_KEY, TTS_DEFAULT_PROFILE, TTS_CACHE_MAX_ENTRIES, TTS_CACHE_MAX_BYTES,
+    FFMPEG_BINARY, AUDIO_DECODE_TIMEOUT_SECONDS,
+)
 from .supabase_config import supabase
+from .tracing import span
+from .cost_ledger import record_usage
+from .logs import get_logger, preview
+from .metrics import REGISTRY
+
+logger = get_logger(__name__)
 
 # ✅ ElevenLabs setup
 USE_ELEVEN = bool(ELEVENLABS_API_KEY)
@@ -87,44 +101,190 @@ VOICE_OPTIONS = {
     "Sia": "6JsmTroalVewG1gA6Jmw",      # Warm & empathetic
 }
 
-CURRENT_VOICE = "Sia"  # default
+DEFAULT_VOICE = "Sia"
+
+# ------------------------------------------------------
+# 🎤 Voice selection (per call / per session)
+# ------------------------------------------------------
+# speak_text() resolves its voice once, up front, from its own arguments, so concurrent sessions
+# with different interviewers never see each other's choice and can synthesize in parallel.
+MAX_SESSION_VOICES = 512     # abandoned interviews never reach clear_voice; oldest dropped first
+_session_voices: "OrderedDict[str, str]" = OrderedDict()
+_voices_lock = threading.Lock()
+# pyttsx3 hands out one shared engine per process and its run loop isn't re-entrant
+_local_tts_lock = threading.Lock()
 
 
-def set_voice(voice_name: str):
-    """Switch interviewer voice."""
-    global CURRENT_VOICE
+def resolve_voice(voice_name: Optional[str] = None, session_id: Optional[str] = None) -> str:
+    """The voice to use: an explicit (known) name, else the session's voice, else the default."""
     if voice_name in VOICE_OPTIONS:
-        CURRENT_VOICE = voice_name
-        print(f"🎤 Voice set to: {voice_name}")
+        return voice_name
+    if voice_name:
+        logger.warning("⚠️ Voice '%s' not found. Using default voice: %s", voice_name, DEFAULT_VOICE)
+    if session_id:
+        with _voices_lock:
+            return _session_voices.get(session_id, DEFAULT_VOICE)
+    return DEFAULT_VOICE
+
+
+def set_voice(voice_name: str, session_id: Optional[str] = None) -> str:
+    """Pick the interviewer voice for a session (or the process default, for the CLI)."""
+    global DEFAULT_VOICE
+    if voice_name not in VOICE_OPTIONS:
+        logger.warning("⚠️ Voice '%s' not found. Using default voice: %s", voice_name, DEFAULT_VOICE)
+        return resolve_voice(session_id=session_id)
+    if session_id:
+        with _voices_lock:
+            _session_voices[session_id] = voice_name
+            _session_voices.move_to_end(session_id)
+            while len(_session_voices) > MAX_SESSION_VOICES:
+                _session_voices.popitem(last=False)
     else:
-        print(f"⚠️ Voice '{voice_name}' not found. Using default voice: {CURRENT_VOICE}")
-
-
-def get_current_voice():
-    """Return the currently selected interviewer voice."""
-    return CURRENT_VOICE
-
-
-def speak_text(text: str, play_local: bool = False):
+        DEFAULT_VOICE = voice_name
+    logger.info("🎤 Voice set to: %s", voice_name)
+    return voice_name
+
+
+def get_current_voice(session_id: Optional[str] = None) -> str:
+    """Return the interviewer voice selected for a session (or the default)."""
+    return resolve_voice(session_id=session_id)
+
+
+def clear_voice(session_id: str):
+    """Forget a session's voice once the interview is over."""
+    with _voices_lock:
+        _session_voices.pop(session_id, None)
+
+
+# ------------------------------------------------------
+# 📦 Delivery profiles (format / bitrate the client asked for)
+# ------------------------------------------------------
+# Names are ElevenLabs output formats, so the provider encodes each profile directly and nothing
+# is transcoded on the ElevenLabs path. The ffmpeg arguments are only used to re-encode the
+# local pyttsx3 fallback. A spoken question is ~10-20 s: ≈ 240 KB at 128 kbps vs ≈ 60 KB at 32.
+AUDIO_PROFILES: Dict[str, Dict[str, Any]] = {
+    "mp3_44100_128": {"extension": "mp3", "mime": "audio/mpeg",
+                      "ffmpeg": ["-ar", "44100", "-b:a", "128k", "-f", "mp3"]},
+    "mp3_44100_64": {"extension": "mp3", "mime": "audio/mpeg",
+                     "ffmpeg": ["-ar", "44100", "-b:a", "64k", "-f", "mp3"]},
+    "mp3_22050_32": {"extension": "mp3", "mime": "audio/mpeg",
+                     "ffmpeg": ["-ar", "22050", "-b:a", "32k", "-f", "mp3"]},
+    "opus_48000_32": {"extension": "ogg", "mime": "audio/ogg; codecs=opus",
+                      "ffmpeg": ["-ar", "48000", "-c:a", "libopus", "-b:a", "32k", "-f", "ogg"]},
+    "opus_48000_64": {"extension": "ogg", "mime": "audio/ogg; codecs=opus",
+                      "ffmpeg": ["-ar", "48000", "-c:a", "libopus", "-b:a", "64k", "-f", "ogg"]},
+}
+# Short names clients may send instead
+PROFILE_ALIASES = {"standard": "mp3_44100_128", "low": "mp3_22050_32", "mobile": "opus_48000_32"}
+
+DEFAULT_PROFILE = TTS_DEFAULT_PROFILE if TTS_DEFAULT_PROFILE in AUDIO_PROFILES else "mp3_44100_128"
+if DEFAULT_PROFILE != TTS_DEFAULT_PROFILE:
+    logger.warning("⚠️ TTS_DEFAULT_PROFILE '%s' not supported. Using: %s", TTS_DEFAULT_PROFILE, DEFAULT_PROFILE)
+
+TTS_CACHE = REGISTRY.counter("tts_cache_total", "Synthesized speech cache lookups", ("profile", "outcome"))
+TTS_AUDIO_BYTES = REGISTRY.counter("tts_audio_bytes_total", "Interviewer audio bytes produced", ("profile",))
+
+# (profile, voice, text) → response fields; a repeated line in the same profile is neither
+# re-synthesized nor re-uploaded
+_speech_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+_cache_bytes = 0          # base64 audio held by _speech_cache
+_cache_lock = threading.Lock()
+
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """A known delivery profile name (aliases allowed), else the configured default."""
+    profile = PROFILE_ALIASES.get(profile, profile)
+    if profile in AUDIO_PROFILES:
+        return profile
+    if profile:
+        logger.warning("⚠️ Audio profile '%s' not supported. Using: %s", profile, DEFAULT_PROFILE)
+    return DEFAULT_PROFILE
+
+
+def _cached(key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+    with _cache_lock:
+        hit = _speech_cache.get(key)
+        if hit is not None:
+            _speech_cache.move_to_end(key)
+    TTS_CACHE.inc(profile=key[0], outcome="hit" if hit is not None else "miss")
+    return dict(hit) if hit is not None else None
+
+
+def _remember(key: Tuple[str, str, str], result: Dict[str, Any]):
+    """Keep a synthesized line, evicting least recently used ones past the entry / byte caps."""
+    global _cache_bytes
+    size = len(result.get("audio_base64") or "")
+    if TTS_CACHE_MAX_ENTRIES <= 0 or size > TTS_CACHE_MAX_BYTES // 4:
+        return
+    with _cache_lock:
+        old = _speech_cache.pop(key, None)
+        if old is not None:
+            _cache_bytes -= len(old.get("audio_base64") or "")
+        _speech_cache[key] = dict(result)
+        _cache_bytes += size
+        while len(_speech_cache) > TTS_CACHE_MAX_ENTRIES or _cache_bytes > TTS_CACHE_MAX_BYTES:
+            _, evicted = _speech_cache.popitem(last=False)
+            _cache_bytes -= len(evicted.get("audio_base64") or "")
+
+
+def transcode(audio_bytes: bytes, profile: str) -> Optional[bytes]:
+    """Re-encode audio to a delivery profile through an ffmpeg pipe (None if that isn't possible)."""
+    command = [FFMPEG_BINARY, "-nostdin", "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+               "-vn", "-ac", "1", *AUDIO_PROFILES[profile]["ffmpeg"], "pipe:1"]
+    try:
+        proc = subprocess.run(command, input=audio_bytes, capture_output=True, timeout=AUDIO_DECODE_TIMEOUT_SECONDS)
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        logger.warning("⚠️ Could not transcode speech to %s: %s", profile, e)
+        return None
+    if proc.returncode != 0 or not proc.stdout:
+        logger.warning("⚠️ Could not transcode speech to %s: %s", profile,
+                       proc.stderr.decode("utf-8", "replace").strip()[-200:])
+        return None
+    return proc.stdout
+
+
+def _audio_response(audio_base64: Optional[str], audio_url: Optional[str], profile: Optional[str]) -> Dict[str, Any]:
+    return {
+        "audio_base64": audio_base64,
+        "audio_url": audio_url,
+        "audio_profile": profile,
+        "audio_mime": AUDIO_PROFILES[profile]["mime"] if profile in AUDIO_PROFILES else None,
+    }
+
+
+def speak_text(text: str, play_local: bool = False, voice_name: Optional[str] = None,
+               session_id: Optional[str] = None, profile: Optional[str] = None):
     """
-    Convert interviewer text to speech.
+    Convert interviewer text to speech in `voice_name` (or the session's / default voice),
+    encoded as the delivery `profile` (see AUDIO_PROFILES).
+    Safe to call from many threads at once with different voices.
     ✅ ElevenLabs primary
     ✅ Fallback to pyttsx3
     ✅ Upload to Supabase + return both Base64 + public URL
     """
     audio_base64, audio_url = None, None
+    voice = resolve_voice(voice_name, session_id)
+    profile = resolve_profile(profile)
+    extension = AUDIO_PROFILES[profile]["extension"]
+    key = (profile, voice, text)
+    cached = _cached(key)
+    if cached is not None:
+        return cached
 
     try:
         if USE_ELEVEN:
-            print(f"🎧 Generating ElevenLabs voice for: {CURRENT_VOICE}")
-            audio_stream = client.text_to_speech.convert(
-                voice_id=VOICE_OPTIONS[CURRENT_VOICE],
-                model_id="eleven_multilingual_v2",
-                text=text,
-                output_format="mp3_44100_128",
-            )
-
-            audio_bytes = b"".join(audio_stream)
+            logger.debug("🎧 Generating ElevenLabs voice for: %s", voice)
+            started = time.perf_counter()
+            with span("tts.elevenlabs", voice=voice, profile=profile):
+                audio_stream = client.text_to_speech.convert(
+                    voice_id=VOICE_OPTIONS[voice],
+                    model_id="eleven_multilingual_v2",
+                    text=text,
+                    output_format=profile,
+                )
+
+                audio_bytes = b"".join(audio_stream)
+            record_usage("tts.elevenlabs", time.perf_counter() - started, characters=len(text))
 
             # ▶ CLI playback (for testing)
             if play_local:
@@ -136,55 +296,64 @@ def speak_text(text: str, play_local: bool = False):
             audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
 
             # ☁ Upload to Supabase Storage
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f".{extension}")
             temp_file.write(audio_bytes)
             temp_file.flush()
 
-            file_name = f"interview_audio/{uuid.uuid4()}.mp3"
-            supabase.storage.from_("audio").upload(file_name, temp_file.name)
+            file_name = f"interview_audio/{uuid.uuid4()}.{extension}"
+            started = time.perf_counter()
+            with span("storage.upload.audio"):
+                supabase.storage.from_("audio").upload(file_name, temp_file.name)
+            record_usage("storage.upload.audio", time.perf_counter() - started, bytes=len(audio_bytes))
 
             # ✅ Corrected: remove space in URL
             audio_url = f"https://kvfxusqastoeapcymafj.supabase.co/storage/v1/object/public/audio/{file_name}"
 
-            return {
-                "audio_base64": audio_base64,
-                "audio_url": audio_url,
-            }
+            TTS_AUDIO_BYTES.inc(len(audio_bytes), profile=profile)
+            result = _audio_response(audio_base64, audio_url, profile)
+            _remember(key, result)
+            return result
 
     except Exception as e:
-        print(f"⚠️ ElevenLabs failed: {e}. Falling back to local TTS...")
+        logger.warning("⚠️ ElevenLabs failed: %s. Falling back to local TTS...", e)
 
     # 🧠 Local fallback TTS
         # 🧠 Local Fallback Audio (pyttsx3)
     try:
-        print("🔁 Using local TTS fallback (pyttsx3)...")
-        engine = pyttsx3.init()
-        engine.setProperty("rate", 175)
-
+        logger.info("🔁 Using local TTS fallback (pyttsx3)...")
         fallback_path = f"fallback_{uuid.uuid4()}.mp3"
-        engine.save_to_file(text, fallback_path)
-        engine.runAndWait()
+        with span("tts.pyttsx3"), _local_tts_lock:
+            engine = pyttsx3.init()
+            engine.setProperty("rate", 175)
+            engine.save_to_file(text, fallback_path)
+            engine.runAndWait()
 
-        # Convert to Base64
+        # Convert to Base64 (re-encoded to the requested profile when ffmpeg is available)
         with open(fallback_path, "rb") as f:
             fallback_bytes = f.read()
+        with span("tts.transcode", profile=profile):
+            encoded = transcode(fallback_bytes, profile)
+        delivered = profile if encoded is not None else None
+        if encoded is not None:
+            fallback_bytes = encoded
+            TTS_AUDIO_BYTES.inc(len(encoded), profile=profile)
         audio_base64 = base64.b64encode(fallback_bytes).decode("utf-8")
 
         # ☁ Upload to Supabase Storage (if available)
         try:
-            file_name = f"interview_audio/fallback_{uuid.uuid4()}.mp3"
-            supabase.storage.from_("audio").upload(file_name, fallback_path)
+            file_name = f"interview_audio/fallback_{uuid.uuid4()}.{extension if delivered else 'mp3'}"
+            started = time.perf_counter()
+            with span("storage.upload.audio"):
+                supabase.storage.from_("audio").upload(file_name, fallback_bytes if delivered else fallback_path)
+            record_usage("storage.upload.audio", time.perf_counter() - started, bytes=len(fallback_bytes))
             audio_url = f"https://kvfxusqastoeapcymafj.supabase.co/storage/v1/object/public/audio/{file_name}"
         except Exception as upload_error:
-            print(f"⚠️ Supabase upload failed: {upload_error}")
+            logger.warning("⚠️ Supabase upload failed: %s", upload_error)
             audio_url = None
 
-        return {
-            "audio_base64": audio_base64,
-            "audio_url": audio_url,
-        }
+        return _audio_response(audio_base64, audio_url, delivered)
 
     except Exception as fallback_error:
-        print(f"❌ Local fallback TTS failed: {fallback_error}")
-        print(f"👩‍💼 Interviewer: {text}")
-        return {"audio_base64": None, "audio_url": None}
+        logger.error("❌ Local fallback TTS failed: %s", fallback_error)
+        logger.info("👩‍💼 Interviewer: %s", preview(text))
+        return _audio_response(None, None, None)
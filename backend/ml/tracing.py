@@ -0,0 +1,225 @@
+# backend/ml/tracing.py
+"""
+Span-based stage tracing for the interview flow.
+
+    with span("tts.elevenlabs", voice=voice_name):
+        ...
+
+    @traced("supabase.insert.interviews")
+    def save_interview_session(...): ...
+
+Every span feeds the metrics registry (duration histogram, in-flight gauge, error counter,
+labelled by stage). Inside an HTTP request the TracingMiddleware also collects the spans into
+a per-request trace (nested via contextvars), so one slow /api/interview/answer can be broken
+down into STT / Gemini / ElevenLabs / upload / D-ID / Supabase. The most recent traces are kept
+in memory and served by GET /api/traces.
+"""
+import contextvars
+import functools
+import inspect
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from .config import TRACE_RECENT_LIMIT, TRACE_SLOW_REQUEST_SECONDS
+from .logs import bind_request, get_logger, reset_context
+from .metrics import REGISTRY
+
+logger = get_logger(__name__)
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "interview_stage_duration_seconds", "Duration of one traced stage", ("stage",))
+STAGE_IN_FLIGHT = REGISTRY.gauge(
+    "interview_stage_in_flight", "Traced stages currently running", ("stage",))
+STAGE_ERRORS = REGISTRY.counter(
+    "interview_stage_errors_total", "Traced stages that raised", ("stage", "error"))
+
+HTTP_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status"))
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method", "route"))
+
+
+class Trace:
+    """Spans recorded while serving one request."""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status: Optional[int] = None
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, entry: Dict[str, Any]):
+        with self._lock:
+            self.spans.append(entry)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["offset_ms"])
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round((self.duration or 0) * 1000, 2),
+            "status": self.status,
+            "spans": spans,
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("span", default=None)
+_span_ids = itertools.count(1)
+_recent: "deque[Trace]" = deque(maxlen=TRACE_RECENT_LIMIT)
+_recent_lock = threading.Lock()
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """Time one stage: metrics always, plus a span in the current request trace if there is one."""
+    trace = _current_trace.get()
+    span_id = next(_span_ids)
+    parent = _current_span.get()
+    token = _current_span.set(span_id)
+    STAGE_IN_FLIGHT.inc(stage=stage)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        STAGE_ERRORS.inc(stage=stage, error=error)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_IN_FLIGHT.dec(stage=stage)
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        _current_span.reset(token)
+        if trace is not None:
+            trace.add({
+                "span_id": span_id,
+                "parent_id": parent,
+                "stage": stage,
+                "offset_ms": round((start - trace._t0) * 1000, 2),
+                "duration_ms": round(elapsed * 1000, 2),
+                "error": error,
+                **({"attrs": attrs} if attrs else {}),
+            })
+
+
+def traced(stage: str):
+    """Decorator form of span() for sync and async functions."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def recent_traces(limit: int = 20, min_duration_ms: float = 0) -> List[Dict[str, Any]]:
+    """Most recent finished request traces, newest first."""
+    with _recent_lock:
+        traces = list(_recent)
+    out = [t.to_dict() for t in reversed(traces)]
+    return [t for t in out if t["duration_ms"] >= min_duration_ms][:limit]
+
+
+def stage_breakdown(trace: Dict[str, Any]) -> str:
+    """One-line 'stage=ms' summary of a trace's top-level spans."""
+    roots = [s for s in trace["spans"] if s["parent_id"] is None]
+    return ", ".join(f"{s['stage']}={s['duration_ms']:.0f}ms" for s in roots)
+
+
+# ------------------------------------------------------
+# 🌐 ASGI middleware
+# ------------------------------------------------------
+def _match_route(routes, scope) -> Optional[str]:
+    from starlette.routing import Match
+
+    for route in routes:
+        match, child_scope = route.matches(scope)
+        if match != Match.FULL:
+            continue
+        path = getattr(route, "path", None)
+        if path:
+            return path
+        # included routers / mounts: descend into their own routes
+        inner = getattr(route, "routes", None) or getattr(getattr(route, "original_router", None), "routes", None)
+        return _match_route(inner or (), {**scope, **child_scope})
+    return None
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware: per-request trace, HTTP latency histogram and in-flight gauge.
+    The trace id doubles as the request id in logs (an incoming X-Request-ID is reused) and is
+    echoed back in the X-Request-ID response header.
+    """
+
+    def __init__(self, app, router=None, skip_paths=("/metrics",)):
+        self.app = app
+        self.router = router      # the FastAPI app / router whose routes are matched for labels
+        self.skip_paths = set(skip_paths)
+
+    def _route(self, scope) -> str:
+        """Route template ("/api/interview/answer"), so label cardinality stays bounded."""
+        return _match_route(getattr(self.router, "routes", ()), scope) or "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "GET")
+        route = self._route(scope)
+        trace = Trace(f"{method} {route}")
+        incoming_id = dict(scope.get("headers") or ()).get(b"x-request-id")
+        if incoming_id:
+            trace.trace_id = incoming_id.decode("latin-1")[:64]
+        token = _current_trace.set(trace)
+        log_tokens = bind_request(trace.trace_id)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", trace.trace_id.encode("latin-1"))]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method, route=route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(method=method, route=route)
+            trace.duration = time.perf_counter() - trace._t0
+            trace.status = status["code"]
+            HTTP_SECONDS.observe(trace.duration, method=method, route=route, status=str(status["code"]))
+            with _recent_lock:
+                _recent.append(trace)
+            if TRACE_SLOW_REQUEST_SECONDS and trace.duration >= TRACE_SLOW_REQUEST_SECONDS:
+                summary = trace.to_dict()
+                logger.warning("🐢 Slow request %s %.0fms: %s", trace.name, summary["duration_ms"],
+                               stage_breakdown(summary))
+            reset_context(log_tokens)
+            _current_trace.reset(token)
@@ -0,0 +1,101 @@
+# backend/ml/vad.py
+"""
+Voice activity detection: cut silence out of an answer before it is sent to speech-to-text.
+
+Frames are classified with the same adaptive loudness threshold as the delivery metrics
+(delivery_metrics.voiced_frames), all in NumPy over 20 ms frames. Leading and trailing silence
+is dropped, and every pause of at least VAD_SPLIT_PAUSE_SECONDS splits the answer: the pause is
+removed and the pieces are joined back with VAD_JOIN_GAP_SECONDS of silence, so the recognizer
+still sees a phrase boundary. Shorter pauses stay. VAD_PAD_SECONDS of audio is kept on both sides
+of speech so soft word onsets and endings aren't clipped.
+
+    speech = trim_silence(audio)             # audio: audio_decoding.DecodedAudio
+    speech.audio                             # trimmed DecodedAudio (empty if nothing was said)
+    speech.segments                          # (start, end) sample bounds in the original
+    speech.report()                          # input / sent / removed seconds for the turn
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .audio_decoding import DecodedAudio
+from .config import VAD_PAD_SECONDS, VAD_SPLIT_PAUSE_SECONDS, VAD_JOIN_GAP_SECONDS
+from .delivery_metrics import FRAME_SECONDS, _runs, frame_levels, voiced_frames
+from .metrics import REGISTRY
+
+STT_AUDIO_SECONDS = REGISTRY.counter(
+    "stt_audio_seconds_total", "Answer audio seconds before and after silence trimming", ("stage",))
+
+
+def find_speech(samples: np.ndarray, rate: int, pad_seconds: float = VAD_PAD_SECONDS,
+                split_pause_seconds: float = VAD_SPLIT_PAUSE_SECONDS) -> np.ndarray:
+    """(n, 2) array of [start, end) sample bounds of the speech segments in `samples`."""
+    db = frame_levels(samples, rate)
+    empty = np.zeros((0, 2), dtype=np.int64)
+    if not len(db):
+        return empty
+    voiced = voiced_frames(db)
+    starts, lengths = _runs(voiced)
+    if not len(starts):
+        return empty
+    ends = starts + lengths
+
+    # Keep short pauses inside a segment; split where the gap is long
+    split = (starts[1:] - ends[:-1]) * FRAME_SECONDS >= split_pause_seconds
+    seg_starts = np.concatenate((starts[:1], starts[1:][split]))
+    seg_ends = np.concatenate((ends[:-1][split], ends[-1:]))
+
+    pad = int(round(pad_seconds / FRAME_SECONDS))
+    seg_starts = np.maximum(seg_starts - pad, 0)
+    seg_ends = np.minimum(seg_ends + pad, len(db))
+    seg_ends[:-1] = np.minimum(seg_ends[:-1], seg_starts[1:])   # padding never overlaps the next segment
+
+    frame = max(int(rate * FRAME_SECONDS), 1)
+    bounds = np.stack((seg_starts, seg_ends), axis=1) * frame
+    if seg_ends[-1] == len(db):
+        bounds[-1, 1] = len(samples)      # keep the partial frame at the very end
+    return bounds
+
+
+class TrimmedAudio:
+    def __init__(self, audio: DecodedAudio, source: DecodedAudio, segments: np.ndarray):
+        self.audio = audio
+        self.source = source
+        self.segments: List[Tuple[int, int]] = [(int(a), int(b)) for a, b in segments]
+        self.input_seconds = source.seconds
+
+    def pieces(self) -> List[np.ndarray]:
+        """The speech segments as views into the source PCM, in order."""
+        return [self.source.pcm[start:end] for start, end in self.segments]
+
+    @property
+    def removed_seconds(self) -> float:
+        return max(self.input_seconds - self.audio.seconds, 0.0)
+
+    def report(self) -> Dict[str, float]:
+        return {
+            "input_seconds": round(self.input_seconds, 2),
+            "sent_seconds": round(self.audio.seconds, 2),
+            "removed_seconds": round(self.removed_seconds, 2),
+            "segments": len(self.segments),
+        }
+
+
+def trim_silence(audio: DecodedAudio, join_gap_seconds: float = VAD_JOIN_GAP_SECONDS) -> TrimmedAudio:
+    """Speech-only copy of `audio`: edges trimmed, long pauses shortened to join_gap_seconds."""
+    segments = find_speech(audio.samples, audio.rate)
+    if len(segments) == 1 and segments[0, 0] == 0 and segments[0, 1] == len(audio.pcm):
+        trimmed = audio                                            # nothing to cut
+    else:
+        gap = np.zeros(int(join_gap_seconds * audio.rate), dtype=audio.pcm.dtype)
+        pieces = []
+        for start, end in segments:
+            if pieces:
+                pieces.append(gap)
+            pieces.append(audio.pcm[start:end])
+        pcm = np.concatenate(pieces) if pieces else audio.pcm[:0]
+        trimmed = DecodedAudio(pcm, audio.rate, audio.source_format)
+
+    STT_AUDIO_SECONDS.inc(audio.seconds, stage="input")
+    STT_AUDIO_SECONDS.inc(trimmed.seconds, stage="sent")
+    return TrimmedAudio(trimmed, audio, segments)